@@ -1,25 +1,125 @@
 #!/usr/bin/env python3
 """
 Comprehensive Sitemap Generator for DapsiGames Tools
-Scans actual tool pages in client/src/pages and generates complete sitemaps
+Generates complete sitemaps from the client/src/App.tsx route table expanded
+against the client/src/data/tools.ts catalog, from the catalog alone, or by
+scanning the actual tool pages in client/src/pages
 """
 
-import xml.etree.ElementTree as ET
-import re
 import os
-import glob
 from datetime import datetime
-from typing import Dict, List, Set
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import argparse
+import itertools
 import json
+from operator import attrgetter, itemgetter
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from sitemap_categorizer import CompiledCategorizer
+from sitemap_delta import DEFAULT_DELTA_BUDGET_MB, DeltaTracker, SitemapDelta
+from sitemap_lastmod import LASTMOD_SOURCES, LastmodProvider
+from sitemap_catalog import CatalogTool
+from sitemap_page_index import TOOLS_TS_PATH, PageIndex, ReadCounter, read_tools_ts
+from sitemap_profiling import RunProfiler, add_profiling_arguments, profiler_from_args, run_profiled
+from sitemap_pipeline import CategorySitemapSink, UrlEntry, drain
+from sitemap_publish import SitemapPublisher
+from sitemap_robots import RobotsFilter, add_robots_arguments, robots_filter_from_args
+from sitemap_routes import APP_TSX_PATH, RouteTable, read_route_table
+from sitemap_server import DEFAULT_CACHE_MB, DEFAULT_HOST, DEFAULT_PORT, serve_sitemaps
+from sitemap_records import ToolRecord
+from sitemap_manifest import PageManifest, discard_outputs, fingerprint, hash_entries
+from sitemap_watch import watch_and_regenerate
+from sitemap_sort import ExternalSorter, SortedPartition
+from sitemap_scanner import EXECUTOR_TYPES, PageScan, extract_title, resolve_jobs, scan_page_files
+from sitemap_writer import (
+    MAX_SITEMAP_BYTES, MAX_URLS_PER_SITEMAP, ShardedSitemapWriter, SitemapIndexWriter
+)
+
+DEFAULT_CACHE_FILE = ".sitemap-cache/manifest.json"
+# Where tool URLs come from: App.tsx routes joined with tools.ts, the tools.ts
+# catalog hrefs alone, or the page files themselves
+URL_SOURCES = ('routes', 'catalog', 'pages')
 
 
 class ComprehensiveSitemapGenerator:
-    def __init__(self, base_url: str = "https://dapsigames.com", pages_dir: str = "client/src/pages", output_dir: str = "client/public"):
+    def __init__(self, base_url: str = "https://dapsigames.com", pages_dir: str = "client/src/pages", output_dir: str = "client/public",
+                 max_urls_per_sitemap: int = MAX_URLS_PER_SITEMAP, max_sitemap_bytes: int = MAX_SITEMAP_BYTES,
+                 cache_file: Optional[str] = DEFAULT_CACHE_FILE, jobs: int = 1, executor: str = 'thread',
+                 title_window: int = 0, compress: bool = False, compress_jobs: int = 1,
+                 lastmod_source: str = 'git', source: str = 'routes',
+                 profiler: Optional[RunProfiler] = None, quiet: bool = False, sort_budget_mb: float = 0,
+                 robots_filter: Optional[RobotsFilter] = None):
         self.base_url = base_url.rstrip('/')
+        # Library callers can silence progress output
+        self.quiet = quiet
         self.pages_dir = pages_dir
+        self.tools_ts_path = TOOLS_TS_PATH
+        # Router whose routes are expanded against tools.ts (routes source)
+        self.app_path = APP_TSX_PATH
+        self.route_table: Optional[RouteTable] = None
+        self.source = source
+        # Per-stage timings and counters; a disabled profiler costs next to nothing
+        self.profiler = profiler or RunProfiler()
         self.output_dir = output_dir
+        # Page scan concurrency: worker count (0 = one per CPU) and pool type
+        self.jobs = resolve_jobs(jobs)
+        self.executor = executor
+        # Bytes searched for a title before falling back to a full read (0 = always read everything)
+        self.title_window = title_window
+        # Write sitemap-*.xml.gz, compressing shards across compress_jobs threads when > 1
+        self.compress = compress
+        self.compress_jobs = resolve_jobs(compress_jobs)
+        self.compress_pool: Optional[Executor] = None
+        self._unfinished_writers: List[ShardedSitemapWriter] = []
+        # Pages and tools.ts, indexed once per run, and proof that nothing is read twice
+        self.page_index: Optional[PageIndex] = None
+        self.read_counter = ReadCounter(self.profiler)
+        # Atomic, skip-if-identical publishing of every file written
+        self.publisher = SitemapPublisher(output_dir)
+        # Sort tools externally within this many MiB (0 = in memory)
+        self.sort_budget_mb = sort_budget_mb
+        # Drops URLs robots.txt blocks before they are written (None = keep all)
+        self.robots_filter = robots_filter
+        self.max_urls_per_sitemap = max_urls_per_sitemap
+        self.max_sitemap_bytes = max_sitemap_bytes
         self.current_date = datetime.now().strftime("%Y-%m-%d")
         
+        # Static/category pages to exclude from tool listings
+        self.exclude_pages = {
+            'about-us', 'contact-us', 'privacy-policy', 'terms-of-service',
+            'help-center', 'not-found', 'home', 'all-tools', 'finance-tools',
+            'health-tools', 'text-tools', 'tool-page'
+        }
+        
+        # Static pages of the main sitemap when there is no route table: (path, changefreq, priority)
+        self.main_pages = [
+            ('/', 'daily', '1.0'),
+            ('/about-us', 'monthly', '0.8'),
+            ('/contact-us', 'monthly', '0.8'),
+            ('/privacy-policy', 'yearly', '0.5'),
+            ('/terms-of-service', 'yearly', '0.5'),
+            ('/help-center', 'monthly', '0.7'),
+            ('/all-tools', 'weekly', '0.9'),
+            ('/finance-tools', 'weekly', '0.9'),
+            ('/health-tools', 'weekly', '0.9'),
+            ('/text-tools', 'weekly', '0.9'),
+        ]
+        
+        # changefreq and priority of static App.tsx routes (others: monthly, 0.8)
+        self.static_route_settings = {
+            '/': ('daily', '1.0'),
+            '/games': ('weekly', '0.9'),
+            '/math-games': ('weekly', '0.9'),
+            '/science-games': ('weekly', '0.9'),
+            '/language-games': ('weekly', '0.9'),
+            '/memory-games': ('weekly', '0.9'),
+            '/logic-games': ('weekly', '0.9'),
+            '/leaderboard': ('daily', '0.7'),
+            '/help': ('monthly', '0.7'),
+            '/privacy-policy': ('yearly', '0.5'),
+            '/terms': ('yearly', '0.5'),
+        }
+        
         # Define category patterns for tool classification
         self.category_patterns = {
             'finance': [
@@ -60,317 +160,973 @@ class ComprehensiveSitemapGenerator:
             ]
         }
         
-    def get_all_tool_pages(self) -> List[Dict]:
+        # All category patterns compiled into a single first-match-wins regex
+        self.categorizer = CompiledCategorizer(self.category_patterns, default='main')
+        
+        # Title patterns tried in order when extracting a tool name from a page
+        self.title_patterns = [
+            r'title="([^"]+)"',
+            r'<title>([^<]+)</title>',
+            r'title:\s*[\'"]([^\'"]+)[\'"]',
+            r'name:\s*[\'"]([^\'"]+)[\'"]'
+        ]
+        
+        # Incremental rebuild manifest; invalidated whenever the scan rules change
+        self.manifest = None
+        if cache_file:
+            scan_settings = fingerprint(self.category_patterns, self.title_patterns, self.title_window, self.base_url)
+            self.manifest = PageManifest(cache_file, scan_settings)
+        
+        # Page dates for <lastmod>; the newest one also dates listing pages and the index
+        self.lastmods = LastmodProvider(lastmod_source, pages_dir, self.manifest)
+        self.site_lastmod: Optional[str] = None
+        # Newest lastmod of every sitemap file written (or left unchanged) this run
+        self.shard_lastmods: Dict[str, Optional[str]] = {}
+        # Shard filenames per category from the last run, reused by apply_changes
+        self.sitemap_files: Optional[Dict[str, List[str]]] = None
+        
+    def log(self, *args) -> None:
+        """Progress output, unless quiet"""
+        if not self.quiet:
+            print(*args)
+    
+    def get_all_tool_pages(self) -> List[ToolRecord]:
         """Get all tool pages from the pages directory"""
-        pages_pattern = os.path.join(self.pages_dir, "*.tsx")
-        all_pages = glob.glob(pages_pattern)
+        try:
+            entries = sorted(
+                (entry for entry in os.scandir(self.pages_dir)
+                 if entry.name.endswith('.tsx') and entry.is_file()),
+                key=lambda entry: entry.name
+            )
+        except FileNotFoundError:
+            entries = []
         
-        tools = []
+        # Skip excluded pages
+        pages = [(entry.name[:-len('.tsx')], entry.path, entry.stat()) for entry in entries
+                 if entry.name[:-len('.tsx')] not in self.exclude_pages]
+        tools, cache_hits = self.scan_tool_pages(pages)
         
-        # Static/category pages to exclude from tool listings
-        exclude_pages = {
-            'about-us', 'contact-us', 'privacy-policy', 'terms-of-service',
-            'help-center', 'not-found', 'home', 'all-tools', 'finance-tools',
-            'health-tools', 'text-tools', 'tool-page'
-        }
+        self.site_lastmod = max((tool.lastmod for tool in tools if tool.lastmod), default=None)
         
-        for page_path in all_pages:
-            filename = os.path.basename(page_path)
-            page_id = filename.replace('.tsx', '')
-            
-            # Skip excluded pages
-            if page_id in exclude_pages:
-                continue
-            
+        if self.manifest is not None:
+            self.manifest.prune_pages(page_path for _, page_path, _ in pages)
+            self.manifest.save()
+            self.log(f"Found {len(tools)} tool pages in {self.pages_dir} ({cache_hits} unchanged, {len(tools) - cache_hits} scanned)")
+        else:
+            self.log(f"Found {len(tools)} tool pages in {self.pages_dir}")
+        return tools
+    
+    def scan_tool_pages(self, pages: List[Tuple[str, str, os.stat_result]],
+                        report_timing: bool = True) -> Tuple[List[ToolRecord], int]:
+        """
+        Tool records for (page_id, page_path, stat) pages, reading only those
+        the manifest can't vouch for. Returns (tools, manifest cache hits).
+        """
+        tools = []
+        # Pages the manifest can't vouch for: (tools index, stat)
+        pending = []
+        for page_id, page_path, stat in pages:
             # Create URL path
             href = f'/tools/{page_id}'
             url = f'{self.base_url}{href}'
             
-            # Categorize the tool
-            category = self.categorize_tool(page_id)
+            record = self.manifest.lookup_stat(page_path, stat) if self.manifest is not None else None
+            if record is None:
+                pending.append((len(tools), stat))
             
-            # Try to extract name from the page file
-            name = self.extract_tool_name(page_path, page_id)
-            
-            tools.append({
-                'id': page_id,
-                'name': name,
-                'category': category,
-                'href': href,
-                'url': url,
-                'page_file': filename
-            })
-        
-        print(f"Found {len(tools)} tool pages in {self.pages_dir}")
-        return tools
+            tools.append(ToolRecord(
+                id=page_id,
+                name=record['name'] if record else None,
+                category=record['category'] if record else None,
+                href=href,
+                url=url,
+                page_file=os.path.basename(page_path),
+                lastmod=self.lastmods.page_lastmod(page_path, stat)
+            ))
+        
+        # Read and scan everything else, possibly in parallel
+        scans, elapsed = scan_page_files([os.path.join(self.pages_dir, tools[index].page_file)
+                                          for index, _ in pending],
+                                         self.title_patterns, self.jobs, self.executor, self.title_window)
+        cache_hits = len(tools) - len(pending)
+        for (index, stat), scan in zip(pending, scans):
+            if scan.error is None:
+                self.read_counter.record(scan.path, scan.bytes_read)
+            tool = tools[index]
+            if self.resolve_page_scan(tool, scan, stat):
+                cache_hits += 1
+        
+        if pending and report_timing:
+            self.report_scan_timing(scans, elapsed)
+        return tools, cache_hits
+    
+    def resolve_page_scan(self, tool: Dict, scan: PageScan, stat: os.stat_result) -> bool:
+        """
+        Fill in a tool's name and category from a fresh scan, reusing the
+        manifest if the content hash is unchanged. Returns True on a cache hit.
+        """
+        page_id = tool.id
+        if scan.error is not None:
+            self.log(f"Warning: Could not extract name from {scan.path}: {scan.error}")
+            tool.name = page_id.replace('-', ' ').title()
+            tool.set_category(self.categorize_tool(page_id))
+            return False
+        
+        if self.manifest is not None and scan.content_hash is not None:
+            record = self.manifest.lookup_hash(scan.path, stat, scan.content_hash)
+            if record:
+                tool.name = record['name']
+                tool.set_category(record['category'])
+                return True
+        
+        # Fallback to formatted page ID
+        tool.name = scan.title or page_id.replace('-', ' ').title()
+        tool.set_category(self.categorize_tool(page_id))
+        if self.manifest is not None:
+            self.manifest.update_page(scan.path, stat, scan.content_hash,
+                                      name=tool.name, category=tool.category)
+        return False
+    
+    def report_scan_timing(self, scans: List[PageScan], elapsed: float) -> None:
+        """Print wall time and throughput of the page scan"""
+        mode = f"{self.jobs} {self.executor} workers" if self.jobs > 1 else "serial"
+        rate = len(scans) / elapsed if elapsed else 0.0
+        self.log(f"Scanned {len(scans)} pages in {elapsed * 1000:.1f} ms ({rate:,.0f} pages/s, {mode})")
     
     def extract_tool_name(self, page_path: str, page_id: str) -> str:
         """Try to extract the tool name from the page file"""
         try:
             with open(page_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-            
-            # Look for title patterns in the component
-            title_patterns = [
-                r'title="([^"]+)"',
-                r'<title>([^<]+)</title>',
-                r'title:\s*[\'"]([^\'"]+)[\'"]',
-                r'name:\s*[\'"]([^\'"]+)[\'"]'
-            ]
-            
-            for pattern in title_patterns:
-                match = re.search(pattern, content, re.IGNORECASE)
-                if match:
-                    return match.group(1).strip()
-            
+            return self.extract_tool_name_from_content(content, page_id)
         except Exception as e:
-            print(f"Warning: Could not extract name from {page_path}: {e}")
+            self.log(f"Warning: Could not extract name from {page_path}: {e}")
+        
+        # Fallback to formatted page ID
+        return page_id.replace('-', ' ').title()
+    
+    def extract_tool_name_from_content(self, content: str, page_id: str) -> str:
+        """Extract the tool name from page source, falling back to the formatted page ID"""
+        # Look for title patterns in the component
+        title = extract_title(content, self.title_patterns)
+        if title:
+            return title
         
         # Fallback to formatted page ID
         return page_id.replace('-', ' ').title()
     
     def categorize_tool(self, page_id: str) -> str:
         """Categorize a tool based on its page ID"""
-        page_lower = page_id.lower()
-        
-        # Check each category
-        for category, patterns in self.category_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, page_lower, re.IGNORECASE):
-                    return category
+        # Pages already in this run's index keep the category they were indexed with
+        if self.page_index is not None:
+            category = self.page_index.category(page_id)
+            if category is not None:
+                return category
         
         # Default to main if no pattern matches
-        return 'main'
+        return self.categorizer.categorize(page_id.lower())
+    
+    def allowed_tools(self, tools: Iterable[ToolRecord]) -> Iterable[ToolRecord]:
+        """tools without the ones whose URL robots.txt blocks"""
+        if self.robots_filter is None:
+            return tools
+        return self.robots_filter.filter(tools, attrgetter('url'))
+    
+    def allowed_entries(self, entries: Iterable[UrlEntry]) -> Iterable[UrlEntry]:
+        """entries without the ones whose loc robots.txt blocks"""
+        if self.robots_filter is None:
+            return entries
+        return self.robots_filter.filter(entries, attrgetter('loc'))
     
-    def group_tools_by_category(self, tools: List[Dict]) -> Dict[str, List[Dict]]:
+    def group_tools_by_category(self, tools: Iterable[ToolRecord]) -> Dict[str, List[ToolRecord]]:
         """Group tools by category"""
         categorized = {}
         for tool in tools:
-            category = tool['category']
+            category = tool.category
             if category not in categorized:
                 categorized[category] = []
             categorized[category].append(tool)
         
         # Sort tools within each category by name for stable output
         for category in categorized:
-            categorized[category].sort(key=lambda x: x['name'])
+            categorized[category].sort(key=lambda x: x.name)
         
         return categorized
     
-    def create_sitemap_xml(self, tools: List[Dict], filename: str) -> None:
-        """Create a sitemap XML file with given tools"""
-        urlset = ET.Element('urlset')
-        urlset.set('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
-        
-        for tool in tools:
-            url_elem = ET.SubElement(urlset, 'url')
-            
-            loc_elem = ET.SubElement(url_elem, 'loc')
-            loc_elem.text = tool['url']
-            
-            lastmod_elem = ET.SubElement(url_elem, 'lastmod')
-            lastmod_elem.text = self.current_date
-            
-            changefreq_elem = ET.SubElement(url_elem, 'changefreq')
-            changefreq_elem.text = 'weekly'
-            
-            priority_elem = ET.SubElement(url_elem, 'priority')
-            priority_elem.text = '0.8'
+    def open_sitemap_writer(self, filename: str) -> ShardedSitemapWriter:
+        """Open a sharded writer that rolls over at the configured protocol limits"""
+        return ShardedSitemapWriter(self.output_dir, filename,
+                                    max_urls=self.max_urls_per_sitemap,
+                                    max_bytes=self.max_sitemap_bytes,
+                                    compress=self.compress,
+                                    executor=self.compress_pool,
+                                    publisher=self.publisher)
+    
+    def finish_sitemap_writers(self) -> None:
+        """Wait for shards still being compressed in the background"""
+        writers, self._unfinished_writers = self._unfinished_writers, []
+        for writer in writers:
+            writer.wait()
+    
+    def write_sitemap(self, filename: str, entries: Collection[Tuple[str, str, str, str]]) -> List[str]:
+        """
+        Write (loc, lastmod, changefreq, priority) entries to filename and its
+        shards, skipping the write entirely when the manifest shows the same
+        entries were already written. entries is iterated once for the
+        manifest digest and again for writing. Returns the shard filenames.
+        """
+        filepath = os.path.join(self.output_dir, filename)
+        digest = None
+        if self.manifest is not None:
+            digest = hash_entries(entries, self.max_urls_per_sitemap, self.max_sitemap_bytes, self.compress)
+            files = self.manifest.output_unchanged(filename, digest, self.output_dir)
+            if files is not None:
+                self.log(f"Unchanged {filepath} ({len(entries)} URLs), skipped write")
+                self.profiler.count('urls', len(entries))
+                self.shard_lastmods.update(zip(files, self.manifest.output_lastmods(filename)))
+                self.publisher.keep(files)
+                return files
         
-        # Create ElementTree and write to file
-        tree = ET.ElementTree(urlset)
-        ET.indent(tree, space="  ", level=0)
+        writer = self.open_sitemap_writer(filename)
+        try:
+            for loc, lastmod, changefreq, priority in entries:
+                writer.add_url(loc, lastmod, changefreq, priority)
+        except BaseException:
+            writer.abort()
+            raise
+        # Compression of the last shards may still be running on the pool
+        writer.close(wait=False)
+        self._unfinished_writers.append(writer)
         
-        filepath = os.path.join(self.output_dir, filename)
-        with open(filepath, 'wb') as f:
-            tree.write(f, encoding='utf-8', xml_declaration=True)
+        filepath = os.path.join(self.output_dir, writer.filename)
+        if len(writer.filenames) == 1:
+            self.log(f"Created {filepath} with {len(entries)} URLs")
+        else:
+            self.log(f"Created {filepath} with {len(entries)} URLs split across {len(writer.filenames)} shards")
         
-        print(f"Created {filepath} with {len(tools)} URLs")
+        self.profiler.count('urls', writer.count)
+        self.profiler.count('files_written', len(writer.filenames))
+        self.profiler.count('bytes_written', writer.bytes_written)
+        self.shard_lastmods.update(zip(writer.filenames, writer.lastmods))
+        if self.manifest is not None:
+            self.manifest.update_output(filename, digest, writer.filenames, writer.lastmods)
+        return writer.filenames
+    
+    def create_sitemap_xml(self, tools: Collection[ToolRecord], filename: str) -> List[str]:
+        """Create a sitemap XML file with given tools, returns the shard filenames written"""
+        if isinstance(tools, SortedPartition):
+            # Externally sorted: stream from the merged runs instead of building a list
+            entries = tools.map(tool_entry)
+        else:
+            entries = [tool_entry(tool) for tool in tools]
+        return self.write_sitemap(filename, entries)
     
-    def create_main_sitemap(self) -> None:
+    def create_main_sitemap(self) -> List[str]:
         """Create main sitemap with static pages"""
-        main_pages = [
-            ('/', 'daily', '1.0'),
-            ('/about-us', 'monthly', '0.8'),
-            ('/contact-us', 'monthly', '0.8'),
-            ('/privacy-policy', 'yearly', '0.5'),
-            ('/terms-of-service', 'yearly', '0.5'),
-            ('/help-center', 'monthly', '0.7'),
-            ('/all-tools', 'weekly', '0.9'),
-            ('/finance-tools', 'weekly', '0.9'),
-            ('/health-tools', 'weekly', '0.9'),
-            ('/text-tools', 'weekly', '0.9'),
-        ]
-        
-        urlset = ET.Element('urlset')
-        urlset.set('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
-        
-        for path, changefreq, priority in main_pages:
-            url_elem = ET.SubElement(urlset, 'url')
-            
-            loc_elem = ET.SubElement(url_elem, 'loc')
-            loc_elem.text = f"{self.base_url}{path}"
-            
-            lastmod_elem = ET.SubElement(url_elem, 'lastmod')
-            lastmod_elem.text = self.current_date
-            
-            changefreq_elem = ET.SubElement(url_elem, 'changefreq')
-            changefreq_elem.text = changefreq
-            
-            priority_elem = ET.SubElement(url_elem, 'priority')
-            priority_elem.text = priority
-        
-        # Create ElementTree and write to file
-        tree = ET.ElementTree(urlset)
-        ET.indent(tree, space="  ", level=0)
-        
-        filepath = os.path.join(self.output_dir, 'sitemap-main.xml')
-        with open(filepath, 'wb') as f:
-            tree.write(f, encoding='utf-8', xml_declaration=True)
-        
-        print(f"Created {filepath} with {len(main_pages)} URLs")
+        entries = [entry[1:] for entry in self.allowed_entries(self.iter_main_entries())]
+        return self.write_sitemap('sitemap-main.xml', entries)
     
-    def create_sitemap_index(self, categories: List[str]) -> None:
-        """Create the main sitemap index file"""
-        sitemapindex = ET.Element('sitemapindex')
-        sitemapindex.set('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
-        
-        # Add main sitemap
-        sitemap_elem = ET.SubElement(sitemapindex, 'sitemap')
-        loc_elem = ET.SubElement(sitemap_elem, 'loc')
-        loc_elem.text = f"{self.base_url}/sitemap-main.xml"
-        lastmod_elem = ET.SubElement(sitemap_elem, 'lastmod')
-        lastmod_elem.text = self.current_date
+    def static_page_lastmod(self, path: str, page_path: Optional[str] = None) -> str:
+        """
+        lastmod for a static route: its own page file if there is one (given,
+        or named after the path; / is home.tsx), otherwise the newest tool
+        page, since listing pages change whenever a tool does
+        """
+        page_path = page_path or os.path.join(self.pages_dir, f"{path.strip('/') or 'home'}.tsx")
+        lastmod = None
+        if os.path.isfile(page_path):
+            lastmod = self.lastmods.page_lastmod(page_path)
+        return lastmod or self.site_lastmod or self.current_date
+    
+    def create_sitemap_index(self, categories: List[str], sitemap_files: Optional[Dict[str, List[str]]] = None) -> None:
+        """
+        Create the main sitemap index file.
+        sitemap_files maps 'main' and each category to the shard filenames
+        actually written; every shard gets its own index entry.
+        """
+        sitemap_files = sitemap_files or {}
         
         # Add category sitemaps (only for known tool categories, skip 'main')
-        tool_categories = [cat for cat in sorted(categories) if cat in self.category_patterns]
+        tool_categories = [cat for cat in sorted(categories) if cat != 'main']
+        
+        filenames = list(sitemap_files.get('main', ['sitemap-main.xml']))
         for category in tool_categories:
-            sitemap_elem = ET.SubElement(sitemapindex, 'sitemap')
-            
-            loc_elem = ET.SubElement(sitemap_elem, 'loc')
-            loc_elem.text = f"{self.base_url}/sitemap-{category}.xml"
-            
-            lastmod_elem = ET.SubElement(sitemap_elem, 'lastmod')
-            lastmod_elem.text = self.current_date
+            filenames.extend(sitemap_files.get(category, [f'sitemap-{category}.xml']))
         
-        # Create ElementTree and write to file
-        tree = ET.ElementTree(sitemapindex)
-        ET.indent(tree, space="  ", level=0)
+        # Each sitemap is dated by the newest URL it contains
+        entries = [(f"{self.base_url}/{filename}", self.shard_lastmods.get(filename) or self.current_date)
+                   for filename in filenames]
         
         filepath = os.path.join(self.output_dir, 'sitemap.xml')
-        with open(filepath, 'wb') as f:
-            tree.write(f, encoding='utf-8', xml_declaration=True)
+        digest = None
+        if self.manifest is not None:
+            digest = hash_entries(entries)
+            if self.manifest.output_unchanged('sitemap.xml', digest, self.output_dir) is not None:
+                self.log(f"Unchanged {filepath} index file ({len(filenames)} sitemaps), skipped write")
+                self.publisher.keep(['sitemap.xml'])
+                return
+        
+        temp_path = self.publisher.temp_path(filepath)
+        with SitemapIndexWriter(temp_path) as writer:
+            for loc, lastmod in entries:
+                writer.add_sitemap(loc, lastmod)
+        self.publisher.publish(temp_path, filepath)
+        self.profiler.count('files_written')
+        self.profiler.count('bytes_written', writer.bytes_written)
         
-        print(f"Created {filepath} index file with {len(tool_categories) + 1} sitemaps")
+        if self.manifest is not None:
+            self.manifest.update_output('sitemap.xml', digest, ['sitemap.xml'])
+        self.log(f"Created {filepath} index file with {len(filenames)} sitemaps")
     
-    def compare_with_tools_ts(self) -> None:
-        """Compare found pages with tools.ts entries for validation"""
-        tools_ts_path = "client/src/data/tools.ts"
-        if not os.path.exists(tools_ts_path):
-            print(f"Warning: {tools_ts_path} not found, skipping comparison")
+    def get_catalog_tools(self, catalog: Dict[str, CatalogTool]) -> List[ToolRecord]:
+        """Tool records straight from tools.ts entries; no page file is read"""
+        tools = list(self.iter_catalog_tools(catalog))
+        self.log(f"Found {len(tools)} tools in {self.tools_ts_path}")
+        return tools
+    
+    def iter_catalog_tools(self, catalog: Dict[str, CatalogTool]) -> Iterator[ToolRecord]:
+        """Tool records for tools.ts entries, one at a time"""
+        lastmod = self.lastmods.page_lastmod(self.tools_ts_path)
+        self.site_lastmod = lastmod
+        for entry in catalog.values():
+            url = entry.href if entry.href.startswith(('http://', 'https://')) else f'{self.base_url}{entry.href}'
+            yield ToolRecord(
+                id=entry.id,
+                name=entry.name,
+                category=entry.category or 'main',
+                href=entry.href,
+                url=url,
+                page_file=None,
+                lastmod=lastmod,
+                priority='0.9' if entry.is_popular else '0.8'
+            )
+    
+    def get_route_tools(self, catalog: Dict[str, CatalogTool]) -> List[ToolRecord]:
+        """Tool records for every catalog entry a parameterized App.tsx route serves"""
+        tools = list(self.iter_route_tools(catalog))
+        self.log(f"Found {len(tools)} tool URLs from {len(self.route_table.parameterized_routes())} "
+                 f"parameterized routes in {self.app_path} joined with {self.tools_ts_path}")
+        return tools
+    
+    def iter_route_tools(self, catalog: Dict[str, CatalogTool]) -> Iterator[ToolRecord]:
+        """
+        Tool records from joining tools.ts entries to the routes serving their
+        hrefs. A tool URL is dated by the newer of tools.ts and its route's
+        page component. Entries no route serves are skipped with a warning.
+        """
+        catalog_lastmod = self.lastmods.page_lastmod(self.tools_ts_path)
+        route_lastmods: Dict[str, Optional[str]] = {}
+        self.site_lastmod = catalog_lastmod
+        unrouted = []
+        for route, entry in self.route_table.join(catalog):
+            if route is None:
+                unrouted.append(entry.id)
+                continue
+            if route.path not in route_lastmods:
+                component_lastmod = self.lastmods.page_lastmod(route.page_file) if route.page_file else None
+                route_lastmods[route.path] = max(filter(None, (catalog_lastmod, component_lastmod)), default=None)
+            lastmod = route_lastmods[route.path]
+            if lastmod and (self.site_lastmod is None or lastmod > self.site_lastmod):
+                self.site_lastmod = lastmod
+            url = entry.href if entry.href.startswith(('http://', 'https://')) else f'{self.base_url}{entry.href}'
+            yield ToolRecord(
+                id=entry.id,
+                name=entry.name,
+                category=entry.category or 'main',
+                href=entry.href,
+                url=url,
+                page_file=None,
+                lastmod=lastmod,
+                priority='0.9' if entry.is_popular else '0.8'
+            )
+        if unrouted:
+            self.log(f"Warning: {len(unrouted)} tools.ts entries have no matching route in {self.app_path}: "
+                     f"{', '.join(unrouted[:10])}{' ...' if len(unrouted) > 10 else ''}")
+    
+    def iter_tools(self) -> Iterator[ToolRecord]:
+        """
+        Tool records one at a time, without building the page index: from
+        the route table or tools.ts, otherwise from the page files in directory
+        order, each read only when reached (unless the manifest vouches for
+        it). site_lastmod tracks the newest page seen so far.
+        """
+        source, catalog = self.resolve_source()
+        if source == 'routes':
+            yield from self.iter_route_tools(catalog)
+            return
+        if source == 'catalog':
+            yield from self.iter_catalog_tools(catalog)
             return
         
-        # Get tool IDs from tools.ts
-        with open(tools_ts_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Extract tool IDs from tools.ts
-        id_pattern = r'id:\s*[\'"]([^\'"]+)[\'"]'
-        tools_ts_ids = set(re.findall(id_pattern, content))
+        self.site_lastmod = None
+        try:
+            entries = os.scandir(self.pages_dir)
+        except FileNotFoundError:
+            return
+        with entries:
+            for entry in entries:
+                page_id = entry.name[:-len('.tsx')]
+                if not entry.name.endswith('.tsx') or page_id in self.exclude_pages or not entry.is_file():
+                    continue
+                tools, _ = self.scan_tool_pages([(page_id, entry.path, entry.stat())], report_timing=False)
+                tool = tools[0]
+                if tool.lastmod and (self.site_lastmod is None or tool.lastmod > self.site_lastmod):
+                    self.site_lastmod = tool.lastmod
+                yield tool
+    
+    def iter_url_entries(self, tools: Iterable[ToolRecord]) -> Iterator[UrlEntry]:
+        """Category sitemap entries for tools; uncategorized ('main') tools get none"""
+        for tool in tools:
+            if tool.category != 'main':
+                yield UrlEntry(tool.category, tool.url, tool.lastmod, 'weekly', tool.priority)
+    
+    def iter_main_entries(self) -> Iterator[UrlEntry]:
+        """
+        Static page entries of the main sitemap: the static App.tsx routes when
+        a route table was read, otherwise the built-in page list. Pages without
+        a file of their own are dated by site_lastmod, so chain these after the
+        tool entries.
+        """
+        if self.route_table is not None:
+            for route in self.route_table.static_routes():
+                changefreq, priority = self.static_route_settings.get(route.path, ('monthly', '0.8'))
+                yield UrlEntry('main', f"{self.base_url}{route.path}",
+                               self.static_page_lastmod(route.path, route.page_file), changefreq, priority)
+            return
+        for path, changefreq, priority in self.main_pages:
+            yield UrlEntry('main', f"{self.base_url}{path}", self.static_page_lastmod(path), changefreq, priority)
+    
+    def open_category_sink(self) -> CategorySitemapSink:
+        """Sink writing each category's entries to sitemap-<category>.xml and its shards"""
+        return CategorySitemapSink(lambda category: self.open_sitemap_writer(f'sitemap-{category}.xml'))
+    
+    def write_entries(self, entries: Iterable[UrlEntry], main: bool = True) -> Dict[str, List[str]]:
+        """
+        Stream entries into category sitemaps (followed by the main sitemap's
+        static pages, unless main is False) and write the index over them.
+        Entries robots.txt blocks are dropped on the way.
+        Returns the shard filenames per category.
+        """
+        if main:
+            entries = itertools.chain(entries, self.iter_main_entries())
+        if self.robots_filter is not None:
+            self.robots_filter.reset()
+        os.makedirs(self.output_dir, exist_ok=True)
+        sink = self.open_category_sink()
+        sitemap_files = drain(self.allowed_entries(entries), sink)
+        if self.robots_filter is not None:
+            self.log(self.robots_filter.summary())
+        for category, writer in sink.writers.items():
+            self.log(f"Created {os.path.join(self.output_dir, writer.filename)} with {writer.count} URLs")
+            self.profiler.count('urls', writer.count)
+            self.profiler.count('files_written', len(writer.filenames))
+            self.profiler.count('bytes_written', writer.bytes_written)
+        self.shard_lastmods.update(sink.lastmods)
+        self.create_sitemap_index(list(sitemap_files), sitemap_files)
+        if self.manifest is not None:
+            self.manifest.stamp_outputs(self.output_dir)
+        return sitemap_files
+    
+    def resolve_source(self) -> Tuple[str, Optional[Dict[str, CatalogTool]]]:
+        """
+        Read tools.ts (and App.tsx for the routes source) and fall back from
+        routes to catalog to pages while a source has nothing to offer.
+        Returns (source used, catalog).
+        """
+        with self.profiler.stage('read catalog'):
+            catalog = read_tools_ts(self.tools_ts_path, self.read_counter)
+        source = self.source
+        self.route_table = None
+        if source == 'routes':
+            with self.profiler.stage('read routes'):
+                self.route_table = read_route_table(self.app_path, self.read_counter)
+            if not self.route_table:
+                self.log(f"Warning: No routes in {self.app_path}, using {self.tools_ts_path} hrefs instead")
+                self.route_table = None
+                source = 'catalog'
+        if source in ('routes', 'catalog') and not catalog:
+            self.log(f"Warning: No tool entries in {self.tools_ts_path}, scanning {self.pages_dir} instead")
+            source = 'pages'
+        return source, catalog
+    
+    def build_page_index(self) -> PageIndex:
+        """Index this run's tools once, from the route table, the tools.ts catalog or the pages directory"""
+        source, catalog = self.resolve_source()
         
-        # Get actual page IDs
-        actual_pages = self.get_all_tool_pages()
-        actual_ids = set(tool['id'] for tool in actual_pages)
+        with self.profiler.stage(f'{source} tools'):
+            evaluations = self.categorizer.evaluations
+            if source == 'routes':
+                tools = self.get_route_tools(catalog)
+            elif source == 'catalog':
+                tools = self.get_catalog_tools(catalog)
+            else:
+                tools = self.get_all_tool_pages()
+            self.profiler.count('regex_evals', self.categorizer.evaluations - evaluations)
+        self.page_index = PageIndex(tools, catalog, source)
+        return self.page_index
+    
+    def tool_categories(self) -> List[str]:
+        """Every category this generator can write a sitemap for"""
+        categories = set(self.category_patterns)
+        if self.page_index is not None and self.page_index.catalog:
+            categories.update(entry.category for entry in self.page_index.catalog.values() if entry.category)
+        return sorted(categories - {'main'})
+    
+    def compare_with_tools_ts(self) -> None:
+        """Compare found pages with tools.ts entries for validation"""
+        page_index = self.page_index or self.build_page_index()
+        if page_index.catalog is None:
+            self.log(f"Warning: {self.tools_ts_path} not found, skipping comparison")
+            return
         
-        print(f"\nComparison with tools.ts:")
-        print(f"Tools.ts has {len(tools_ts_ids)} tool entries")
-        print(f"Actual pages has {len(actual_ids)} tool files")
+        self.log(f"\nComparison with tools.ts:")
+        self.log(f"Tools.ts has {len(page_index.catalog)} tool entries")
+        self.log(f"Actual pages has {len(page_index.pages)} tool files")
         
         # Find discrepancies
-        missing_from_ts = actual_ids - tools_ts_ids
-        missing_pages = tools_ts_ids - actual_ids
+        missing_from_ts = page_index.missing_from_catalog()
+        missing_pages = page_index.missing_pages()
         
         if missing_from_ts:
-            print(f"\nPages missing from tools.ts ({len(missing_from_ts)}):")
+            self.log(f"\nPages missing from tools.ts ({len(missing_from_ts)}):")
             for tool_id in sorted(missing_from_ts):
-                print(f"  - {tool_id}")
+                self.log(f"  - {tool_id}")
         
         if missing_pages:
-            print(f"\nTools.ts entries missing pages ({len(missing_pages)}):")
+            self.log(f"\nTools.ts entries missing pages ({len(missing_pages)}):")
             for tool_id in sorted(missing_pages):
-                print(f"  - {tool_id}")
+                self.log(f"  - {tool_id}")
         
         if not missing_from_ts and not missing_pages:
-            print("✅ Tools.ts and actual pages are in sync!")
+            self.log("✅ Tools.ts and actual pages are in sync!")
     
-    def generate_sitemaps(self) -> None:
-        """Main method to generate all sitemaps from actual pages"""
-        print("Starting comprehensive sitemap generation from actual pages...")
-        print(f"Base URL: {self.base_url}")
-        print(f"Current date: {self.current_date}")
+    def generate_sitemaps(self) -> Dict[str, List[str]]:
+        """Main method to generate all sitemaps from actual pages; returns the shard filenames per category"""
+        self.log("Starting comprehensive sitemap generation...")
+        self.log(f"Base URL: {self.base_url}")
+        self.log(f"URL source: {self.source}")
+        self.log(f"Current date: {self.current_date}")
+        self.log(f"Lastmod source: {self.lastmods.source}")
         
-        # Get all actual tool pages
-        tools = self.get_all_tool_pages()
+        self.page_index = None
+        self.sitemap_files = None
+        self.read_counter = ReadCounter(self.profiler)
+        if self.robots_filter is not None:
+            self.robots_filter.reset()
+        if self.sort_budget_mb:
+            return self.generate_sorted_sitemaps()
+        
+        # Index all actual tool pages and tools.ts in a single pass
+        with self.profiler.stage('discover'):
+            tools = self.build_page_index().tools()
         
         if not tools:
-            print("No tool pages found!")
-            return
+            self.log("No tool pages found!")
+            return {}
         
-        # Compare with tools.ts for validation
-        self.compare_with_tools_ts()
+        # Compare page files with tools.ts (nothing to compare when tools.ts is the source)
+        if self.page_index.source == 'pages':
+            with self.profiler.stage('compare'):
+                self.compare_with_tools_ts()
         
         # Group tools by category
-        categorized_tools = self.group_tools_by_category(tools)
+        with self.profiler.stage('group'):
+            categorized_tools = self.group_tools_by_category(self.allowed_tools(tools))
+        return self.write_categorized(categorized_tools)
+    
+    def generate_delta(self, json_path: Optional[str] = None, url_list_path: Optional[str] = None) -> SitemapDelta:
+        """
+        generate_sitemaps, then compare what it published with what was
+        published before it. Writes the delta as JSON to json_path and the
+        URLs to resubmit to url_list_path, when given.
+        """
+        budget_mb = self.sort_budget_mb or DEFAULT_DELTA_BUDGET_MB
+        with DeltaTracker(os.path.join(self.output_dir, 'sitemap.xml'), int(budget_mb * 1024 * 1024)) as tracker:
+            with self.profiler.stage('delta snapshot'):
+                tracker.snapshot()
+            self.generate_sitemaps()
+            with self.profiler.stage('delta'):
+                delta = tracker.finish()
         
+        self.log(f"\n{delta.summary()}")
+        if json_path:
+            delta.write_json(json_path)
+            self.log(f"Delta written to {json_path}")
+        if url_list_path:
+            delta.write_url_list(url_list_path)
+            self.log(f"{len(delta.urls())} changed URLs listed in {url_list_path}")
+        return delta
+    
+    def generate_sorted_sitemaps(self) -> Dict[str, List[str]]:
+        """
+        generate_sitemaps for tool sets too big to hold: tools stream from
+        iter_tools() into an external sort bounded by sort_budget_mb, and each
+        category sitemap is written straight from the merged runs. The output
+        is byte-identical to the in-memory sort. No page index is kept, so
+        the tools.ts comparison is skipped.
+        """
+        budget = int(self.sort_budget_mb * 1024 * 1024)
+        # (category, name, page_file, seq, id, href, url, lastmod, priority): sorting on
+        # name, then file name (pages) or catalog position (seq) matches the stable in-memory sort
+        with ExternalSorter(key=itemgetter(1, 2, 3), budget_bytes=budget, partition=itemgetter(0)) as sorter:
+            with self.profiler.stage('discover'):
+                for seq, tool in enumerate(self.allowed_tools(self.iter_tools())):
+                    sorter.add((tool.category, tool.name, tool.page_file or '', seq, tool.id,
+                                tool.href, tool.url, tool.lastmod, tool.priority))
+            
+            if not sorter.counts:
+                self.log("No tool pages found!")
+                return {}
+            if sorter.spills:
+                self.log(f"Sorted {sum(sorter.counts.values())} tools externally: {sorter.spills} spills, "
+                         f"{sorter.spilled_bytes / 1024 / 1024:.1f} MiB of sorted runs")
+            
+            categorized_tools = {category: sorter.view(category, self.tool_from_sorted_record)
+                                 for category in sorter.partitions()}
+            return self.write_categorized(categorized_tools)
+    
+    def tool_from_sorted_record(self, record: Tuple) -> ToolRecord:
+        category, name, page_file, _, tool_id, href, url, lastmod, priority = record
+        return ToolRecord(tool_id, name, category, href, url, page_file or None, lastmod, priority)
+    
+    def write_categorized(self, categorized_tools: Dict[str, Collection[ToolRecord]]) -> Dict[str, List[str]]:
+        """Report, write and publish grouped tools; returns the shard filenames per category"""
         # Report categorization results
-        print(f"\nCategorization Summary:")
+        self.log(f"\nCategorization Summary:")
         total_tools = 0
         for category, tools_in_category in categorized_tools.items():
             count = len(tools_in_category)
             total_tools += count
-            print(f"  {category}: {count} tools")
-        print(f"  Total: {total_tools} tools")
+            self.log(f"  {category}: {count} tools")
+        self.log(f"  Total: {total_tools} tools")
         
+        sitemap_files, tool_categories = self.publish_sitemaps(categorized_tools)
+        
+        self.log("\n✅ Comprehensive sitemap generation completed successfully!")
+        self.log("\nGenerated files:")
+        self.log(f"  - sitemap.xml (index file)")
+        for filename in sitemap_files['main']:
+            self.log(f"  - {filename}")
+        for category in sorted(tool_categories):
+            for filename in sitemap_files[category]:
+                self.log(f"  - {filename}")
+        return sitemap_files
+    
+    def publish_sitemaps(self, categorized_tools: Dict[str, List[ToolRecord]],
+                         affected: Optional[Set[str]] = None) -> Tuple[Dict[str, List[str]], List[str]]:
+        """
+        Write the sitemaps (only the affected ones, if given) through a fresh
+        publisher, remove stale files and save the manifest. Returns
+        (files per category, tool categories).
+        """
         # Create output directory if it doesn't exist
         os.makedirs(self.output_dir, exist_ok=True)
         
+        self.publisher = SitemapPublisher(self.output_dir)
+        if self.compress and self.compress_jobs > 1:
+            self.compress_pool = ThreadPoolExecutor(max_workers=self.compress_jobs)
+        try:
+            with self.profiler.stage('write'):
+                sitemap_files, tool_categories = self.write_all_sitemaps(categorized_tools, affected)
+        finally:
+            if self.compress_pool is not None:
+                self.compress_pool.shutdown()
+                self.compress_pool = None
+        
+        # Shards and categories that this run no longer produces
+        with self.profiler.stage('cleanup'):
+            self.publisher.remove_stale(['sitemap-main.xml'] + [f'sitemap-{category}.xml'
+                                                                for category in self.tool_categories()])
+        if not self.quiet:
+            self.publisher.print_summary()
+            self.read_counter.print_summary()
+            if self.robots_filter is not None:
+                print(self.robots_filter.summary())
+        
+        if self.manifest is not None:
+            with self.profiler.stage('save manifest'):
+                self.manifest.stamp_outputs(self.output_dir)
+                self.manifest.save()
+        return sitemap_files, tool_categories
+    
+    def write_all_sitemaps(self, categorized_tools: Dict[str, List[ToolRecord]],
+                           affected: Optional[Set[str]] = None) -> Tuple[Dict[str, List[str]], List[str]]:
+        """
+        Write category, main and index sitemaps; returns (files per category, tool categories).
+        With affected, only those categories (and 'main' if listed) are rendered
+        again; the others keep the files of the previous run.
+        """
         # Create category sitemaps (only for recognized tool categories)
         tool_categories = []
+        sitemap_files = {}
         for category, tools_in_category in categorized_tools.items():
-            if category in self.category_patterns and tools_in_category:  # Only known categories
+            if category != 'main' and tools_in_category:  # Uncategorized tools get no sitemap
                 filename = f'sitemap-{category}.xml'
-                self.create_sitemap_xml(tools_in_category, filename)
+                if affected is None or category in affected:
+                    with self.profiler.stage(filename):
+                        sitemap_files[category] = self.create_sitemap_xml(tools_in_category, filename)
+                else:
+                    sitemap_files[category] = self.sitemap_files[category]
+                    self.publisher.keep(sitemap_files[category])
                 tool_categories.append(category)
         
         # Handle any tools categorized as 'main' (uncategorized)
         if 'main' in categorized_tools:
             main_tools = categorized_tools['main']
             if main_tools:
-                print(f"\nWarning: {len(main_tools)} tools could not be categorized:")
+                self.log(f"\nWarning: {len(main_tools)} tools could not be categorized:")
                 for tool in main_tools:
-                    print(f"  - {tool['id']}")
+                    self.log(f"  - {tool.id}")
         
         # Create main sitemap
-        self.create_main_sitemap()
+        if affected is None or 'main' in affected:
+            with self.profiler.stage('sitemap-main.xml'):
+                sitemap_files['main'] = self.create_main_sitemap()
+        else:
+            sitemap_files['main'] = self.sitemap_files['main']
+            self.publisher.keep(sitemap_files['main'])
+        
+        # Every shard must be on disk before the index points at it
+        with self.profiler.stage('finish shards'):
+            self.finish_sitemap_writers()
         
         # Create sitemap index
-        self.create_sitemap_index(tool_categories)
+        with self.profiler.stage('sitemap.xml'):
+            self.create_sitemap_index(tool_categories, sitemap_files)
+        self.sitemap_files = sitemap_files
+        return sitemap_files, tool_categories
+    
+    def apply_changes(self, changed_paths: Iterable[str]) -> bool:
+        """
+        Bring the sitemaps of the last run up to date after changed_paths
+        (files created, modified or deleted; a directory stands for all of its
+        files) from the in-memory index: only changed pages are rescanned and
+        only sitemaps whose entries changed are rendered again, plus the index.
+        Returns False if nothing that feeds a sitemap changed.
+        """
+        if self.page_index is None or self.sitemap_files is None:
+            self.generate_sitemaps()
+            return True
         
-        print("\n✅ Comprehensive sitemap generation completed successfully!")
-        print("\nGenerated files:")
-        print(f"  - sitemap.xml (index file)")
-        print(f"  - sitemap-main.xml")
-        for category in sorted(tool_categories):
-            print(f"  - sitemap-{category}.xml")
+        pages_dir = os.path.abspath(self.pages_dir)
+        changed = {os.path.abspath(path) for path in changed_paths}
+        page_paths = set()
+        for path in changed:
+            if path == pages_dir:
+                page_paths.update(os.path.abspath(os.path.join(self.pages_dir, tool.page_file))
+                                  for tool in self.page_index.pages.values() if tool.page_file)
+                page_paths.update(entry.path for entry in os.scandir(path)
+                                  if entry.name.endswith('.tsx'))
+            elif os.path.dirname(path) == pages_dir and path.endswith('.tsx'):
+                page_paths.add(path)
+        catalog_changed = os.path.abspath(self.tools_ts_path) in changed
+        source = self.page_index.source
+        routes_changed = source == 'routes' and os.path.abspath(self.app_path) in changed
+        if not page_paths and not catalog_changed and not routes_changed:
+            return False
+        
+        self.log(f"\nUpdating sitemaps for {len(page_paths) + catalog_changed + routes_changed} changed files...")
+        self.read_counter = ReadCounter(self.profiler)
+        self.current_date = datetime.now().strftime("%Y-%m-%d")
+        self.lastmods.refresh()
+        if self.robots_filter is not None:
+            self.robots_filter.reset()
+        
+        affected: Set[str] = set()
+        page_ids = self.page_index.page_ids()
+        site_lastmod = self.site_lastmod
+        with self.profiler.stage('rescan'):
+            if routes_changed:
+                self.route_table = read_route_table(self.app_path, self.read_counter)
+                if not self.route_table:
+                    # Nothing left to expand; start over from the next source
+                    self.generate_sitemaps()
+                    return True
+                affected.add('main')
+            # Route components date the tool URLs they serve
+            route_files = {}
+            if self.route_table is not None:
+                route_files = {os.path.abspath(route.page_file): route for route in self.route_table
+                               if route.page_file}
+            components_changed = source == 'routes' and any(
+                not route_files[path].is_static for path in page_paths if path in route_files)
+            
+            if catalog_changed:
+                catalog = read_tools_ts(self.tools_ts_path, self.read_counter)
+                self.page_index.catalog = catalog
+                if source in ('routes', 'catalog') and not catalog:
+                    # Nothing left to build from; start over from the page files
+                    self.generate_sitemaps()
+                    return True
+            if source == 'catalog' and catalog_changed or \
+                    source == 'routes' and (catalog_changed or routes_changed or components_changed):
+                affected |= self.reload_catalog(self.page_index.catalog)
+            
+            tool_pages = []
+            for path in sorted(page_paths):
+                page_id = os.path.basename(path)[:-len('.tsx')]
+                if path in route_files and route_files[path].is_static or \
+                        self.route_table is None and page_id in self.exclude_pages:
+                    # Static pages date the main sitemap
+                    affected.add('main')
+                elif source == 'pages':
+                    tool_pages.append((page_id, os.path.join(self.pages_dir, os.path.basename(path))))
+            if tool_pages:
+                affected |= self.rescan_pages(tool_pages)
+        
+        # Listing pages without a page file of their own are dated by the newest tool
+        if self.site_lastmod != site_lastmod:
+            affected.add('main')
+        
+        if source == 'pages' and (catalog_changed or self.page_index.page_ids() != page_ids):
+            self.compare_with_tools_ts()
+        
+        if not affected:
+            self.log("No sitemap entries changed")
+            if self.manifest is not None:
+                self.manifest.save()
+            return False
+        
+        self.log(f"Re-rendering: {', '.join(sorted(affected))}")
+        with self.profiler.stage('group'):
+            categorized_tools = self.group_tools_by_category(self.allowed_tools(self.page_index.tools()))
+        self.publish_sitemaps(categorized_tools, affected)
+        return True
+    
+    def reload_catalog(self, catalog: Dict[str, CatalogTool]) -> Set[str]:
+        """
+        Replace the indexed tools with a re-read catalog (joined to the route
+        table in routes mode); returns the categories whose entries changed
+        """
+        old_tools = self.page_index.pages
+        if self.page_index.source == 'routes':
+            tools = self.get_route_tools(catalog)
+        else:
+            tools = self.get_catalog_tools(catalog)
+        self.page_index.pages = {tool.id: tool for tool in tools}
+        return changed_categories(old_tools, self.page_index.pages)
+    
+    def rescan_pages(self, pages: List[Tuple[str, str]]) -> Set[str]:
+        """
+        Rescan (page_id, page_path) pages, dropping deleted ones from the index.
+        Returns the categories whose entries changed.
+        """
+        old_tools = {page_id: self.page_index.pages.pop(page_id) for page_id, _ in pages
+                     if page_id in self.page_index.pages}
+        existing = []
+        for page_id, page_path in pages:
+            try:
+                existing.append((page_id, page_path, os.stat(page_path)))
+            except FileNotFoundError:
+                self.log(f"Removed {page_path}")
+        tools, _ = self.scan_tool_pages(existing)
+        
+        # Back in file name order, as a full scan would list them
+        self.page_index.pages.update((tool.id, tool) for tool in tools)
+        self.page_index.pages = dict(sorted(self.page_index.pages.items(),
+                                            key=lambda item: item[1].page_file))
+        self.site_lastmod = max((tool.lastmod for tool in self.page_index.pages.values() if tool.lastmod),
+                                default=None)
+        if self.manifest is not None:
+            self.manifest.prune_pages(os.path.join(self.pages_dir, tool.page_file)
+                                      for tool in self.page_index.pages.values())
+        return changed_categories(old_tools, {tool.id: tool for tool in tools})
+
+
+def tool_entry(tool: ToolRecord) -> Tuple[str, str, str, str]:
+    """(loc, lastmod, changefreq, priority) sitemap entry of a tool"""
+    return (tool.url, tool.lastmod, 'weekly', tool.priority)
+
+
+def changed_categories(old_tools: Dict[str, ToolRecord], new_tools: Dict[str, ToolRecord]) -> Set[str]:
+    """Categories holding a tool that was added, removed or changed between two id -> record maps"""
+    categories = set()
+    for tool_id in old_tools.keys() | new_tools.keys():
+        old, new = old_tools.get(tool_id), new_tools.get(tool_id)
+        if old != new:
+            categories.update(tool.category for tool in (old, new) if tool)
+    return categories
 
 
 def main():
     """Main function to run the comprehensive sitemap generator"""
+    parser = argparse.ArgumentParser(description="Generate DapsiGames sitemaps from the actual page files")
+    parser.add_argument('--cache-file', default=DEFAULT_CACHE_FILE,
+                        help=f"Incremental rebuild manifest (default: {DEFAULT_CACHE_FILE})")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Ignore the manifest and rescan/rewrite everything")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="Page scan workers, 0 = one per CPU (default: 1, serial)")
+    parser.add_argument('--executor', choices=EXECUTOR_TYPES, default='thread',
+                        help="Pool for parallel scans: thread for I/O-bound reads, process for regex-heavy extraction")
+    parser.add_argument('--title-window', type=int, default=0, metavar='BYTES',
+                        help="Only search the first BYTES of each page for a title (e.g. 65536), "
+                             "taking the first match of any title pattern; 0 reads whole files")
+    parser.add_argument('--gzip', action='store_true',
+                        help="Write sitemap-*.xml.gz files (the index stays plain sitemap.xml)")
+    parser.add_argument('--gzip-jobs', type=int, default=1,
+                        help="Threads compressing finished shards in parallel, 0 = one per CPU (default: 1, inline)")
+    parser.add_argument('--lastmod', choices=LASTMOD_SOURCES, default='git',
+                        help="Where page <lastmod> dates come from: last git commit (falling back to mtime), "
+                             "file mtime, or today's date for everything (default: git)")
+    parser.add_argument('--source', choices=URL_SOURCES, default='routes',
+                        help="Expand the App.tsx route table against tools.ts, take tool URLs from the "
+                             "tools.ts hrefs alone, or scan the page files (default: routes, falling back "
+                             "to catalog, then pages)")
+    parser.add_argument('--sort-budget', type=float, default=0, metavar='MB',
+                        help="Sort tools externally, spilling sorted runs to temp files past MB of memory "
+                             "(default: 0, sort in memory)")
+    parser.add_argument('--delta', metavar='PATH',
+                        help="Write the URLs this run added, removed or re-dated, compared with the sitemaps "
+                             "published before it, to PATH as JSON")
+    parser.add_argument('--url-list', metavar='PATH',
+                        help="Write those URLs to PATH one per line, as an IndexNow-style urlList")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep running and update the sitemaps whenever pages or tools.ts change")
+    parser.add_argument('--debounce', type=float, default=0.3, metavar='SECONDS',
+                        help="Quiet time that ends a burst of changes in watch mode (default: 0.3)")
+    parser.add_argument('--poll-interval', type=float, default=1.0, metavar='SECONDS',
+                        help="How often to check for changes when polling (default: 1.0)")
+    parser.add_argument('--polling', action='store_true',
+                        help="Watch by polling file mtimes even where inotify is available")
+    parser.add_argument('--serve', action='store_true',
+                        help="After generating, serve the sitemaps over HTTP from an in-memory cache "
+                             "with ETag and gzip support; with --watch, edits invalidate only the files they change")
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help=f"Address to serve on (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f"Port to serve on (default: {DEFAULT_PORT})")
+    parser.add_argument('--cache-mb', type=float, default=DEFAULT_CACHE_MB, metavar='MB',
+                        help=f"Memory for cached sitemap bodies in serve mode (default: {DEFAULT_CACHE_MB})")
+    add_robots_arguments(parser)
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+    
     print("DapsiGames Comprehensive Sitemap Generator")
     print("=" * 60)
     
-    generator = ComprehensiveSitemapGenerator()
-    generator.generate_sitemaps()
+    profiler = profiler_from_args(args)
+    if args.no_cache:
+        # This run rewrites the outputs behind the manifest's back
+        discard_outputs(args.cache_file)
+    generator = ComprehensiveSitemapGenerator(cache_file=None if args.no_cache else args.cache_file,
+                                              jobs=args.jobs, executor=args.executor,
+                                              title_window=args.title_window,
+                                              compress=args.gzip, compress_jobs=args.gzip_jobs,
+                                              lastmod_source=args.lastmod, source=args.source,
+                                              profiler=profiler, sort_budget_mb=args.sort_budget,
+                                              robots_filter=robots_filter_from_args(args))
+    if args.serve:
+        run_profiled(lambda: serve_sitemaps(generator, args.host, args.port, args.cache_mb, args.watch,
+                                            args.debounce, args.poll_interval, args.polling),
+                     profiler, args)
+    elif args.watch:
+        run_profiled(lambda: watch_and_regenerate(generator, args.debounce, args.poll_interval, args.polling),
+                     profiler, args)
+    elif args.delta or args.url_list:
+        run_profiled(lambda: generator.generate_delta(args.delta, args.url_list), profiler, args)
+    else:
+        run_profiled(generator.generate_sitemaps, profiler, args)
 
 
 if __name__ == "__main__":
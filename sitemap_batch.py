@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Multi-Site Batch Generation for DapsiGames Sitemaps
+Builds the same catalog for several base URLs (staging, regional mirrors,
+locales) from one scan: pages, tools.ts and App.tsx are read once, then
+each site's sitemaps are rendered into its own output tree on a process
+pool. Wall time is about one scan plus the slowest render, not one full
+run per site.
+
+Sites come from a JSON file, a list (or {"sites": [...]}) of objects:
+    {"name": "staging", "base_url": "https://staging.dapsigames.com",
+     "output_dir": "dist/sitemaps/staging", "robots": "dist/staging/robots.txt"}
+name defaults to the base URL's host, output_dir to sitemaps/<name> and
+robots to the --robots file. robots.txt rules are applied per site, after
+its URLs are rebased, so a base URL with a path prefix (/de) is checked
+against the paths that site actually serves.
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from comprehensive_sitemap_generator import ComprehensiveSitemapGenerator, URL_SOURCES
+from sitemap_lastmod import LASTMOD_SOURCES
+from sitemap_page_index import PageIndex, ReadCounter
+from sitemap_pipeline import UrlEntry
+from sitemap_profiling import add_profiling_arguments, profiler_from_args, run_profiled
+from sitemap_records import ToolRecord
+from sitemap_robots import DEFAULT_ROBOTS_PATH, DEFAULT_USER_AGENT, add_robots_arguments, load_robots_filter
+from sitemap_scanner import create_executor, resolve_jobs
+
+
+class SiteConfig(NamedTuple):
+    """One site of a batch: where its URLs point and where its sitemaps go"""
+    name: str
+    base_url: str
+    output_dir: str
+    robots: Optional[str] = None  # robots.txt whose rules this site's URLs must pass
+
+
+def load_site_configs(path: str) -> List[SiteConfig]:
+    """Sites listed in a JSON config file; raises ValueError on a bad entry"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('sites', [])
+
+    sites = []
+    for number, entry in enumerate(data, 1):
+        base_url = entry.get('base_url') if isinstance(entry, dict) else None
+        if not base_url or not urlsplit(base_url).netloc:
+            raise ValueError(f"Site {number} in {path} needs an absolute base_url")
+        name = entry.get('name') or urlsplit(base_url).netloc
+        output_dir = entry.get('output_dir') or os.path.join('sitemaps', name)
+        sites.append(SiteConfig(name, base_url.rstrip('/'), output_dir, entry.get('robots')))
+
+    output_dirs = [os.path.realpath(site.output_dir) for site in sites]
+    if len(set(output_dirs)) != len(output_dirs):
+        raise ValueError(f"Sites in {path} must not share an output_dir")
+    return sites
+
+
+def rebase_url(url: str, old_base: str, new_base: str) -> str:
+    """url moved from old_base to new_base; URLs on other hosts are left alone"""
+    if url == old_base or url.startswith(f"{old_base}/"):
+        return new_base + url[len(old_base):]
+    return url
+
+
+class SiteRenderer(ComprehensiveSitemapGenerator):
+    """Writes one site's sitemaps from tools and static entries scanned by another generator"""
+
+    def __init__(self, main_entries: List[UrlEntry], **kwargs):
+        super().__init__(**kwargs)
+        self.main_entries = main_entries
+
+    def iter_main_entries(self):
+        return iter(self.main_entries)
+
+
+def render_site(site: SiteConfig, scan_base_url: str, tools: List[ToolRecord], main_entries: List[UrlEntry],
+                page_index: PageIndex, site_lastmod: Optional[str], settings: Dict,
+                robots_agent: str = DEFAULT_USER_AGENT) -> Tuple[str, Dict[str, List[str]], float, Optional[str]]:
+    """
+    Render and publish one site from a shared scan, dropping the rebased
+    URLs its own robots.txt disallows. Runs in a worker process; returns
+    (site name, shard filenames per category, seconds, robots.txt summary).
+    """
+    start = time.perf_counter()
+    rebased = [ToolRecord(tool.id, tool.name, tool.category, tool.href,
+                          rebase_url(tool.url, scan_base_url, site.base_url),
+                          tool.page_file, tool.lastmod, tool.priority) for tool in tools]
+    entries = [entry._replace(loc=rebase_url(entry.loc, scan_base_url, site.base_url)) for entry in main_entries]
+
+    robots_filter = load_robots_filter(site.robots, robots_agent) if site.robots else None
+    renderer = SiteRenderer(entries, base_url=site.base_url, output_dir=site.output_dir, cache_file=None,
+                            lastmod_source='now', quiet=True, robots_filter=robots_filter, **settings)
+    rebased = list(renderer.allowed_tools(rebased))
+    renderer.page_index = PageIndex(rebased, page_index.catalog, page_index.source)
+    renderer.site_lastmod = site_lastmod
+    # The main sitemap's entries pass the same filter in create_main_sitemap
+    sitemap_files, _ = renderer.publish_sitemaps(renderer.group_tools_by_category(rebased))
+    summary = robots_filter.summary() if robots_filter is not None else None
+    return site.name, sitemap_files, time.perf_counter() - start, summary
+
+
+def generate_batch(generator: ComprehensiveSitemapGenerator, sites: List[SiteConfig], site_jobs: int = 0,
+                   robots_agent: str = DEFAULT_USER_AGENT) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Scan once with generator, then render every site on a process pool
+    (in this process for one job or one site). robots.txt is left to the
+    sites, each checking its own rebased URLs. Returns the shard filenames
+    per category of each site, by name.
+    """
+    generator.log(f"Batch generation for {len(sites)} sites, URL source: {generator.source}")
+    start = time.perf_counter()
+    generator.page_index = None
+    generator.read_counter = ReadCounter(generator.profiler)
+
+    with generator.profiler.stage('discover'):
+        page_index = generator.build_page_index()
+        tools = page_index.tools()
+    if not tools:
+        generator.log("No tool pages found!")
+        return {}
+    if page_index.source == 'pages':
+        with generator.profiler.stage('compare'):
+            generator.compare_with_tools_ts()
+    with generator.profiler.stage('static pages'):
+        main_entries = list(generator.iter_main_entries())
+    if generator.manifest is not None:
+        generator.manifest.save()
+    scan_seconds = time.perf_counter() - start
+    generator.log(f"Scanned {len(tools)} tools and {len(main_entries)} static pages once in {scan_seconds:.2f}s")
+
+    settings = {'max_urls_per_sitemap': generator.max_urls_per_sitemap,
+                'max_sitemap_bytes': generator.max_sitemap_bytes,
+                'compress': generator.compress, 'compress_jobs': generator.compress_jobs}
+    # The index and catalog ride along for category names; the tools go separately
+    shared_index = PageIndex([], page_index.catalog, page_index.source)
+    args = (generator.base_url, tools, main_entries, shared_index, generator.site_lastmod, settings, robots_agent)
+    jobs = min(resolve_jobs(site_jobs), len(sites))
+    results = []
+    with generator.profiler.stage('render sites'):
+        if jobs <= 1:
+            results = [render_site(site, *args) for site in sites]
+        else:
+            with create_executor('process', jobs) as executor:
+                futures = [executor.submit(render_site, site, *args) for site in sites]
+                results = [future.result() for future in futures]
+
+    site_files = {}
+    for site, (name, sitemap_files, seconds, robots_summary) in zip(sites, results):
+        site_files[name] = sitemap_files
+        shards = sum(len(files) for files in sitemap_files.values())
+        generator.log(f"  {name}: {site.base_url} -> {os.path.join(site.output_dir, 'sitemap.xml')} "
+                      f"({shards} sitemaps, {seconds:.2f}s)")
+        if robots_summary:
+            generator.log('\n'.join(f"    {line}" for line in robots_summary.splitlines()))
+    wall = time.perf_counter() - start
+    slowest = max(result[2] for result in results)
+    generator.log(f"\n✅ {len(sites)} sites in {wall:.2f}s with {jobs} workers "
+                  f"(scan {scan_seconds:.2f}s + slowest render {slowest:.2f}s)")
+    return site_files
+
+
+def main():
+    """Generate sitemaps for every site in a config file from one scan"""
+    print("DapsiGames Multi-Site Sitemap Generator")
+    print("=" * 60)
+
+    parser = argparse.ArgumentParser(description="Generate sitemaps for several base URLs from one page scan")
+    parser.add_argument('sites', help="JSON file listing the sites (name, base_url, output_dir)")
+    parser.add_argument('--site-jobs', type=int, default=0,
+                        help="Worker processes rendering sites, 0 for one per CPU (default: 0)")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="Parallel page scan workers, 0 for one per CPU (default: 1)")
+    parser.add_argument('--source', choices=URL_SOURCES, default='routes',
+                        help="Where tool URLs come from (default: routes, falling back to catalog, then pages)")
+    parser.add_argument('--lastmod', choices=LASTMOD_SOURCES, default='git',
+                        help="Date source for <lastmod> (default: git)")
+    parser.add_argument('--gzip', action='store_true',
+                        help="Write sitemap-*.xml.gz files (the indexes stay plain)")
+    parser.add_argument('--no-cache', action='store_true', help="Ignore and don't update the page scan cache")
+    add_robots_arguments(parser)
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
+    sites = load_site_configs(args.sites)
+    if not sites:
+        print(f"No sites in {args.sites}")
+        return
+    # Sites without a robots.txt of their own use --robots (skipped if missing); --no-robots turns all off
+    sites = [site._replace(robots=None if args.no_robots else site.robots or args.robots) for site in sites]
+    for site in sites:
+        if site.robots and not os.path.isfile(site.robots) and site.robots != DEFAULT_ROBOTS_PATH:
+            print(f"Warning: {site.robots} not found, {site.name} URLs are not checked against robots.txt")
+    profiler = profiler_from_args(args)
+    kwargs = {} if not args.no_cache else {'cache_file': None}
+    # The scan's own URLs use the first site's base URL; every site rebases them to its own
+    generator = ComprehensiveSitemapGenerator(base_url=sites[0].base_url, jobs=args.jobs,
+                                              compress=args.gzip, lastmod_source=args.lastmod,
+                                              source=args.source, profiler=profiler, **kwargs)
+    run_profiled(lambda: generate_batch(generator, sites, args.site_jobs, args.robots_agent), profiler, args)
+
+
+if __name__ == "__main__":
+    main()
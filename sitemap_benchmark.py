@@ -0,0 +1,645 @@
+#!/usr/bin/env python3
+"""
+Sitemap Benchmark for DapsiGames
+
+  serialize  - streaming sitemap writer vs. the original ElementTree path.
+               Each measurement runs in a fresh child process so that peak
+               RSS reflects only that run.
+  categorize - compiled single-pass categorizer vs. the original loop of
+               re.search calls over every pattern.
+  scan       - serial page scan vs. thread and process pools and the
+               bounded title window on a synthetic client/src/pages tree.
+  compress   - plain sharded output vs. gzip compressed inline and on a
+               thread pool, comparing bytes on disk and wall time.
+  pipeline   - end to end on a synthetic client/src/pages tree and
+               sitemap.xml input: times the generator's and splitter's own
+               entry points per stage (discover, scan, extract, categorize,
+               serialize, index, parse) and records peak RSS. Each size
+               runs in a fresh child process.
+  records    - heap bytes per URL (tracemalloc) of per-tool dicts vs.
+               slotted ToolRecords, and of the splitter's URL 4-tuples
+               vs. a columnar UrlBatch.
+
+Results can be saved with --json and checked against an earlier run with
+--baseline; any stage slower than the baseline by more than --threshold
+is reported and the exit status is 1. Everything runs offline.
+
+Usage:
+
+    python3 sitemap_benchmark.py                           # serialize at 10k, 100k and 1M URLs
+    python3 sitemap_benchmark.py serialize --sizes 10000   # custom sizes
+    python3 sitemap_benchmark.py categorize
+    python3 sitemap_benchmark.py scan --sizes 10000 --jobs 8
+    python3 sitemap_benchmark.py compress --sizes 1000000 --jobs 4
+    python3 sitemap_benchmark.py pipeline --sizes 1000 10000 100000 --json before.json
+    python3 sitemap_benchmark.py pipeline --sizes 1000 10000 100000 --baseline before.json
+    python3 sitemap_benchmark.py records --sizes 100000
+"""
+
+import argparse
+import contextlib
+import gzip
+import json
+import os
+import platform
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sitemap_categorizer import CompiledCategorizer
+from sitemap_lastmod import format_lastmod
+from sitemap_pipeline import UrlEntry
+from sitemap_records import ToolRecord, UrlBatch
+from sitemap_scanner import resolve_jobs, scan_page_files
+from sitemap_writer import MAX_URLS_PER_SITEMAP, ShardedSitemapWriter, SitemapWriter
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+PIPELINE_SIZES = [1_000, 10_000, 100_000]
+PIPELINE_STAGES = ('discover', 'scan', 'extract', 'categorize', 'serialize', 'index', 'parse')
+# Fields that identify a result row when comparing against a baseline
+RESULT_KEY_FIELDS = ('suite', 'impl', 'mode', 'stage', 'jobs', 'urls', 'pages', 'size')
+BASE_URL = "https://dapsigames.com"
+
+
+def synthetic_urls(count: int) -> Iterator[Tuple[str, str, str, str]]:
+    """Yield synthetic game/level/locale URL tuples"""
+    locales = ('en', 'es', 'fr', 'de')
+    for i in range(count):
+        game = i // 400
+        level = (i // 4) % 100
+        locale = locales[i % 4]
+        yield (f"{BASE_URL}/{locale}/games/game-{game}/level-{level}?ref=a&b=<c>",
+               "2025-09-18", "weekly", "0.8")
+
+
+def write_etree(path: str, count: int) -> None:
+    """Original implementation: build the whole tree, indent, then serialize"""
+    urlset = ET.Element('urlset')
+    urlset.set('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
+
+    for url, lastmod, changefreq, priority in synthetic_urls(count):
+        url_elem = ET.SubElement(urlset, 'url')
+        ET.SubElement(url_elem, 'loc').text = url
+        ET.SubElement(url_elem, 'lastmod').text = lastmod
+        ET.SubElement(url_elem, 'changefreq').text = changefreq
+        ET.SubElement(url_elem, 'priority').text = priority
+
+    tree = ET.ElementTree(urlset)
+    ET.indent(tree, space="  ", level=0)
+    with open(path, 'wb') as f:
+        tree.write(f, encoding='utf-8', xml_declaration=True)
+
+
+def write_stream(path: str, count: int) -> None:
+    """Streaming implementation"""
+    with SitemapWriter(path) as writer:
+        for url, lastmod, changefreq, priority in synthetic_urls(count):
+            writer.add_url(url, lastmod, changefreq, priority)
+
+
+IMPLEMENTATIONS = {
+    'etree': write_etree,
+    'stream': write_stream,
+}
+
+
+def run_case(impl: str, count: int, path: str) -> Dict:
+    """Run one benchmark case in this process and report its measurements"""
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    IMPLEMENTATIONS[impl](path, count)
+    elapsed = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        'impl': impl,
+        'urls': count,
+        'seconds': elapsed,
+        'urls_per_second': count / elapsed if elapsed else 0.0,
+        'peak_rss_kb': peak_rss,
+        'rss_delta_kb': peak_rss - baseline_rss,
+        'bytes': os.path.getsize(path),
+    }
+
+
+def run_in_child(impl: str, count: int, path: str) -> Dict:
+    """Run a benchmark case in a fresh interpreter and collect its JSON result"""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', impl, str(count), path],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def files_identical(path_a: str, path_b: str, chunk_size: int = 1024 * 1024) -> bool:
+    """Compare two files chunk by chunk"""
+    if os.path.getsize(path_a) != os.path.getsize(path_b):
+        return False
+    with open(path_a, 'rb') as a, open(path_b, 'rb') as b:
+        while True:
+            chunk_a = a.read(chunk_size)
+            if chunk_a != b.read(chunk_size):
+                return False
+            if not chunk_a:
+                return True
+
+
+def run_benchmark(sizes: List[int]) -> List[Dict]:
+    """Benchmark every implementation at every size and print a comparison table"""
+    results = []
+    print(f"{'impl':<8} {'urls':>10} {'seconds':>9} {'urls/s':>12} {'peak RSS MB':>12} {'identical':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for count in sizes:
+            paths = {}
+            for impl in IMPLEMENTATIONS:
+                paths[impl] = os.path.join(tmp_dir, f'{impl}-{count}.xml')
+                result = run_in_child(impl, count, paths[impl])
+                results.append(result)
+            identical = files_identical(paths['etree'], paths['stream'])
+            for result in results[-len(IMPLEMENTATIONS):]:
+                result['identical'] = identical
+                print(f"{result['impl']:<8} {result['urls']:>10} {result['seconds']:>9.3f} "
+                      f"{result['urls_per_second']:>12,.0f} {result['peak_rss_kb'] / 1024:>12.1f} "
+                      f"{str(identical):>10}")
+            for path in paths.values():
+                os.remove(path)
+    return results
+
+
+def loop_categorize(category_patterns: Dict[str, List[str]], text: str) -> str:
+    """Original implementation: one re.search per category pattern"""
+    for category, patterns in category_patterns.items():
+        for pattern in patterns:
+            if re.search(pattern, text, re.IGNORECASE):
+                return category
+    return 'main'
+
+
+def synthetic_page_ids(category_patterns: Dict[str, List[str]], count: int, distinct: int = 0,
+                       seed: int = 42) -> List[str]:
+    """
+    Page IDs where about half hit a category pattern and the rest match nothing.
+    With distinct > 0 the IDs are drawn from that many unique values, like
+    per-level/per-locale URLs that share a page slug.
+    """
+    rng = random.Random(seed)
+    words = [pattern.replace('.*', '-') for patterns in category_patterns.values() for pattern in patterns]
+    fillers = ['addition-race', 'memory-match', 'word-scramble', 'planet-quiz', 'logic-grid', 'level']
+    ids = []
+    for i in range(count):
+        n = rng.randrange(distinct) if distinct else i
+        if n % 2:
+            ids.append(f"{words[n % len(words)]}-{n}")
+        else:
+            ids.append(f"{fillers[n % len(fillers)]}-{fillers[n // 7 % len(fillers)]}-{n}")
+    return ids
+
+
+def run_categorize_benchmark(sizes: List[int], distinct: int = 0) -> List[Dict]:
+    """Compare the compiled categorizer with the per-pattern loop on the generator's patterns"""
+    from comprehensive_sitemap_generator import ComprehensiveSitemapGenerator
+
+    category_patterns = ComprehensiveSitemapGenerator(cache_file=None).category_patterns
+    categorizer = CompiledCategorizer(category_patterns, default='main')
+    implementations = {
+        'loop': lambda text: loop_categorize(category_patterns, text),
+        'compiled': categorizer.categorize,
+    }
+
+    results = []
+    print(f"{'impl':<10} {'urls':>10} {'seconds':>9} {'urls/s':>14} {'identical':>10}")
+    for count in sizes:
+        page_ids = synthetic_page_ids(category_patterns, count, distinct)
+        categorizer = CompiledCategorizer(category_patterns, default='main')
+        implementations['compiled'] = categorizer.categorize
+        outputs = {}
+        for impl, categorize in implementations.items():
+            start = time.perf_counter()
+            outputs[impl] = [categorize(page_id) for page_id in page_ids]
+            elapsed = time.perf_counter() - start
+            results.append({
+                'impl': impl,
+                'urls': count,
+                'seconds': elapsed,
+                'urls_per_second': count / elapsed if elapsed else 0.0,
+            })
+        identical = outputs['loop'] == outputs['compiled']
+        for result in results[-len(implementations):]:
+            result['identical'] = identical
+            print(f"{result['impl']:<10} {result['urls']:>10} {result['seconds']:>9.3f} "
+                  f"{result['urls_per_second']:>14,.0f} {str(identical):>10}")
+    return results
+
+
+def write_synthetic_pages(pages_dir: str, count: int, padding: int = 16384,
+                          page_ids: Optional[List[str]] = None) -> List[str]:
+    """
+    Create count .tsx pages (named game-<i>.tsx, or after page_ids) with a
+    title near the top followed by `padding` bytes of inline data
+    """
+    os.makedirs(pages_dir, exist_ok=True)
+    filler = "  [" + ", ".join(["0.125"] * 12) + "],\n"
+    data = filler * (padding // len(filler))
+    paths = []
+    for i in range(count):
+        name = page_ids[i] if page_ids else f"game-{i}"
+        path = os.path.join(pages_dir, f"{name}.tsx")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"import {{ Helmet }} from 'react-helmet-async';\n\n"
+                    f"export default function Game{i}() {{\n"
+                    f"  return <Helmet title=\"Game {i}\" />;\n}}\n\n"
+                    f"const LEVEL_DATA = [\n{data}];\n")
+        paths.append(path)
+    return paths
+
+
+def run_scan_benchmark(sizes: List[int], jobs: int, title_window: int = 4096) -> List[Dict]:
+    """Compare serial page scanning with thread and process pools and the bounded title window"""
+    from comprehensive_sitemap_generator import ComprehensiveSitemapGenerator
+
+    title_patterns = ComprehensiveSitemapGenerator(cache_file=None).title_patterns
+    # (label, executor, workers, title window)
+    modes = [
+        ('serial', 'thread', 1, 0),
+        ('thread', 'thread', jobs, 0),
+        ('process', 'process', jobs, 0),
+        ('window', 'thread', 1, title_window),
+    ]
+
+    results = []
+    print(f"{'mode':<8} {'jobs':>5} {'pages':>8} {'seconds':>9} {'pages/s':>12} {'speedup':>8} "
+          f"{'MB read':>9} {'same titles':>12}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for count in sizes:
+            paths = write_synthetic_pages(os.path.join(tmp_dir, str(count)), count)
+            baseline = None
+            serial_seconds = None
+            for label, executor, workers, window in modes:
+                scans, elapsed = scan_page_files(paths, title_patterns, workers, executor, window)
+                if baseline is None:
+                    baseline, serial_seconds = scans, elapsed
+                result = {
+                    'mode': label,
+                    'jobs': workers,
+                    'pages': count,
+                    'seconds': elapsed,
+                    'pages_per_second': count / elapsed if elapsed else 0.0,
+                    'speedup': serial_seconds / elapsed if elapsed else 0.0,
+                    'bytes_read': sum(scan.bytes_read for scan in scans),
+                    'identical': [scan.title for scan in scans] == [scan.title for scan in baseline],
+                }
+                results.append(result)
+                print(f"{label:<8} {workers:>5} {count:>8} {elapsed:>9.3f} {result['pages_per_second']:>12,.0f} "
+                      f"{result['speedup']:>7.2f}x {result['bytes_read'] / 1e6:>9.1f} {str(result['identical']):>12}")
+    return results
+
+
+def write_shards(output_dir: str, count: int, compress: bool, jobs: int) -> List[str]:
+    """Write count synthetic URLs as sharded sitemap-bench.xml(.gz), compressing on a pool if jobs > 1"""
+    pool = ThreadPoolExecutor(max_workers=jobs) if compress and jobs > 1 else None
+    try:
+        with ShardedSitemapWriter(output_dir, 'sitemap-bench.xml', max_urls=MAX_URLS_PER_SITEMAP,
+                                  compress=compress, executor=pool) as writer:
+            for loc, lastmod, changefreq, priority in synthetic_urls(count):
+                writer.add_url(loc, lastmod, changefreq, priority)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return writer.filenames
+
+
+def run_compress_benchmark(sizes: List[int], jobs: int) -> List[Dict]:
+    """Compare plain output with inline and pooled gzip compression"""
+    # (label, compress, workers)
+    modes = [
+        ('plain', False, 1),
+        ('gzip', True, 1),
+        ('gzip-pool', True, jobs),
+    ]
+
+    results = []
+    print(f"{'mode':<10} {'jobs':>5} {'urls':>10} {'shards':>7} {'seconds':>9} {'MB on disk':>11} "
+          f"{'ratio':>7} {'same xml':>9}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for count in sizes:
+            plain_files = None
+            plain_bytes = None
+            for label, compress, workers in modes:
+                output_dir = os.path.join(tmp_dir, f"{label}-{count}")
+                os.makedirs(output_dir)
+                start = time.perf_counter()
+                filenames = write_shards(output_dir, count, compress, workers)
+                elapsed = time.perf_counter() - start
+                paths = [os.path.join(output_dir, name) for name in filenames]
+                disk_bytes = sum(os.path.getsize(path) for path in paths)
+                if plain_files is None:
+                    plain_files, plain_bytes = paths, disk_bytes
+                    identical = True
+                else:
+                    identical = len(paths) == len(plain_files) and all(
+                        gzip.open(path, 'rb').read() == open(plain, 'rb').read()
+                        for path, plain in zip(paths, plain_files))
+                result = {
+                    'mode': label,
+                    'jobs': workers,
+                    'urls': count,
+                    'shards': len(filenames),
+                    'seconds': elapsed,
+                    'disk_bytes': disk_bytes,
+                    'ratio': plain_bytes / disk_bytes if disk_bytes else 0.0,
+                    'identical': identical,
+                }
+                results.append(result)
+                print(f"{label:<10} {workers:>5} {count:>10,} {len(filenames):>7} {elapsed:>9.3f} "
+                      f"{disk_bytes / 1e6:>11.2f} {result['ratio']:>6.1f}x {str(identical):>9}")
+    return results
+
+
+def tool_fields(count: int) -> Iterator[Tuple[str, str, str, str, str, str, str, str]]:
+    """
+    (id, name, category, href, url, page_file, lastmod, priority) per page,
+    built the way a scan builds them: every date is a fresh string from
+    format_lastmod, spread over a year of history.
+    """
+    categories = ('finance', 'health', 'text', 'main')
+    for i in range(count):
+        page_id = f"tool-{i}"
+        href = f"/tools/{page_id}"
+        yield (page_id, f"Tool {i}", categories[i % len(categories)], href, f"{BASE_URL}{href}",
+               f"{page_id}.tsx", format_lastmod(1_700_000_000 + (i % 365) * 86400), '0.8')
+
+
+def build_records(impl: str, count: int) -> List:
+    """count tool records (dict, slotted) or URL entries (tuple, batch) in the given layout"""
+    if impl == 'dict':
+        keys = ('id', 'name', 'category', 'href', 'url', 'page_file', 'lastmod', 'priority')
+        return [dict(zip(keys, fields)) for fields in tool_fields(count)]
+    if impl == 'slotted':
+        return [ToolRecord(*fields) for fields in tool_fields(count)]
+    # URL entries as the splitter sees them: every value a fresh string from the parser
+    entries = ((url, lastmod, ''.join(('week', 'ly')), ''.join(('0.', '8')))
+               for _, _, _, _, url, _, lastmod, _ in tool_fields(count))
+    if impl == 'tuple':
+        return list(entries)
+    return UrlBatch(UrlEntry('main', url, lastmod, changefreq, priority)
+                    for url, lastmod, changefreq, priority in entries)
+
+
+def run_records_benchmark(sizes: List[int]) -> List[Dict]:
+    """Heap bytes per URL of tool dicts vs. ToolRecord and URL 4-tuples vs. UrlBatch"""
+    results = []
+    print(f"{'impl':<10} {'urls':>10} {'bytes/url':>10} {'MiB':>9} {'seconds':>9}")
+    for count in sizes:
+        for impl in ('dict', 'slotted', 'tuple', 'batch'):
+            tracemalloc.start()
+            before, _ = tracemalloc.get_traced_memory()
+            start = time.perf_counter()
+            records = build_records(impl, count)
+            elapsed = time.perf_counter() - start
+            after, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del records
+            results.append({
+                'impl': impl,
+                'urls': count,
+                'seconds': elapsed,
+                'bytes_per_url': (after - before) / count,
+            })
+            print(f"{impl:<10} {count:>10} {(after - before) / count:>10.1f} "
+                  f"{(after - before) / 1024 / 1024:>9.1f} {elapsed:>9.3f}")
+    return results
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far (ru_maxrss is in KiB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_pipeline_case(count: int, work_dir: str) -> List[Dict]:
+    """
+    Time the generator's and splitter's own entry points on the synthetic
+    tree in work_dir (pages/, sitemap-input.xml):
+      discover   - get_all_tool_pages(), the whole pages-source discovery
+      scan       - scan_page_files() over every page (read + title)
+      extract    - extract_tool_name() page by page
+      categorize - categorize_tool() on a cold categorizer
+      serialize  - create_sitemap_xml() per category and create_main_sitemap()
+      index      - create_sitemap_index()
+      parse      - parse_existing_sitemap() plus categorize_url() per URL
+    Runs in a child process, so peak RSS is this size's alone; it is
+    cumulative across stages, which run in order.
+    """
+    from comprehensive_sitemap_generator import ComprehensiveSitemapGenerator
+    from sitemap_splitter import SitemapSplitter
+
+    pages_dir = os.path.join(work_dir, 'pages')
+    output_dir = os.path.join(work_dir, 'public')
+    os.makedirs(output_dir, exist_ok=True)
+    generator = ComprehensiveSitemapGenerator(pages_dir=pages_dir, output_dir=output_dir, cache_file=None,
+                                              lastmod_source='mtime', source='pages', quiet=True)
+    seconds = {}
+    rss = {}
+
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        start = time.perf_counter()
+        tools = generator.get_all_tool_pages()
+        seconds['discover'] = time.perf_counter() - start
+        rss['discover'] = peak_rss_mb()
+
+        page_paths = [os.path.join(pages_dir, tool.page_file) for tool in tools]
+        start = time.perf_counter()
+        scans, _ = scan_page_files(page_paths, generator.title_patterns, generator.jobs,
+                                             generator.executor, generator.title_window)
+        seconds['scan'] = time.perf_counter() - start
+        rss['scan'] = peak_rss_mb()
+        del scans
+
+        start = time.perf_counter()
+        for tool, page_path in zip(tools, page_paths):
+            generator.extract_tool_name(page_path, tool.id)
+        seconds['extract'] = time.perf_counter() - start
+        rss['extract'] = peak_rss_mb()
+
+        # discover already warmed the memoizing categorizer
+        generator.categorizer = CompiledCategorizer(generator.category_patterns, default='main')
+        start = time.perf_counter()
+        for tool in tools:
+            generator.categorize_tool(tool.id)
+        seconds['categorize'] = time.perf_counter() - start
+        rss['categorize'] = peak_rss_mb()
+
+        start = time.perf_counter()
+        categorized = generator.group_tools_by_category(tools)
+        sitemap_files = {}
+        for category, tools_in_category in categorized.items():
+            if category != 'main':
+                sitemap_files[category] = generator.create_sitemap_xml(tools_in_category, f'sitemap-{category}.xml')
+        sitemap_files['main'] = generator.create_main_sitemap()
+        seconds['serialize'] = time.perf_counter() - start
+        rss['serialize'] = peak_rss_mb()
+
+        start = time.perf_counter()
+        generator.create_sitemap_index(list(sitemap_files), sitemap_files)
+        seconds['index'] = time.perf_counter() - start
+        rss['index'] = peak_rss_mb()
+
+        start = time.perf_counter()
+        splitter = SitemapSplitter(os.path.join(work_dir, 'sitemap-input.xml'), BASE_URL)
+        for url, _, _, _ in splitter.parse_existing_sitemap():
+            splitter.categorize_url(url)
+        seconds['parse'] = time.perf_counter() - start
+        rss['parse'] = peak_rss_mb()
+
+    return [{
+        'suite': 'pipeline',
+        'stage': stage,
+        'size': count,
+        'seconds': seconds[stage],
+        'items_per_second': count / seconds[stage] if seconds[stage] else 0.0,
+        'peak_rss_mb': rss[stage],
+    } for stage in PIPELINE_STAGES]
+
+
+def run_pipeline_benchmark(sizes: List[int], padding: int = 512) -> List[Dict]:
+    """Build a synthetic pages tree and sitemap input per size, then time each stage in a child process"""
+    from comprehensive_sitemap_generator import ComprehensiveSitemapGenerator
+
+    category_patterns = ComprehensiveSitemapGenerator(cache_file=None).category_patterns
+    results = []
+    print(f"{'stage':<11} {'size':>10} {'seconds':>9} {'items/s':>12} {'peak RSS MB':>12}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for count in sizes:
+            work_dir = os.path.join(tmp_dir, str(count))
+            write_synthetic_pages(os.path.join(work_dir, 'pages'), count, padding,
+                                  synthetic_page_ids(category_patterns, count))
+            write_stream(os.path.join(work_dir, 'sitemap-input.xml'), count)
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child-pipeline', str(count), work_dir],
+                check=True, capture_output=True, text=True
+            ).stdout
+            for result in json.loads(output):
+                results.append(result)
+                print(f"{result['stage']:<11} {count:>10,} {result['seconds']:>9.3f} "
+                      f"{result['items_per_second']:>12,.0f} {result['peak_rss_mb']:>12.1f}")
+    return results
+
+
+def result_key(result: Dict) -> Tuple:
+    """Identity of a result row, stable across runs"""
+    return tuple((field, result[field]) for field in RESULT_KEY_FIELDS if field in result)
+
+
+def load_results(path: str) -> List[Dict]:
+    """Result rows from a --json file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    # Files written before run metadata was added are a bare list
+    return data['results'] if isinstance(data, dict) else data
+
+
+def compare_results(baseline: List[Dict], results: List[Dict], threshold: float,
+                    min_seconds: float = 0.05) -> List[str]:
+    """
+    Regressions of results against baseline: rows slower (or with a higher
+    peak RSS) by more than threshold, as a fraction. Timings where both runs
+    are under min_seconds are too noisy to judge and are skipped.
+    """
+    previous = {result_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(result_key(result))
+        if before is None:
+            continue
+        label = ' '.join(f"{field}={value}" for field, value in result_key(result))
+        if max(before['seconds'], result['seconds']) >= min_seconds and \
+                result['seconds'] > before['seconds'] * (1 + threshold):
+            regressions.append(f"{label}: {before['seconds']:.3f}s -> {result['seconds']:.3f}s "
+                               f"(+{(result['seconds'] / before['seconds'] - 1) * 100:.0f}%)")
+        if 'peak_rss_mb' in result and 'peak_rss_mb' in before and \
+                result['peak_rss_mb'] > before['peak_rss_mb'] * (1 + threshold):
+            regressions.append(f"{label}: peak RSS {before['peak_rss_mb']:.1f} MB -> {result['peak_rss_mb']:.1f} MB")
+    return regressions
+
+
+def run_metadata() -> Dict:
+    """Where and when the results were measured"""
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def main():
+    """Main function to run the sitemap benchmark"""
+    if len(sys.argv) == 5 and sys.argv[1] == '--child':
+        _, _, impl, count, path = sys.argv
+        print(json.dumps(run_case(impl, int(count), path)))
+        return
+    if len(sys.argv) == 4 and sys.argv[1] == '--child-pipeline':
+        _, _, count, work_dir = sys.argv
+        print(json.dumps(run_pipeline_case(int(count), work_dir)))
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark sitemap generation stages")
+    parser.add_argument('suite', nargs='?', default='serialize', choices=['serialize', 'categorize', 'scan', 'compress', 'pipeline', 'records'],
+                        help="What to benchmark (default: serialize)")
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        help="URL counts to benchmark (default: 10k, 100k and 1M; pipeline: 1k, 10k and 100k)")
+    parser.add_argument('--distinct', type=int, default=0,
+                        help="categorize: draw page IDs from this many unique values (default: all unique)")
+    parser.add_argument('--jobs', type=int, default=0,
+                        help="scan/compress: worker count for the pooled modes (default: one per CPU)")
+    parser.add_argument('--json', dest='json_path', help="Write raw results to this JSON file")
+    parser.add_argument('--baseline', help="Compare against results saved earlier with --json")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Fractional slowdown that counts as a regression (default: 0.10)")
+    parser.add_argument('--min-seconds', type=float, default=0.05,
+                        help="Ignore timings under this many seconds in both runs as noise (default: 0.05)")
+    args = parser.parse_args()
+    sizes = args.sizes or (PIPELINE_SIZES if args.suite == 'pipeline' else DEFAULT_SIZES)
+
+    print("DapsiGames Sitemap Benchmark")
+    print("=" * 60)
+    if args.suite == 'categorize':
+        results = run_categorize_benchmark(sizes, args.distinct)
+    elif args.suite == 'scan':
+        results = run_scan_benchmark(sizes, resolve_jobs(args.jobs))
+    elif args.suite == 'compress':
+        results = run_compress_benchmark(sizes, resolve_jobs(args.jobs))
+    elif args.suite == 'pipeline':
+        results = run_pipeline_benchmark(sizes)
+    elif args.suite == 'records':
+        results = run_records_benchmark(sizes)
+    else:
+        results = run_benchmark(sizes)
+
+    for result in results:
+        result.setdefault('suite', args.suite)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'meta': run_metadata(), 'results': results}, f, indent=2)
+        print(f"\nWrote results to {args.json_path}")
+
+    if args.baseline:
+        regressions = compare_results(load_results(args.baseline), results, args.threshold, args.min_seconds)
+        if regressions:
+            print(f"\n{len(regressions)} regressions against {args.baseline} (threshold {args.threshold:.0%}):")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print(f"\n✅ No regressions against {args.baseline} (threshold {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
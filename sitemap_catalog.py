@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tool Catalog Parser for DapsiGames Sitemaps
+Extracts the Tool object literals (id, name, category, href, isPopular)
+from client/src/data/tools.ts in one linear pass, so sitemaps can be built
+straight from the catalog without reading any page component.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+# JS string literal bodies, written as unrolled loops (much faster in re than
+# an alternation per character)
+_SQ_BODY = r"[^'\\\n]*(?:\\.[^'\\\n]*)*"
+_DQ_BODY = r'[^"\\\n]*(?:\\.[^"\\\n]*)*'
+_BQ_BODY = r'[^`\\$]*(?:\\.[^`\\$]*)*'
+
+# One token per match: a comment, a `key: literal` property, any other string
+# literal (skipped whole so braces inside descriptions don't count), or a
+# brace. Filler that can't start a token is consumed inside the match, which
+# keeps the regex engine from restarting at every character.
+_TOKEN_REGEX = re.compile(rf"""
+    [^{{}}'"`/\w$]*
+    (?: (//[^\n]*|/\*.*?\*/)
+      | ([A-Za-z_$][\w$]*|'[^'\n]*'|"[^"\n]*")\s*:\s*
+        (?: '({_SQ_BODY})'
+          | "({_DQ_BODY})"
+          | `({_BQ_BODY})`
+          | (true|false|null|-?\d+(?:\.\d+)?)\b )
+      | ('{_SQ_BODY}'|"{_DQ_BODY}"|`[^`\\]*(?:\\.[^`\\]*)*`)
+      | (\{{)
+      | (\}})
+    )
+""", re.VERBOSE | re.DOTALL)
+
+_ESCAPE_REGEX = re.compile(r'\\(u[0-9a-fA-F]{4}|u\{[0-9a-fA-F]+\}|x[0-9a-fA-F]{2}|.)', re.DOTALL)
+_SIMPLE_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+_LITERALS = {'true': True, 'false': False, 'null': None}
+
+
+class CatalogTool(NamedTuple):
+    """One entry of the tools.ts catalog"""
+    id: str
+    name: str
+    category: Optional[str]
+    href: str
+    is_popular: bool = False
+
+
+def unescape_js_string(value: str) -> str:
+    """Resolve backslash escapes of a JS string literal body"""
+    if '\\' not in value:
+        return value
+
+    def replace(match: re.Match) -> str:
+        escape = match.group(1)
+        if escape[0] in 'ux' and len(escape) > 1:
+            return chr(int(escape[1:].strip('{}'), 16))
+        return _SIMPLE_ESCAPES.get(escape, escape)
+
+    return _ESCAPE_REGEX.sub(replace, value)
+
+
+def parse_object_literals(content: str) -> List[Dict]:
+    """
+    Every object literal in TypeScript source as a dict of its literal-valued
+    properties (strings, booleans, numbers, null), innermost objects first.
+    Properties with computed values are ignored; unbalanced braces are
+    tolerated.
+    """
+    objects: List[Dict] = []
+    stack: List[Dict] = []
+    # findall hands back plain tuples, far cheaper per token than Match objects
+    for _, key, sq, dq, bq, literal, _, opened, closed in _TOKEN_REGEX.findall(content):
+        if opened:
+            stack.append({})
+        elif closed:
+            if stack:
+                objects.append(stack.pop())
+        elif key and stack:
+            if literal:
+                value = _LITERALS[literal] if literal in _LITERALS else float(literal)
+            else:
+                value = unescape_js_string(sq or dq or bq)
+            stack[-1][key.strip('\'"')] = value
+    return objects
+
+
+def parse_tools_catalog(content: str) -> List[CatalogTool]:
+    """
+    Tool entries of tools.ts in file order: every object literal with a
+    string id and href. Later duplicates of an id are dropped.
+    """
+    tools: List[CatalogTool] = []
+    seen = set()
+    for obj in parse_object_literals(content):
+        tool_id, href = obj.get('id'), obj.get('href')
+        if not isinstance(tool_id, str) or not isinstance(href, str) or tool_id in seen:
+            continue
+        seen.add(tool_id)
+        name = obj.get('name')
+        category = obj.get('category')
+        tools.append(CatalogTool(
+            id=tool_id,
+            name=name if isinstance(name, str) else tool_id.replace('-', ' ').title(),
+            category=category if isinstance(category, str) else None,
+            href=href,
+            is_popular=obj.get('isPopular') is True,
+        ))
+    return tools
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+URL Normalization and Deduplication for DapsiGames Sitemaps
+Canonicalizes URLs with urlparse (case, default ports, trailing slashes,
+tracking parameters, fragments) and drops repeats of the same page.
+  exact - a dict of every canonical URL: no false positives, and each URL
+          keeps the newest lastmod seen for any of its spellings. URLs are
+          emitted once the input is exhausted, in first-seen order.
+  bloom - a fixed-size Bloom filter: memory stays bounded however large
+          the input, URLs stream straight through and the first spelling
+          wins, and about error_rate of the unique URLs are wrongly dropped.
+"""
+
+import hashlib
+import math
+import re
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
+
+DEDUP_MODES = ('exact', 'bloom')
+
+# Query parameters that only track where a visit came from
+TRACKING_PARAMS = {'gclid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid', '_ga', '_gl'}
+TRACKING_PREFIXES = ('utm_',)
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+_SLASHES_REGEX = re.compile(r'/{2,}')
+
+
+def normalize_url(url: str, lowercase_path: bool = False) -> str:
+    """
+    Canonical form of an absolute URL: lowercase scheme and host, no
+    default port, no fragment, tracking parameters removed and the rest
+    sorted, repeated slashes collapsed, no trailing slash except on the
+    root. Paths keep their case, since /Games/Foo and /games/foo are
+    different resources on a case-sensitive server; lowercase_path folds
+    them for sites known to be case-insensitive. Values that don't parse
+    as URLs are returned stripped but otherwise unchanged.
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').rstrip('.')
+    if ':' in host:
+        host = f'[{host}]'  # IPv6 literal
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{port}'
+    if parts.username or parts.password:
+        credentials = parts.username or ''
+        if parts.password:
+            credentials += f':{parts.password}'
+        host = f'{credentials}@{host}'
+
+    path = _SLASHES_REGEX.sub('/', parts.path) or '/'
+    if lowercase_path:
+        path = path.lower()
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+
+    query = ''
+    if parts.query:
+        # Pairs keep their original encoding (%20 is not turned into +); filtered and sorted by decoded key and value
+        params = []
+        for pair in parts.query.split('&'):
+            if not pair:
+                continue
+            raw_key, _, raw_value = pair.partition('=')
+            key = unquote_plus(raw_key)
+            if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES):
+                params.append(((key, unquote_plus(raw_value)), pair))
+        query = '&'.join(pair for _, pair in sorted(params))
+
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+class BloomFilter:
+    """Bit array sized for capacity items at error_rate false positives, k hashes by double hashing"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(1, capacity)
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, value: str) -> bool:
+        """Set value's bits; returns True if they were all set already (probably seen)"""
+        digest = hashlib.blake2b(value.encode('utf-8', errors='surrogatepass'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        seen = True
+        bits = self.bits
+        for i in range(self.hashes):
+            bit = (first + i * second) % self.size
+            byte, mask = bit >> 3, 1 << (bit & 7)
+            if not bits[byte] & mask:
+                seen = False
+                bits[byte] |= mask
+        return seen
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self.bits)
+
+
+class UrlDeduplicator:
+    """
+    Normalization-plus-dedup stage over (loc, lastmod, changefreq,
+    priority) tuples. Counts what it did for the run summary.
+    """
+
+    def __init__(self, mode: str = 'exact', capacity: int = 1_000_000, error_rate: float = 0.001,
+                 lowercase_path: bool = False):
+        if mode not in DEDUP_MODES:
+            raise ValueError(f"Unknown dedup mode {mode!r}, expected one of {', '.join(DEDUP_MODES)}")
+        self.mode = mode
+        self.lowercase_path = lowercase_path
+        self.bloom = BloomFilter(capacity, error_rate) if mode == 'bloom' else None
+        self.seen = 0
+        self.emitted = 0
+        self.normalized = 0
+        self.newer_lastmods = 0
+
+    @property
+    def duplicates(self) -> int:
+        return self.seen - self.emitted
+
+    def process(self, urls: Iterable[Tuple[str, Optional[str], Optional[str], Optional[str]]]
+                ) -> Iterator[Tuple[str, Optional[str], Optional[str], Optional[str]]]:
+        """Canonical, unique entries of urls"""
+        if self.bloom is not None:
+            return self._process_bloom(urls)
+        return self._process_exact(urls)
+
+    def _canonical(self, loc: str) -> str:
+        self.seen += 1
+        canonical = normalize_url(loc, self.lowercase_path)
+        if canonical != loc:
+            self.normalized += 1
+        return canonical
+
+    def _process_exact(self, urls) -> Iterator[Tuple]:
+        entries: Dict[str, Tuple] = {}
+        for loc, lastmod, changefreq, priority in urls:
+            canonical = self._canonical(loc)
+            kept = entries.get(canonical)
+            if kept is None:
+                entries[canonical] = (canonical, lastmod, changefreq, priority)
+            elif lastmod and (kept[1] is None or lastmod > kept[1]):
+                entries[canonical] = (canonical, lastmod, kept[2], kept[3])
+                self.newer_lastmods += 1
+        self.emitted = len(entries)
+        yield from entries.values()
+
+    def _process_bloom(self, urls) -> Iterator[Tuple]:
+        for loc, lastmod, changefreq, priority in urls:
+            canonical = self._canonical(loc)
+            if not self.bloom.add(canonical):
+                self.emitted += 1
+                yield (canonical, lastmod, changefreq, priority)
+
+    def summary(self) -> str:
+        line = (f"Deduplicated {self.seen} URLs ({self.mode}): {self.emitted} unique, "
+                f"{self.duplicates} duplicates dropped, {self.normalized} rewritten to canonical form")
+        if self.bloom is not None:
+            line += f", {self.bloom.memory_bytes / 1024 / 1024:.1f} MiB filter"
+        else:
+            line += f", {self.newer_lastmods} newer lastmods kept"
+        return line
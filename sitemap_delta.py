@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Sitemap Delta for DapsiGames
+Works out which URLs a run added, removed or re-dated compared with the
+sitemaps published before it, for cache purging and crawler notification.
+The previously published sitemaps are streamed into an external sort
+before the run and the newly published ones after it; a merge-join of the
+two sorted streams then yields the differences. Memory is bounded by the
+sort budget plus the differences, not by the size of the site. Results go
+to a JSON report and an IndexNow-style URL list (one URL per line); nothing
+is sent anywhere.
+"""
+
+import json
+import os
+from datetime import datetime
+from operator import itemgetter
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from sitemap_reader import iter_sitemap_urls
+from sitemap_sort import ExternalSorter
+
+DEFAULT_DELTA_BUDGET_MB = 64
+
+
+class SitemapDelta:
+    """URLs added, removed and with a changed lastmod between two sitemap sets"""
+
+    def __init__(self):
+        self.added: List[Tuple[str, Optional[str]]] = []
+        self.removed: List[Tuple[str, Optional[str]]] = []
+        self.changed: List[Tuple[str, Optional[str], Optional[str]]] = []
+        self.old_count = 0
+        self.new_count = 0
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+    def urls(self) -> List[str]:
+        """Every URL a crawler should revisit: added, re-dated and removed ones"""
+        return ([loc for loc, _ in self.added] + [loc for loc, _, _ in self.changed]
+                + [loc for loc, _ in self.removed])
+
+    def to_dict(self) -> dict:
+        return {
+            'generated': datetime.now().isoformat(timespec='seconds'),
+            'old_urls': self.old_count,
+            'new_urls': self.new_count,
+            'added': [{'loc': loc, 'lastmod': lastmod} for loc, lastmod in self.added],
+            'removed': [{'loc': loc, 'lastmod': lastmod} for loc, lastmod in self.removed],
+            'changed': [{'loc': loc, 'old_lastmod': old, 'new_lastmod': new} for loc, old, new in self.changed],
+        }
+
+    def write_json(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write('\n')
+
+    def write_url_list(self, path: str) -> None:
+        """The IndexNow urlList, one URL per line, ready to submit"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for loc in self.urls():
+                f.write(f"{loc}\n")
+
+    def summary(self) -> str:
+        return (f"Delta: {len(self.added)} added, {len(self.removed)} removed, {len(self.changed)} lastmod "
+                f"changed ({self.old_count} URLs before, {self.new_count} after)")
+
+
+def collapse(records: Iterable[Tuple[str, str]]) -> Iterator[Tuple[str, str]]:
+    """(loc, lastmod) records sorted by loc with repeats of a loc folded into one (the newest lastmod)"""
+    current = None
+    for record in records:
+        if current is not None and record[0] == current[0]:
+            if record[1] > current[1]:
+                current = record
+            continue
+        if current is not None:
+            yield current
+        current = record
+    if current is not None:
+        yield current
+
+
+def merge_join(old: Iterable[Tuple[str, str]], new: Iterable[Tuple[str, str]], delta: SitemapDelta) -> SitemapDelta:
+    """Fill delta from two (loc, lastmod) streams sorted by loc; '' stands for no lastmod"""
+    old_iter, new_iter = collapse(old), collapse(new)
+    old_record, new_record = next(old_iter, None), next(new_iter, None)
+    while old_record is not None or new_record is not None:
+        if new_record is None or (old_record is not None and old_record[0] < new_record[0]):
+            delta.removed.append((old_record[0], old_record[1] or None))
+            old_record = next(old_iter, None)
+        elif old_record is None or new_record[0] < old_record[0]:
+            delta.added.append((new_record[0], new_record[1] or None))
+            new_record = next(new_iter, None)
+        else:
+            if old_record[1] != new_record[1]:
+                delta.changed.append((new_record[0], old_record[1] or None, new_record[1] or None))
+            old_record, new_record = next(old_iter, None), next(new_iter, None)
+    return delta
+
+
+class DeltaTracker:
+    """
+    Snapshot of the published sitemaps under index_path, compared with the
+    ones published afterwards by finish(). Each side is sorted by loc in an
+    ExternalSorter, spilling beyond budget_bytes.
+    """
+
+    def __init__(self, index_path: str, budget_bytes: int = DEFAULT_DELTA_BUDGET_MB * 1024 * 1024,
+                 temp_dir: Optional[str] = None):
+        self.index_path = index_path
+        self.budget_bytes = budget_bytes
+        self.temp_dir = temp_dir
+        self.old: Optional[ExternalSorter] = None
+
+    def sort_published(self) -> ExternalSorter:
+        """The currently published URLs as (loc, lastmod) records, sorted by loc"""
+        sorter = ExternalSorter(key=itemgetter(0, 1), budget_bytes=self.budget_bytes, temp_dir=self.temp_dir)
+        if os.path.exists(self.index_path):
+            for url in iter_sitemap_urls(self.index_path):
+                sorter.add((url.loc, url.lastmod or ''))
+        return sorter
+
+    def snapshot(self) -> None:
+        """Read what is published now; call before the run replaces it"""
+        self.close()
+        self.old = self.sort_published()
+
+    def finish(self) -> SitemapDelta:
+        """Compare what is published now with the snapshot"""
+        if self.old is None:
+            raise RuntimeError("DeltaTracker.finish() called without a snapshot")
+        with self.sort_published() as new:
+            delta = SitemapDelta()
+            delta.old_count = sum(self.old.counts.values())
+            delta.new_count = sum(new.counts.values())
+            merge_join(self.old.sorted(), new.sorted(), delta)
+        self.close()
+        return delta
+
+    def close(self) -> None:
+        if self.old is not None:
+            self.old.close()
+            self.old = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Lastmod Provider for DapsiGames Sitemaps
+Dates each page by its last git commit or its file mtime, instead of
+stamping the build date onto every <lastmod> on every regeneration.
+"""
+
+import os
+import subprocess
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+LASTMOD_SOURCES = ('git', 'mtime', 'now')
+
+
+def format_lastmod(timestamp: float) -> str:
+    """W3C date (YYYY-MM-DD, UTC) for a POSIX timestamp"""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def git_head(directory: str) -> Optional[str]:
+    """Commit checked out in the repository containing directory, or None outside git"""
+    try:
+        result = subprocess.run(['git', '-C', directory, 'rev-parse', 'HEAD'],
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def git_commit_dates(directory: str) -> Dict[str, str]:
+    """
+    Last commit date of every file under directory, from a single git log
+    pass rather than one process per file. git log lists newest commits
+    first, so the first date seen for a path wins. Paths are relative to
+    directory, '/'-separated.
+    """
+    result = subprocess.run(
+        ['git', '-c', 'core.quotePath=false', '-C', directory, 'log',
+         '--format=%x1e%ct', '--name-only', '--no-renames', '--relative', '--', '.'],
+        capture_output=True, text=True, check=True)
+
+    dates: Dict[str, str] = {}
+    for commit in result.stdout.split('\x1e'):
+        lines = commit.strip().splitlines()
+        if not lines:
+            continue
+        date = format_lastmod(int(lines[0]))
+        for name in lines[1:]:
+            if name:
+                dates.setdefault(name, date)
+    return dates
+
+
+def git_file_date(path: str) -> Optional[str]:
+    """Last commit date of a single file, None if git has no history for it"""
+    directory, name = os.path.split(os.path.abspath(path))
+    try:
+        result = subprocess.run(['git', '-C', directory, 'log', '-1', '--format=%ct', '--', name],
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    timestamp = result.stdout.strip()
+    return format_lastmod(int(timestamp)) if timestamp else None
+
+
+class LastmodProvider:
+    """
+    <lastmod> values for page files.
+      git   - date of the last commit touching the file; files git knows
+              nothing about (new, untracked, no repository) use their mtime.
+              Uncommitted edits show up once they are committed.
+      mtime - file modification time
+      now   - today's date for every page (the old behaviour)
+    Git dates for the whole pages directory come from one git log run and
+    are cached in the manifest against the HEAD commit, so rebuilding an
+    unchanged checkout never runs git log again. Files outside the pages
+    directory (such as tools.ts) cost one git log each, once per run.
+    """
+
+    def __init__(self, source: str = 'git', pages_dir: str = "client/src/pages", manifest=None):
+        if source not in LASTMOD_SOURCES:
+            raise ValueError(f"Unknown lastmod source {source!r}, expected one of {', '.join(LASTMOD_SOURCES)}")
+        self.source = source
+        self.pages_dir = pages_dir
+        self.manifest = manifest
+        self.current_date = datetime.now().strftime("%Y-%m-%d")
+        self._git_dates: Optional[Dict[str, str]] = None
+        self._other_dates: Dict[str, Optional[str]] = {}
+
+    def git_dates(self) -> Dict[str, str]:
+        """Commit dates for the pages directory, loaded on first use"""
+        if self._git_dates is None:
+            self._git_dates = self.load_git_dates()
+        return self._git_dates
+
+    def refresh(self) -> None:
+        """
+        Drop cached dates so a long-running process sees new commits and the
+        new day. Git dates come back from the manifest while HEAD is unchanged.
+        """
+        self.current_date = datetime.now().strftime("%Y-%m-%d")
+        self._git_dates = None
+        self._other_dates.clear()
+
+    def load_git_dates(self) -> Dict[str, str]:
+        head = git_head(self.pages_dir)
+        if head is None:
+            print(f"Warning: {self.pages_dir} is not in a git checkout, using file mtimes for lastmod")
+            return {}
+
+        if self.manifest is not None:
+            dates = self.manifest.cached_git_dates(head)
+            if dates is not None:
+                return dates
+
+        try:
+            dates = git_commit_dates(self.pages_dir)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"Warning: git log failed in {self.pages_dir}, using file mtimes for lastmod: {e}")
+            return {}
+
+        if self.manifest is not None:
+            self.manifest.update_git_dates(head, dates)
+        return dates
+
+    def page_lastmod(self, page_path: str, stat: Optional[os.stat_result] = None) -> Optional[str]:
+        """lastmod for one page file (stat avoids a second stat call), None if it can't be read"""
+        if self.source == 'now':
+            return self.current_date
+
+        if self.source == 'git':
+            name = os.path.relpath(page_path, self.pages_dir).replace(os.sep, '/')
+            if name.startswith('../'):
+                if page_path not in self._other_dates:
+                    self._other_dates[page_path] = git_file_date(page_path)
+                date = self._other_dates[page_path]
+            else:
+                date = self.git_dates().get(name)
+            if date:
+                return date
+
+        if stat is None:
+            try:
+                stat = os.stat(page_path)
+            except OSError:
+                return None
+        return format_lastmod(stat.st_mtime)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Incremental Rebuild Manifest for DapsiGames Sitemaps
+Remembers what each page scan and each sitemap write produced last time, so
+unchanged pages are not re-read and unchanged sitemaps are not rewritten.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Set
+
+MANIFEST_VERSION = 1
+
+
+def fingerprint(*parts) -> str:
+    """Stable hash of JSON-serializable settings (patterns, limits, ...)"""
+    data = json.dumps(parts, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def hash_bytes(data: bytes) -> str:
+    """Content hash stored for each page"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_entries(entries: Iterable[Iterable[Optional[str]]], *settings) -> str:
+    """Hash a sequence of sitemap entries plus the settings that shape the output files"""
+    digest = hashlib.sha256(fingerprint(*settings).encode('ascii'))
+    for entry in entries:
+        record = '\x1f'.join('\x00' if value is None else value for value in entry)
+        digest.update(record.encode('utf-8', errors='surrogatepass') + b'\x1e')
+    return digest.hexdigest()
+
+
+def discard_outputs(path: str) -> None:
+    """
+    Forget the sitemap outputs recorded in the manifest at path, if any, so
+    the next cached run rewrites them; used by runs that bypass the manifest.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return
+    if not data.get('outputs'):
+        return
+    data['outputs'] = {}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+class PageManifest:
+    """
+    JSON manifest with two sections:
+      pages   - path -> {size, mtime_ns, sha256, name, category}
+      outputs - sitemap filename -> {digest, files, lastmods, stats}
+    plus the git commit dates of the pages, valid for one HEAD commit.
+    The whole manifest is discarded when the scan settings fingerprint changes
+    (for example after editing the category patterns).
+    """
+
+    def __init__(self, path: str, settings_fingerprint: str):
+        self.path = path
+        self.settings_fingerprint = settings_fingerprint
+        self.pages: Dict[str, Dict] = {}
+        self.outputs: Dict[str, Dict] = {}
+        self.git_dates: Dict = {}
+        # Outputs updated since the last stamp_outputs(), whose files have no stats yet
+        self.unstamped: Set[str] = set()
+        self.dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """Load the manifest from disk, starting empty if it is missing, corrupt or stale"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable manifest {self.path}: {e}")
+            return
+
+        if data.get('version') != MANIFEST_VERSION or data.get('fingerprint') != self.settings_fingerprint:
+            self.dirty = True
+            return
+
+        self.pages = data.get('pages', {})
+        self.outputs = data.get('outputs', {})
+        self.git_dates = data.get('git_dates', {})
+
+    def save(self) -> None:
+        """Write the manifest atomically, only if something changed"""
+        if not self.dirty:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': MANIFEST_VERSION,
+                'fingerprint': self.settings_fingerprint,
+                'pages': self.pages,
+                'outputs': self.outputs,
+                'git_dates': self.git_dates,
+            }, f, separators=(',', ':'), sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    # Pages
+
+    def lookup_stat(self, page_path: str, stat: os.stat_result) -> Optional[Dict]:
+        """Cached record if size and mtime are unchanged (no read needed)"""
+        record = self.pages.get(page_path)
+        if record and record['size'] == stat.st_size and record['mtime_ns'] == stat.st_mtime_ns:
+            return record
+        return None
+
+    def lookup_hash(self, page_path: str, stat: os.stat_result, content_hash: str) -> Optional[Dict]:
+        """Cached record if the content is unchanged even though the file was touched"""
+        record = self.pages.get(page_path)
+        if record and record['sha256'] is not None and record['sha256'] == content_hash:
+            record['size'] = stat.st_size
+            record['mtime_ns'] = stat.st_mtime_ns
+            self.dirty = True
+            return record
+        return None
+
+    def update_page(self, page_path: str, stat: os.stat_result, content_hash: Optional[str], **fields) -> Dict:
+        """Store a freshly scanned page (content_hash is None for bounded-read scans)"""
+        record = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': content_hash,
+        }
+        record.update(fields)
+        self.pages[page_path] = record
+        self.dirty = True
+        return record
+
+    def prune_pages(self, seen_paths: Iterable[str]) -> None:
+        """Forget pages that no longer exist"""
+        stale = set(self.pages) - set(seen_paths)
+        for page_path in stale:
+            del self.pages[page_path]
+        if stale:
+            self.dirty = True
+
+    # Outputs
+
+    def output_unchanged(self, filename: str, digest: str, output_dir: str) -> Optional[List[str]]:
+        """
+        Files previously written for filename if the digest matches and every
+        file still has the size and mtime it was published with. Anything else
+        touching the files (another run, --no-cache, a hand edit) forces a rewrite.
+        """
+        record = self.outputs.get(filename)
+        if not record or record['digest'] != digest or not record.get('stats'):
+            return None
+        files = record['files']
+        for name, stats in zip(files, record['stats']):
+            try:
+                stat = os.stat(os.path.join(output_dir, name))
+            except OSError:
+                return None
+            if [stat.st_size, stat.st_mtime_ns] != stats:
+                return None
+        return files
+
+    def update_output(self, filename: str, digest: str, files: List[str],
+                      lastmods: Optional[List[Optional[str]]] = None) -> None:
+        """
+        Remember what was written for filename (and the newest lastmod in each
+        file). The files may still be in flight; stamp_outputs() records their
+        stats once they are published.
+        """
+        self.outputs[filename] = {'digest': digest, 'files': list(files),
+                                  'lastmods': list(lastmods or [None] * len(files)), 'stats': None}
+        self.unstamped.add(filename)
+        self.dirty = True
+
+    def stamp_outputs(self, output_dir: str) -> None:
+        """Record size and mtime of the published files of outputs updated since the last stamp"""
+        for filename in self.unstamped:
+            record = self.outputs.get(filename)
+            if record is None:
+                continue
+            try:
+                record['stats'] = [[stat.st_size, stat.st_mtime_ns] for stat in
+                                   (os.stat(os.path.join(output_dir, name)) for name in record['files'])]
+            except OSError:
+                del self.outputs[filename]
+            self.dirty = True
+        self.unstamped.clear()
+
+    def output_lastmods(self, filename: str) -> List[Optional[str]]:
+        """Newest lastmod of each file previously written for filename"""
+        record = self.outputs.get(filename, {})
+        return record.get('lastmods') or [None] * len(record.get('files', []))
+
+    # Git dates
+
+    def cached_git_dates(self, head: str) -> Optional[Dict[str, str]]:
+        """Page commit dates if they were computed at this HEAD commit"""
+        if self.git_dates.get('head') == head:
+            return self.git_dates['dates']
+        return None
+
+    def update_git_dates(self, head: str, dates: Dict[str, str]) -> None:
+        """Remember page commit dates computed at HEAD"""
+        self.git_dates = {'head': head, 'dates': dates}
+        self.dirty = True
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Page Index for DapsiGames Sitemaps
+Built once per generation run: every tool page record keyed by ID plus the
+tools.ts catalog entries, so sitemap writing, categorization and the
+tools.ts comparison all query the same in-memory data instead of
+rescanning the pages directory.
+"""
+
+import os
+from collections import Counter
+from typing import Dict, List, Optional, Set
+
+from sitemap_catalog import CatalogTool, parse_tools_catalog
+from sitemap_records import ToolRecord
+
+TOOLS_TS_PATH = "client/src/data/tools.ts"
+
+
+class ReadCounter:
+    """
+    Run-level file read counters, proving each input file is read exactly
+    once. Reads are also forwarded to profiler (a RunProfiler) if given.
+    """
+
+    def __init__(self, profiler=None):
+        self.reads: Counter = Counter()
+        self.bytes_read = 0
+        self.profiler = profiler
+
+    def record(self, path: str, bytes_read: int = 0) -> None:
+        """Count one read of path"""
+        self.reads[os.path.normpath(path)] += 1
+        self.bytes_read += bytes_read
+        if self.profiler is not None:
+            self.profiler.count('files_read')
+            self.profiler.count('bytes_read', bytes_read)
+
+    def duplicates(self) -> Dict[str, int]:
+        """Files read more than once, with their read counts"""
+        return {path: count for path, count in self.reads.items() if count > 1}
+
+    def print_summary(self) -> None:
+        print(f"File reads: {sum(self.reads.values())} reads of {len(self.reads)} files "
+              f"({self.bytes_read / 1024:.1f} KiB)")
+        duplicates = self.duplicates()
+        if duplicates:
+            print(f"Warning: {len(duplicates)} files were read more than once:")
+            for path, count in sorted(duplicates.items()):
+                print(f"  - {path} ({count} reads)")
+        elif self.reads:
+            print("✅ Every file was read exactly once")
+
+
+def read_tools_ts(path: str = TOOLS_TS_PATH, counter: Optional[ReadCounter] = None) -> Optional[Dict[str, CatalogTool]]:
+    """tools.ts entries keyed by tool ID (in file order), or None if the file is missing"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    if counter is not None:
+        counter.record(path, len(data))
+    content = data.decode('utf-8', errors='replace')
+    return {tool.id: tool for tool in parse_tools_catalog(content)}
+
+
+class PageIndex:
+    """
+    ID -> tool record map for this run's tools, and ID -> entry map for
+    tools.ts (None when there is no tools.ts). source says where the tool
+    records came from: 'pages' (page files on disk), 'catalog' (tools.ts)
+    or 'routes' (App.tsx routes joined with tools.ts).
+    """
+
+    def __init__(self, tools: List[ToolRecord], catalog: Optional[Dict[str, CatalogTool]] = None,
+                 source: str = 'pages'):
+        self.pages: Dict[str, ToolRecord] = {tool.id: tool for tool in tools}
+        self.catalog = catalog
+        self.source = source
+
+    def tools(self) -> List[ToolRecord]:
+        """Tool records in discovery order"""
+        return list(self.pages.values())
+
+    def page_ids(self) -> Set[str]:
+        return set(self.pages)
+
+    def catalog_ids(self) -> Set[str]:
+        return set(self.catalog or ())
+
+    def category(self, page_id: str) -> Optional[str]:
+        """Category already assigned to a page, or None if the page isn't indexed"""
+        record = self.pages.get(page_id)
+        return record.category if record else None
+
+    def missing_from_catalog(self) -> Set[str]:
+        """Page IDs that have no tools.ts entry"""
+        return self.page_ids() - self.catalog_ids()
+
+    def missing_pages(self) -> Set[str]:
+        """tools.ts IDs that have no page file"""
+        return self.catalog_ids() - self.page_ids()
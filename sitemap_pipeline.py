@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Streaming Pipeline API for DapsiGames Sitemaps
+URL entries and sinks for composing scan -> filter -> categorize -> write
+as a lazy pipeline in-process, e.g. from a build server:
+
+    generator = ComprehensiveSitemapGenerator(quiet=True)
+    tools = (tool for tool in generator.iter_tools() if tool.lastmod)
+    files = generator.write_entries(generator.iter_url_entries(tools))
+
+Entries flow one at a time from the iterators into a sink, so memory stays
+flat however many pages there are. Entries are written in arrival order.
+"""
+
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from sitemap_writer import ShardedSitemapWriter
+
+
+class UrlEntry(NamedTuple):
+    """One <url> of a category sitemap"""
+    category: str
+    loc: str
+    lastmod: Optional[str] = None
+    changefreq: Optional[str] = None
+    priority: Optional[str] = None
+
+
+class SitemapSink:
+    """
+    Receives UrlEntry objects one at a time. Used as a context manager it
+    closes on success and aborts if the pipeline raises.
+    """
+
+    def add(self, entry: UrlEntry) -> None:
+        raise NotImplementedError
+
+    def feed(self, entries: Iterable[UrlEntry]) -> None:
+        """Add every entry, aborting the sink if the iterator or a write fails"""
+        try:
+            for entry in entries:
+                self.add(entry)
+        except BaseException:
+            self.abort()
+            raise
+
+    def close(self) -> Dict[str, List[str]]:
+        """Finish writing; returns the files written per category"""
+        return {}
+
+    def abort(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class CategorySitemapSink(SitemapSink):
+    """
+    Routes each entry to its category's sharded sitemap writer, opened on
+    first use by open_writer(category).
+    """
+
+    def __init__(self, open_writer: Callable[[str], ShardedSitemapWriter]):
+        self.open_writer = open_writer
+        self.writers: Dict[str, ShardedSitemapWriter] = {}
+
+    def add(self, entry: UrlEntry) -> None:
+        writer = self.writers.get(entry.category)
+        if writer is None:
+            writer = self.writers[entry.category] = self.open_writer(entry.category)
+        writer.add_url(entry.loc, entry.lastmod, entry.changefreq, entry.priority)
+
+    def close(self) -> Dict[str, List[str]]:
+        return {category: writer.close() for category, writer in self.writers.items()}
+
+    def abort(self) -> None:
+        for writer in self.writers.values():
+            writer.abort()
+
+    @property
+    def lastmods(self) -> Dict[str, Optional[str]]:
+        """Newest lastmod of every shard written so far"""
+        return {filename: lastmod for writer in self.writers.values()
+                for filename, lastmod in zip(writer.filenames, writer.lastmods)}
+
+
+class CallbackSink(SitemapSink):
+    """Hands every entry to a callable, e.g. to queue or upload it"""
+
+    def __init__(self, callback: Callable[[UrlEntry], None]):
+        self.callback = callback
+        self.count = 0
+
+    def add(self, entry: UrlEntry) -> None:
+        self.callback(entry)
+        self.count += 1
+
+
+def drain(entries: Iterable[UrlEntry], sink: SitemapSink) -> Dict[str, List[str]]:
+    """Run a pipeline to completion; returns what sink.close() returns"""
+    sink.feed(entries)
+    return sink.close()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Run Instrumentation for DapsiGames Sitemaps
+Per-stage wall/CPU time and counters (bytes and files read/written, regex
+evaluations, URLs emitted), printed as a table or saved as JSON or a
+Chrome trace (chrome://tracing, Perfetto). Optional cProfile and
+tracemalloc wrappers for a whole run. Disabled, every hook is a no-op.
+"""
+
+import contextlib
+import cProfile
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator, List, Optional
+
+COUNTERS = ('files_read', 'bytes_read', 'files_written', 'bytes_written', 'regex_evals', 'urls')
+
+# Shared by every stage() call of a disabled profiler
+_NULL_STAGE = contextlib.nullcontext()
+
+
+class StageRecord:
+    """Timings and counters of one stage"""
+    __slots__ = ('name', 'depth', 'start', 'wall', 'cpu', 'counters')
+
+    def __init__(self, name: str, depth: int, start: float):
+        self.name = name
+        self.depth = depth
+        self.start = start
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.counters: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+
+    def to_dict(self) -> Dict:
+        return {'name': self.name, 'depth': self.depth, 'wall_seconds': self.wall,
+                'cpu_seconds': self.cpu, **self.counters}
+
+
+class RunProfiler:
+    """
+    Collects StageRecords for one run. Stages nest; counters go to the
+    innermost open stage (or to a top-level "other" stage outside any).
+    With enabled=False, stage() returns a shared null context and count()
+    returns immediately.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stages: List[StageRecord] = []
+        self._open: List[StageRecord] = []
+        self._other: Optional[StageRecord] = None
+        self._origin = time.perf_counter()
+
+    def stage(self, name: str):
+        """Context manager timing one stage"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._timed_stage(name)
+
+    @contextlib.contextmanager
+    def _timed_stage(self, name: str) -> Iterator[StageRecord]:
+        record = StageRecord(name, len(self._open), time.perf_counter() - self._origin)
+        self.stages.append(record)
+        self._open.append(record)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall = time.perf_counter() - wall_start
+            record.cpu = time.process_time() - cpu_start
+            self._open.pop()
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """Add amount to a counter of the current stage"""
+        if not self.enabled:
+            return
+        record = self._open[-1] if self._open else self._other_stage()
+        record.counters[counter] = record.counters.get(counter, 0) + amount
+
+    def _other_stage(self) -> StageRecord:
+        if self._other is None:
+            self._other = StageRecord('other', 0, time.perf_counter() - self._origin)
+            self.stages.append(self._other)
+        return self._other
+
+    def totals(self) -> Dict:
+        """Wall/CPU time of the top-level stages plus every counter summed over all stages"""
+        totals = {'wall_seconds': sum(stage.wall for stage in self.stages if stage.depth == 0),
+                  'cpu_seconds': sum(stage.cpu for stage in self.stages if stage.depth == 0)}
+        for counter in COUNTERS:
+            totals[counter] = sum(stage.counters.get(counter, 0) for stage in self.stages)
+        return totals
+
+    def print_summary(self) -> None:
+        """Table of every stage (nested stages indented) and a total row"""
+        if not self.enabled:
+            return
+        header = (f"{'stage':<24} {'wall ms':>9} {'cpu ms':>9} {'files in':>9} {'KiB in':>9} "
+                  f"{'files out':>9} {'KiB out':>9} {'regex':>9} {'urls':>9}")
+        print(f"\nRun profile:\n{header}\n{'-' * len(header)}")
+        rows = [(('  ' * stage.depth) + stage.name, stage.wall, stage.cpu, stage.counters)
+                for stage in self.stages]
+        totals = self.totals()
+        rows.append(('total', totals['wall_seconds'], totals['cpu_seconds'], totals))
+        for name, wall, cpu, counters in rows:
+            print(f"{name:<24} {wall * 1000:>9.1f} {cpu * 1000:>9.1f} {counters['files_read']:>9} "
+                  f"{counters['bytes_read'] / 1024:>9.1f} {counters['files_written']:>9} "
+                  f"{counters['bytes_written'] / 1024:>9.1f} {counters['regex_evals']:>9} {counters['urls']:>9}")
+
+    def write_json(self, path: str) -> None:
+        """Stage records and totals as JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'stages': [stage.to_dict() for stage in self.stages], 'totals': self.totals()}, f, indent=2)
+        print(f"Wrote run profile to {path}")
+
+    def write_chrome_trace(self, path: str) -> None:
+        """Stages as complete ("X") events in the Chrome trace event format"""
+        pid = os.getpid()
+        events = [{
+            'name': stage.name,
+            'ph': 'X',
+            'ts': stage.start * 1e6,
+            'dur': stage.wall * 1e6,
+            'pid': pid,
+            'tid': 0,
+            'args': {'cpu_ms': stage.cpu * 1000, **stage.counters},
+        } for stage in self.stages]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        print(f"Wrote Chrome trace to {path}")
+
+
+def run_with_profilers(func: Callable[[], None], cprofile_path: Optional[str] = None,
+                       trace_memory: bool = False, top: int = 15) -> None:
+    """
+    Call func, optionally under cProfile (stats saved to cprofile_path and
+    the top entries by cumulative time printed) and/or tracemalloc (peak
+    traced memory and the top allocation sites printed).
+    """
+    profile = cProfile.Profile() if cprofile_path else None
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        if profile is not None:
+            profile.runcall(func)
+        else:
+            func()
+    finally:
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"\nPeak traced memory: {peak / 1024 / 1024:.1f} MiB; top allocation sites:")
+            for stat in snapshot.statistics('lineno')[:top]:
+                print(f"  {stat}")
+        if profile is not None:
+            profile.dump_stats(cprofile_path)
+            print(f"\nWrote cProfile stats to {cprofile_path}; top functions by cumulative time:")
+            pstats.Stats(profile).sort_stats('cumulative').print_stats(top)
+
+
+def add_profiling_arguments(parser) -> None:
+    """Instrumentation flags shared by the generator and splitter command lines"""
+    group = parser.add_argument_group('profiling')
+    group.add_argument('--profile', action='store_true',
+                       help="Print per-stage wall/CPU time and read/write/regex/URL counters")
+    group.add_argument('--profile-json', metavar='PATH', help="Write the per-stage profile as JSON")
+    group.add_argument('--trace', metavar='PATH',
+                       help="Write stages as a Chrome trace (open in chrome://tracing or Perfetto)")
+    group.add_argument('--cprofile', metavar='PATH', help="Run under cProfile and save the stats to PATH")
+    group.add_argument('--tracemalloc', action='store_true', help="Trace allocations and report the peak")
+
+
+def profiler_from_args(args) -> RunProfiler:
+    """Enabled only if some flag asks for stage data"""
+    return RunProfiler(enabled=bool(args.profile or args.profile_json or args.trace))
+
+
+def run_profiled(func: Callable[[], None], profiler: RunProfiler, args) -> None:
+    """Run func under the profilers selected in args, then report the stage data"""
+    run_with_profilers(func, args.cprofile, args.tracemalloc)
+    if args.profile:
+        profiler.print_summary()
+    if args.profile_json:
+        profiler.write_json(args.profile_json)
+    if args.trace:
+        profiler.write_chrome_trace(args.trace)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Sitemap Publisher for DapsiGames
+Moves freshly rendered sitemap files into place: a file whose content is
+identical to what is already published is left untouched (same mtime, same
+ETag), anything else replaces the old file atomically with os.replace.
+"""
+
+import hashlib
+import os
+import re
+from typing import Iterable, List, Set
+
+TEMP_SUFFIX = '.tmp'
+
+
+def file_digest(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's content, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def same_content(path_a: str, path_b: str) -> bool:
+    """True if both files exist with identical content (sizes are compared first)"""
+    try:
+        if os.path.getsize(path_a) != os.path.getsize(path_b):
+            return False
+    except OSError:
+        return False
+    return file_digest(path_a) == file_digest(path_b)
+
+
+def sitemap_file_regex(basenames: Iterable[str]) -> re.Pattern:
+    """
+    Matches every file a sharded writer can produce for the given base
+    names: sitemap-x.xml, sitemap-x-2.xml, ... plain or gzipped.
+    """
+    stems = sorted(re.escape(name[:-len('.xml')] if name.endswith('.xml') else name) for name in basenames)
+    return re.compile(rf"^(?:{'|'.join(stems)})(?:-\d+)?\.xml(?:\.gz)?$")
+
+
+class SitemapPublisher:
+    """
+    Publish stage shared by one generation run. Rendered files arrive as
+    temp files next to their final path; publish() hashes them against the
+    current file and either discards the temp file or swaps it in.
+    remove_stale() then deletes sitemap files of this run's categories that
+    nothing was published to, such as shards left over from a bigger run.
+    """
+
+    def __init__(self, output_dir: str = ''):
+        self.output_dir = output_dir
+        self.written: List[str] = []
+        self.unchanged: List[str] = []
+        self.removed: List[str] = []
+        self.published: Set[str] = set()
+
+    def temp_path(self, path: str) -> str:
+        """Where to render a file before publishing it to path"""
+        return f"{path}{TEMP_SUFFIX}"
+
+    def publish(self, temp_path: str, path: str) -> bool:
+        """Move temp_path to path unless path already has the same content. Returns True if written."""
+        self.published.add(os.path.basename(path))
+        if same_content(temp_path, path):
+            os.remove(temp_path)
+            self.unchanged.append(path)
+            return False
+        os.replace(temp_path, path)
+        self.written.append(path)
+        return True
+
+    def keep(self, filenames: Iterable[str]) -> None:
+        """Count files left in place by an earlier skip (e.g. the manifest) as unchanged"""
+        for filename in filenames:
+            self.published.add(filename)
+            self.unchanged.append(os.path.join(self.output_dir, filename))
+
+    def remove_stale(self, basenames: Iterable[str], exclude: Iterable[str] = ()) -> List[str]:
+        """
+        Delete files in output_dir that belong to one of basenames (any shard,
+        plain or gzipped) but were not published in this run. Paths in
+        exclude (such as the input being split) are never removed.
+        """
+        excluded = {os.path.realpath(path) for path in exclude}
+        pattern = sitemap_file_regex(basenames)
+        try:
+            names = sorted(os.listdir(self.output_dir or '.'))
+        except FileNotFoundError:
+            return []
+
+        removed = []
+        for name in names:
+            path = os.path.join(self.output_dir, name)
+            if pattern.match(name) and name not in self.published and os.path.realpath(path) not in excluded:
+                os.remove(path)
+                removed.append(path)
+        self.removed.extend(removed)
+        return removed
+
+    def print_summary(self) -> None:
+        """One-line count of written, unchanged and removed files, plus each removed name"""
+        print(f"Published sitemaps: {len(self.written)} written, {len(self.unchanged)} unchanged, "
+              f"{len(self.removed)} removed")
+        for path in self.removed:
+            print(f"  removed stale {path}")
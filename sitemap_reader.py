@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Streaming Sitemap Reader for DapsiGames
+Yields <url> records from sitemap files with iterparse in constant memory.
+Accepts plain or gzipped input and expands sitemap index files recursively.
+"""
+
+import gzip
+import os
+import sys
+import xml.etree.ElementTree as ET
+from typing import BinaryIO, Callable, Iterator, NamedTuple, Optional, Set
+from urllib.parse import urlparse
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+class SitemapUrl(NamedTuple):
+    """One <url> record; fields missing from the source are None"""
+    loc: str
+    lastmod: Optional[str]
+    changefreq: Optional[str]
+    priority: Optional[str]
+
+
+def local_name(tag: str) -> str:
+    """Tag name without its {namespace} prefix"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def open_sitemap_file(path: str) -> BinaryIO:
+    """Open a sitemap for reading, transparently decompressing gzip input"""
+    with open(path, 'rb') as f:
+        magic = f.read(len(GZIP_MAGIC))
+    if magic == GZIP_MAGIC:
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def resolve_child_sitemap(index_path: str, loc: str) -> Optional[str]:
+    """
+    Local file for a <sitemap><loc> of an index. Child sitemaps are looked up
+    next to the index by file name (with or without .gz), never fetched.
+    """
+    name = os.path.basename(urlparse(loc).path)
+    if not name:
+        return None
+    directory = os.path.dirname(index_path)
+    for candidate in (name, f"{name}.gz", name[:-3] if name.endswith('.gz') else None):
+        if candidate:
+            path = os.path.join(directory, candidate)
+            if os.path.exists(path):
+                return path
+    return None
+
+
+def warn_stderr(message: str) -> None:
+    """Default warning sink of the reader, kept off stdout"""
+    print(message, file=sys.stderr)
+
+
+def iter_sitemap_urls(path: str, expand_index: bool = True, warn: Callable[[str], None] = warn_stderr,
+                      _seen: Optional[Set[str]] = None) -> Iterator[SitemapUrl]:
+    """
+    Stream <url> records out of a sitemap (or, recursively, every sitemap an
+    index points to). Each element is cleared as soon as it is consumed, so
+    memory stays flat regardless of input size. Skipped index entries are
+    reported through warn. Raises ET.ParseError on malformed XML.
+    """
+    seen = _seen if _seen is not None else set()
+    real_path = os.path.realpath(path)
+    if real_path in seen:
+        warn(f"Warning: Skipping {path}, already expanded (index cycle)")
+        return
+    seen.add(real_path)
+
+    with open_sitemap_file(path) as source:
+        root = None
+        for event, elem in ET.iterparse(source, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = elem
+                continue
+
+            tag = local_name(elem.tag)
+            if tag == 'url':
+                fields = {local_name(child.tag): child.text for child in elem}
+                loc = fields.get('loc')
+                if loc is not None:
+                    yield SitemapUrl(loc.strip(), fields.get('lastmod'),
+                                     fields.get('changefreq'), fields.get('priority'))
+                root.clear()
+            elif tag == 'sitemap' and local_name(root.tag) == 'sitemapindex':
+                loc = next((child.text for child in elem if local_name(child.tag) == 'loc'), None)
+                root.clear()
+                if not expand_index or not loc:
+                    continue
+                child_path = resolve_child_sitemap(path, loc.strip())
+                if child_path is None:
+                    warn(f"Warning: Index entry {loc.strip()} not found next to {path}, skipping")
+                    continue
+                yield from iter_sitemap_urls(child_path, expand_index, warn, seen)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Compact Records for DapsiGames Sitemaps
+ToolRecord replaces the per-tool dict: fixed __slots__ instead of a hash
+table per page, with the values that repeat across pages (dates,
+categories, priorities) interned so every page shares one string object.
+UrlBatch stores many URL entries column by column, coding each repeated
+value as a small integer, for bulk counting and filtering.
+"""
+
+import sys
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sitemap_pipeline import UrlEntry
+
+
+def intern_value(value: Optional[str]) -> Optional[str]:
+    """The shared copy of a repeated string value (None passes through)"""
+    return sys.intern(value) if value is not None else None
+
+
+class ToolRecord:
+    """One tool page: where it lives, how it is named and categorized, and its sitemap fields"""
+    __slots__ = ('id', 'name', 'category', 'href', 'url', 'page_file', 'lastmod', 'priority')
+
+    def __init__(self, id: str, name: Optional[str], category: Optional[str], href: str, url: str,
+                 page_file: Optional[str] = None, lastmod: Optional[str] = None, priority: str = '0.8'):
+        self.id = id
+        self.name = name
+        self.category = intern_value(category)
+        self.href = href
+        self.url = url
+        self.page_file = page_file
+        self.lastmod = intern_value(lastmod)
+        self.priority = intern_value(priority)
+
+    def set_category(self, category: str) -> None:
+        self.category = intern_value(category)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ToolRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"ToolRecord({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)})"
+
+
+class ValueTable:
+    """Codes 0, 1, 2, ... for the distinct values of one column, in first-seen order"""
+    __slots__ = ('values', 'codes')
+
+    def __init__(self):
+        self.values: List[Optional[str]] = []
+        self.codes: Dict[Optional[str], int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class UrlBatch:
+    """
+    URL entries stored as columns: a list of locs plus one array of value
+    codes per repeated field (category, lastmod, changefreq, priority), so
+    a URL costs its loc string and a few bytes of codes. Iterating yields
+    UrlEntry tuples again.
+    """
+    CODED_COLUMNS = ('category', 'lastmod', 'changefreq', 'priority')
+
+    def __init__(self, entries: Iterable[UrlEntry] = ()):
+        self.locs: List[str] = []
+        self.tables: Dict[str, ValueTable] = {column: ValueTable() for column in self.CODED_COLUMNS}
+        # A few distinct values per column, except dates: one per day of history.
+        # A 16-bit column is widened to 32 bits once it holds more than 65536 values.
+        self.codes: Dict[str, array] = {column: array('I' if column == 'lastmod' else 'H')
+                                        for column in self.CODED_COLUMNS}
+        self.extend(entries)
+
+    def append(self, entry: UrlEntry) -> None:
+        self.locs.append(entry.loc)
+        for column, value in zip(self.CODED_COLUMNS, (entry.category, entry.lastmod,
+                                                      entry.changefreq, entry.priority)):
+            code = self.tables[column].code(value)
+            codes = self.codes[column]
+            if code > 0xFFFF and codes.typecode == 'H':
+                codes = self.codes[column] = array('I', codes)
+            codes.append(code)
+
+    def extend(self, entries: Iterable[UrlEntry]) -> None:
+        for entry in entries:
+            self.append(entry)
+
+    def __len__(self) -> int:
+        return len(self.locs)
+
+    def entry(self, index: int) -> UrlEntry:
+        values = {column: self.tables[column].values[self.codes[column][index]]
+                  for column in self.CODED_COLUMNS}
+        return UrlEntry(loc=self.locs[index], **values)
+
+    def __iter__(self) -> Iterator[UrlEntry]:
+        columns = [[self.tables[column].values[code] for code in self.codes[column]]
+                   if len(self.tables[column]) > 1 else None
+                   for column in self.CODED_COLUMNS]
+        constants = [table.values[0] if table.values else None for table in self.tables.values()]
+        for index, loc in enumerate(self.locs):
+            category, lastmod, changefreq, priority = (
+                column[index] if column is not None else constant
+                for column, constant in zip(columns, constants))
+            yield UrlEntry(category, loc, lastmod, changefreq, priority)
+
+    def column(self, name: str) -> List[Optional[str]]:
+        """Decoded values of one column ('loc' or a coded column)"""
+        if name == 'loc':
+            return list(self.locs)
+        values = self.tables[name].values
+        return [values[code] for code in self.codes[name]]
+
+    def counts(self, name: str = 'category') -> Dict[Optional[str], int]:
+        """URL count per value of a coded column, counted on the codes"""
+        values = self.tables[name].values
+        return {values[code]: count for code, count in Counter(self.codes[name]).items()}
+
+    def select(self, name: str, value: Optional[str]) -> Iterator[UrlEntry]:
+        """Entries whose coded column equals value, filtered on the codes"""
+        code = self.tables[name].codes.get(value)
+        if code is None:
+            return
+        for index, entry_code in enumerate(self.codes[name]):
+            if entry_code == code:
+                yield self.entry(index)
+
+    def newest(self, name: str = 'lastmod') -> Optional[str]:
+        """Largest value of a coded column (the newest date for lastmod)"""
+        return max((value for value in self.tables[name].values if value is not None), default=None)
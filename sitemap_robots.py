@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+robots.txt Filtering for DapsiGames Sitemaps
+Parses robots.txt once, picks the group for one user agent and compiles its
+Allow/Disallow rules into a single regex, so checking a URL is one match
+call. Rules follow RFC 9309: '*' matches any run of characters, a trailing
+'$' anchors the end, and the longest matching pattern wins, with Allow
+winning a tie. URLs the chosen agent may not crawl are dropped before they
+reach a sitemap.
+"""
+
+import os
+import re
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, TypeVar
+from urllib.parse import urlsplit
+
+DEFAULT_ROBOTS_PATH = "client/public/robots.txt"
+DEFAULT_USER_AGENT = '*'
+
+# Lines that belong to no user-agent group
+_NON_GROUP_FIELDS = {'sitemap', 'host'}
+
+T = TypeVar('T')
+
+
+class RobotsRule(NamedTuple):
+    """One Allow or Disallow line"""
+    allow: bool
+    pattern: str
+
+    def __str__(self) -> str:
+        return f"{'Allow' if self.allow else 'Disallow'}: {self.pattern}"
+
+
+def parse_robots(content: str) -> Dict[str, List[RobotsRule]]:
+    """
+    Rules per user-agent (lowercased). Consecutive User-agent lines share
+    the rules that follow them; groups naming the same agent are merged.
+    An empty Disallow allows everything and adds no rule.
+    """
+    groups: Dict[str, List[RobotsRule]] = {}
+    agents: List[str] = []
+    in_rules = False
+    for line in content.splitlines():
+        line = line.split('#', 1)[0].strip()
+        field, colon, value = line.partition(':')
+        if not colon:
+            continue
+        field, value = field.strip().lower(), value.strip()
+        if field == 'user-agent':
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(value.lower())
+            groups.setdefault(value.lower(), [])
+        elif field in _NON_GROUP_FIELDS:
+            continue
+        else:
+            in_rules = True
+            if field in ('allow', 'disallow') and value:
+                for agent in agents:
+                    groups[agent].append(RobotsRule(field == 'allow', value))
+    return groups
+
+
+def select_rules(groups: Dict[str, List[RobotsRule]], user_agent: str = DEFAULT_USER_AGENT) -> List[RobotsRule]:
+    """Rules of the group naming user_agent, else of the * group"""
+    rules = groups.get(user_agent.lower())
+    if rules is None:
+        rules = groups.get('*', [])
+    return rules
+
+
+def pattern_regex(pattern: str) -> str:
+    """Regex source matching a robots.txt path pattern from the start of a path"""
+    anchored = pattern.endswith('$')
+    if anchored:
+        pattern = pattern[:-1]
+    source = '.*'.join(re.escape(part) for part in pattern.split('*'))
+    return source + r'\Z' if anchored else source
+
+
+def url_path(url: str) -> str:
+    """Path and query of a URL, the part robots.txt rules are matched against"""
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    return f"{path}?{parts.query}" if parts.query else path
+
+
+class RobotsMatcher:
+    """
+    Rules compiled into one alternation ordered by precedence (longest
+    pattern first, Allow before Disallow at equal length). A regex match
+    takes the first alternative that matches, which is therefore the rule
+    that decides the path.
+    """
+
+    def __init__(self, rules: Iterable[RobotsRule]):
+        self.rules = sorted(set(rules), key=lambda rule: (-len(rule.pattern), not rule.allow, rule.pattern))
+        self.regex = None
+        self.groups: Dict[str, RobotsRule] = {}
+        if self.rules:
+            self.groups = {f'r{number}': rule for number, rule in enumerate(self.rules)}
+            self.regex = re.compile('|'.join(f'(?P<{name}>{pattern_regex(rule.pattern)})'
+                                             for name, rule in self.groups.items()), re.DOTALL)
+
+    def match(self, path: str) -> Optional[RobotsRule]:
+        """The rule deciding path, or None if no rule matches"""
+        if self.regex is None:
+            return None
+        match = self.regex.match(path)
+        return self.groups[match.lastgroup] if match else None
+
+    def allowed(self, path: str) -> bool:
+        rule = self.match(path)
+        return rule is None or rule.allow
+
+
+class RobotsFilter:
+    """Drops URLs one user agent may not crawl, counting them per deciding rule"""
+
+    def __init__(self, matcher: RobotsMatcher, user_agent: str = DEFAULT_USER_AGENT, source: str = 'robots.txt'):
+        self.matcher = matcher
+        self.user_agent = user_agent
+        self.source = source
+        self.checked = 0
+        self.excluded: Counter = Counter()
+
+    @classmethod
+    def from_text(cls, content: str, user_agent: str = DEFAULT_USER_AGENT,
+                  source: str = 'robots.txt') -> 'RobotsFilter':
+        return cls(RobotsMatcher(select_rules(parse_robots(content), user_agent)), user_agent, source)
+
+    def allowed(self, url: str) -> bool:
+        self.checked += 1
+        rule = self.matcher.match(url_path(url))
+        if rule is None or rule.allow:
+            return True
+        self.excluded[rule] += 1
+        return False
+
+    def filter(self, items: Iterable[T], url_of: Optional[Callable[[T], str]] = None) -> Iterator[T]:
+        """Items whose URL (the item itself, or url_of(item)) is allowed, lazily"""
+        allowed = self.allowed
+        if url_of is None:
+            return (item for item in items if allowed(item))
+        return (item for item in items if allowed(url_of(item)))
+
+    def reset(self) -> None:
+        self.checked = 0
+        self.excluded = Counter()
+
+    def summary(self) -> str:
+        line = (f"{self.source} ({self.user_agent}): {sum(self.excluded.values())} of {self.checked} "
+                f"URLs excluded")
+        for rule, count in self.excluded.most_common():
+            line += f"\n  {rule} x{count}"
+        return line
+
+
+def load_robots_filter(path: str = DEFAULT_ROBOTS_PATH,
+                       user_agent: str = DEFAULT_USER_AGENT) -> Optional[RobotsFilter]:
+    """Filter for robots.txt at path, or None if there is no such file"""
+    if not os.path.isfile(path):
+        return None
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return RobotsFilter.from_text(f.read(), user_agent, path)
+
+
+def add_robots_arguments(parser) -> None:
+    """robots.txt flags shared by the generator and splitter command lines"""
+    group = parser.add_argument_group('robots.txt')
+    group.add_argument('--robots', default=DEFAULT_ROBOTS_PATH, metavar='PATH',
+                       help=f"Drop URLs this robots.txt disallows (default: {DEFAULT_ROBOTS_PATH}, "
+                            f"skipped if missing)")
+    group.add_argument('--robots-agent', default=DEFAULT_USER_AGENT, metavar='NAME',
+                       help=f"User agent whose rules apply (default: {DEFAULT_USER_AGENT})")
+    group.add_argument('--no-robots', action='store_true', help="Keep URLs robots.txt disallows")
+
+
+def robots_filter_from_args(args) -> Optional[RobotsFilter]:
+    """The filter the flags ask for, or None"""
+    if args.no_robots:
+        return None
+    robots_filter = load_robots_filter(args.robots, args.robots_agent)
+    if robots_filter is None and args.robots != DEFAULT_ROBOTS_PATH:
+        print(f"Warning: {args.robots} not found, URLs are not checked against robots.txt")
+    return robots_filter
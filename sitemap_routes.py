@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Route Table Discovery for DapsiGames Sitemaps
+Parses the wouter <Route path=... component={...} /> table in
+client/src/App.tsx once. Static routes become main sitemap URLs, and
+parameterized routes such as /games/:toolId are expanded by hash-joining
+them against the tools.ts catalog hrefs, so every URL the router serves
+is enumerated from just those two files.
+"""
+
+import os
+import re
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from sitemap_catalog import CatalogTool
+
+APP_TSX_PATH = "client/src/App.tsx"
+
+_BLOCK_COMMENT_REGEX = re.compile(r'/\*.*?\*/', re.DOTALL)
+_ROUTE_REGEX = re.compile(r'<Route\b((?:[^>"\'{}]|"[^"]*"|\'[^\']*\'|\{[^}]*\})*?)/?>')
+_PATH_ATTR_REGEX = re.compile(r'\bpath\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|\{\s*["\'`]([^"\'`]*)["\'`]\s*\})')
+_COMPONENT_ATTR_REGEX = re.compile(r'\bcomponent\s*=\s*\{\s*([A-Za-z_$][\w$]*)\s*\}')
+# import Home from "@/pages/home";  const AllGames = lazy(() => import("@/pages/all-games"));
+_IMPORT_REGEX = re.compile(
+    r'\bimport\s+([A-Za-z_$][\w$]*)\s+from\s+["\']([^"\']+)["\']'
+    r'|\b([A-Za-z_$][\w$]*)\s*=\s*lazy\(\s*\(\s*\)\s*=>\s*import\(\s*["\']([^"\']+)["\']\s*\)')
+
+
+class Route(NamedTuple):
+    """One <Route> with a path, in declaration order"""
+    path: str
+    component: Optional[str] = None
+    page_file: Optional[str] = None  # source file of the component, when it resolves to one
+
+    @property
+    def segments(self) -> Tuple[str, ...]:
+        return path_segments(self.path)
+
+    @property
+    def is_static(self) -> bool:
+        return not any(segment.startswith(':') or '*' in segment for segment in self.segments)
+
+
+def path_segments(path: str) -> Tuple[str, ...]:
+    return tuple(segment for segment in path.split('/') if segment)
+
+
+def is_optional(segment: str) -> bool:
+    """Whether a route segment is an optional parameter (:name?)"""
+    return segment.startswith(':') and segment.endswith('?')
+
+
+def resolve_module(specifier: str, app_dir: str) -> Optional[str]:
+    """Source file of an import specifier ('@/' is the src directory, App.tsx's own)"""
+    if specifier.startswith('@/'):
+        base = os.path.join(app_dir, specifier[2:])
+    elif specifier.startswith('.'):
+        base = os.path.normpath(os.path.join(app_dir, specifier))
+    else:
+        return None
+    for suffix in ('.tsx', '.ts', '.jsx', '.js'):
+        if os.path.isfile(base + suffix):
+            return base + suffix
+    return None
+
+
+def parse_routes(content: str, app_dir: str = '') -> List[Route]:
+    """Every <Route> with a path attribute, with its component's source file if imported from one"""
+    content = _BLOCK_COMMENT_REGEX.sub('', content)
+    modules = {}
+    for match in _IMPORT_REGEX.finditer(content):
+        name, specifier = (match.group(1), match.group(2)) if match.group(1) else (match.group(3), match.group(4))
+        modules[name] = specifier
+
+    routes = []
+    for match in _ROUTE_REGEX.finditer(content):
+        attributes = match.group(1)
+        path_match = _PATH_ATTR_REGEX.search(attributes)
+        if not path_match:
+            continue  # the catch-all (not found) route
+        path = next(group for group in path_match.groups() if group is not None)
+        component_match = _COMPONENT_ATTR_REGEX.search(attributes)
+        component = component_match.group(1) if component_match else None
+        page_file = None
+        if component in modules:
+            page_file = resolve_module(modules[component], app_dir)
+        routes.append(Route(path, component, page_file))
+    return routes
+
+
+class RouteTable:
+    """
+    Routes of App.tsx plus a hash index for matching hrefs against them:
+    each route is filed under (segment count, static segments before its
+    first parameter), so matching an href probes at most one key per
+    segment instead of trying every route. A route ending in optional
+    parameters (/games/:toolId?) is filed under each count it can match.
+    """
+
+    def __init__(self, routes: List[Route]):
+        self.routes = routes
+        self._index: Dict[Tuple[int, Tuple[str, ...]], List[Tuple[int, Route]]] = {}
+        for order, route in enumerate(routes):
+            segments = route.segments
+            prefix = []
+            for segment in segments:
+                if segment.startswith(':') or '*' in segment:
+                    break
+                prefix.append(segment)
+            optional = 0
+            while optional < len(segments) and is_optional(segments[-1 - optional]):
+                optional += 1
+            for length in range(len(segments) - optional, len(segments) + 1):
+                self._index.setdefault((length, tuple(prefix)), []).append((order, route))
+
+    def static_routes(self) -> List[Route]:
+        return [route for route in self.routes if route.is_static]
+
+    def parameterized_routes(self) -> List[Route]:
+        return [route for route in self.routes if not route.is_static]
+
+    def match(self, href: str) -> Optional[Tuple[Route, Dict[str, str]]]:
+        """First route (in declaration order) serving href, with its parameter values"""
+        segments = path_segments(urlsplit(href).path)
+        best = None
+        for length in range(len(segments) + 1):
+            for order, route in self._index.get((len(segments), segments[:length]), ()):
+                if best is not None and best[0] < order:
+                    continue
+                params = {}
+                # zip stops at the href's end, leaving trailing optional parameters unset
+                for pattern, segment in zip(route.segments, segments):
+                    if pattern.startswith(':'):
+                        params[pattern[1:].rstrip('?')] = segment
+                    elif pattern != segment:
+                        break
+                else:
+                    best = (order, route, params)
+        return (best[1], best[2]) if best else None
+
+    def join(self, catalog: Dict[str, CatalogTool]) -> Iterator[Tuple[Optional[Route], CatalogTool]]:
+        """
+        Catalog entries (in catalog order) with the parameterized route serving
+        each href, or None when no route serves it. Entries whose href hits a
+        static route are left to the static routes.
+        """
+        for entry in catalog.values():
+            matched = self.match(entry.href)
+            if matched is None:
+                yield None, entry
+            elif not matched[0].is_static:
+                yield matched[0], entry
+
+    def __iter__(self) -> Iterator[Route]:
+        return iter(self.routes)
+
+    def __len__(self) -> int:
+        return len(self.routes)
+
+
+def read_route_table(path: str = APP_TSX_PATH, counter=None) -> Optional[RouteTable]:
+    """Route table of App.tsx, or None if the file is missing"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    if counter is not None:
+        counter.record(path, len(data))
+    return RouteTable(parse_routes(data.decode('utf-8', errors='replace'), os.path.dirname(path)))
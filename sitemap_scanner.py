@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Page Scanner for DapsiGames Sitemaps
+Reads page files and extracts their titles, serially or across a worker pool.
+"""
+
+import mmap
+import os
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sitemap_manifest import hash_bytes
+
+EXECUTOR_TYPES = ('thread', 'process')
+
+
+class PageScan(NamedTuple):
+    """Result of reading one page file"""
+    path: str
+    content_hash: Optional[str]
+    title: Optional[str]
+    error: Optional[str]
+    bytes_read: int = 0
+
+
+def extract_title(content: str, title_patterns: Sequence[str]) -> Optional[str]:
+    """First title found by trying each pattern in order, or None"""
+    for pattern in title_patterns:
+        match = re.search(pattern, content, re.IGNORECASE)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+_combined_title_regexes: Dict[Tuple[str, ...], Optional[re.Pattern]] = {}
+
+
+def combined_title_regex(title_patterns: Tuple[str, ...]) -> Optional[re.Pattern]:
+    """
+    All title patterns as one bytes regex, so a single scan finds whichever
+    pattern occurs first in the file. None if a pattern doesn't have exactly
+    one capturing group (the combined form relies on that).
+    """
+    if title_patterns not in _combined_title_regexes:
+        regex = None
+        if all(re.compile(pattern).groups == 1 for pattern in title_patterns):
+            combined = '|'.join(f'(?:{pattern})' for pattern in title_patterns)
+            regex = re.compile(combined.encode('utf-8'), re.IGNORECASE)
+        _combined_title_regexes[title_patterns] = regex
+    return _combined_title_regexes[title_patterns]
+
+
+def scan_page_file(page_path: str, title_patterns: Tuple[str, ...], title_window: int = 0) -> PageScan:
+    """
+    Read one page, hash it and extract its title (module level so process
+    pools can pickle it). With title_window > 0 the page is memory-mapped and
+    only its leading title_window bytes are searched, stopping at the first
+    match of any title pattern; no content hash is computed in that mode.
+    """
+    if title_window > 0:
+        scan = scan_page_window(page_path, title_patterns, title_window)
+        if scan is not None:
+            return scan
+
+    try:
+        with open(page_path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        return PageScan(page_path, None, None, str(e))
+
+    title = extract_title(data.decode('utf-8', errors='replace'), title_patterns)
+    return PageScan(page_path, hash_bytes(data), title, None, len(data))
+
+
+def scan_page_window(page_path: str, title_patterns: Tuple[str, ...], title_window: int) -> Optional[PageScan]:
+    """
+    Bounded title scan over the first title_window bytes of a page. Returns
+    None when the window holds no complete title, so the caller falls back to
+    reading the whole file.
+    """
+    regex = combined_title_regex(title_patterns)
+    if regex is None:
+        return None
+
+    try:
+        with open(page_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return PageScan(page_path, None, None, None, 0)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                end = min(size, title_window)
+                match = regex.search(mapped, 0, end)
+                # A match running into the window edge may be cut short
+                if match is None or (match.end() == end and end < size):
+                    return None
+                raw_title = next(group for group in match.groups() if group is not None)
+    except (OSError, ValueError) as e:
+        return PageScan(page_path, None, None, str(e))
+
+    title = raw_title.decode('utf-8', errors='replace').strip()
+    return PageScan(page_path, None, title, None, match.end())
+
+
+def resolve_jobs(jobs: int) -> int:
+    """Worker count, where 0 means one per CPU"""
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def create_executor(kind: str, jobs: int) -> Executor:
+    """Thread pool for I/O-bound scans, process pool for regex-heavy extraction"""
+    if kind == 'process':
+        return ProcessPoolExecutor(max_workers=jobs)
+    if kind == 'thread':
+        return ThreadPoolExecutor(max_workers=jobs)
+    raise ValueError(f"Unknown executor type {kind!r}, expected one of {', '.join(EXECUTOR_TYPES)}")
+
+
+def scan_page_files(page_paths: Sequence[str], title_patterns: Sequence[str],
+                    jobs: int = 1, executor: str = 'thread',
+                    title_window: int = 0) -> Tuple[List[PageScan], float]:
+    """
+    Scan pages and return (results in input order, wall seconds). With jobs > 1
+    the pages are spread across a thread or process pool; executor.map keeps
+    the output order identical to a serial scan.
+    """
+    patterns = tuple(title_patterns)
+    start = time.perf_counter()
+
+    if jobs == 1 or len(page_paths) < 2:
+        results = [scan_page_file(path, patterns, title_window) for path in page_paths]
+    else:
+        chunksize = 1
+        if executor == 'process':
+            # Amortize pickling overhead across several pages per task
+            chunksize = max(1, len(page_paths) // (jobs * 8))
+        with create_executor(executor, jobs) as pool:
+            results = list(pool.map(scan_page_file, page_paths,
+                                    [patterns] * len(page_paths), [title_window] * len(page_paths),
+                                    chunksize=chunksize))
+
+    return results, time.perf_counter() - start
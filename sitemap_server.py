@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Sitemap HTTP Server for DapsiGames
+Answers /sitemap.xml and /sitemap-<category>[-N].xml[.gz] from memory:
+each published file is read once into an LRU of rendered shards keyed by
+content hash, with the gzip body of a plain file compressed once up front.
+Only files the generator published are served; a .gz URL needs the .gz
+file and a plain URL the plain one. Responses carry the hash as a strong
+ETag, so a crawler re-checking an unchanged sitemap gets a bodiless 304.
+When the generator republishes files (watch mode), only those names are
+invalidated; every other shard keeps serving from memory.
+"""
+
+import gzip
+import os
+import re
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+from sitemap_manifest import hash_bytes
+from sitemap_watch import watch_and_regenerate
+from sitemap_writer import GZIP_LEVEL
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+DEFAULT_CACHE_MB = 64
+XML_CONTENT_TYPE = 'application/xml; charset=utf-8'
+
+_SITEMAP_PATH_REGEX = re.compile(r'^/(sitemap(?:-[A-Za-z0-9_-]+)?\.xml)(\.gz)?$')
+
+
+class RenderedShard(NamedTuple):
+    """
+    One published file as served: its bytes, their content hash and, for a
+    plain .xml file, a gzip body for Content-Encoding (None for a .gz file)
+    """
+    digest: str
+    body: bytes
+    gzip_body: Optional[bytes]
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzip_body or b'')
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """
+    Whether an Accept-Encoding header allows gzip (q=0 refuses it). An
+    explicit gzip or x-gzip coding anywhere in the header takes precedence
+    over *, so "*;q=0, gzip" accepts gzip and "gzip;q=0, *" refuses it.
+    """
+    if not accept_encoding:
+        return False
+    explicit: Optional[float] = None
+    wildcard: Optional[float] = None
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if coding not in ('gzip', 'x-gzip', '*'):
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding == '*':
+            wildcard = quality if wildcard is None else max(wildcard, quality)
+        else:
+            explicit = quality if explicit is None else max(explicit, quality)
+    quality = explicit if explicit is not None else wildcard
+    return quality is not None and quality > 0
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against etag, as RFC 9110 asks for GET and HEAD"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*' or (tag[2:] if tag.startswith('W/') else tag) == etag:
+            return True
+    return False
+
+
+class ShardCache:
+    """
+    LRU of rendered shards, keyed by the SHA-256 of their content, plus a
+    filename -> hash map. Files are read on first request. invalidate()
+    drops names only: a file that comes back with the same content finds
+    its shard still cached. Eviction keeps the bodies within max_bytes.
+    """
+
+    def __init__(self, output_dir: str, max_bytes: int = DEFAULT_CACHE_MB * 1024 * 1024):
+        self.output_dir = output_dir
+        self.max_bytes = max_bytes
+        self.digests: Dict[str, str] = {}
+        self.shards: 'OrderedDict[str, RenderedShard]' = OrderedDict()
+        self.cached_bytes = 0
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        # Bumped by invalidate(), so a load racing with a republish is not remembered under its name
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def get(self, filename: str) -> Optional[RenderedShard]:
+        """Shard of filename (as published, .xml or .xml.gz), loading it from disk if needed; None if there is no such file"""
+        with self.lock:
+            digest = self.digests.get(filename)
+            if digest is not None and digest in self.shards:
+                self.shards.move_to_end(digest)
+                self.hits += 1
+                return self.shards[digest]
+            version = self.version
+
+        shard = self.load(filename)
+        if shard is None:
+            return None
+        with self.lock:
+            self.loads += 1
+            if self.version == version:
+                self.digests[filename] = shard.digest
+            if shard.digest in self.shards:
+                self.shards.move_to_end(shard.digest)
+                return self.shards[shard.digest]
+            self.shards[shard.digest] = shard
+            self.cached_bytes += shard.size
+            # Never evict the shard just added, however large
+            while self.cached_bytes > self.max_bytes and len(self.shards) > 1:
+                _, evicted = self.shards.popitem(last=False)
+                self.cached_bytes -= evicted.size
+                self.evictions += 1
+        return shard
+
+    def load(self, filename: str) -> Optional[RenderedShard]:
+        """Read filename exactly as published; a plain file also gets its gzip body"""
+        try:
+            with open(os.path.join(self.output_dir, filename), 'rb') as f:
+                body = f.read()
+        except FileNotFoundError:
+            return None
+        gzip_body = None
+        if not filename.endswith('.gz'):
+            gzip_body = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+        return RenderedShard(hash_bytes(body), body, gzip_body)
+
+    def invalidate(self, filenames: Iterable[str]) -> None:
+        """Forget which content filenames (plain or .gz, any directory) hold"""
+        with self.lock:
+            self.version += 1
+            for filename in filenames:
+                self.digests.pop(os.path.basename(filename), None)
+
+    def summary(self) -> str:
+        return (f"Shard cache: {self.hits} hits, {self.loads} loads, {self.evictions} evictions, "
+                f"{len(self.shards)} shards ({self.cached_bytes / 1024:.1f} KiB) cached")
+
+
+class SitemapRequestHandler(BaseHTTPRequestHandler):
+    """GET and HEAD of sitemap files from the server's ShardCache"""
+    server_version = 'DapsiGamesSitemap/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        self.send_sitemap(include_body=True)
+
+    def do_HEAD(self) -> None:
+        self.send_sitemap(include_body=False)
+
+    def send_sitemap(self, include_body: bool) -> None:
+        match = _SITEMAP_PATH_REGEX.match(urlsplit(self.path).path)
+        shard = self.server.cache.get(match.group(1) + (match.group(2) or '')) if match else None
+        if shard is None:
+            self.send_error(404, "No such sitemap")
+            return
+
+        if match.group(2):
+            # The published .xml.gz file itself, not a content encoding
+            body, etag, content_type, encoding = shard.body, f'"{shard.digest}"', 'application/gzip', None
+        elif accepts_gzip(self.headers.get('Accept-Encoding')):
+            body, etag, content_type, encoding = shard.gzip_body, f'"{shard.digest}-gz"', XML_CONTENT_TYPE, 'gzip'
+        else:
+            body, etag, content_type, encoding = shard.body, f'"{shard.digest}"', XML_CONTENT_TYPE, None
+
+        if etag_matches(self.headers.get('If-None-Match'), etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class SitemapServer(ThreadingHTTPServer):
+    """Threaded HTTP server over a ShardCache of output_dir"""
+    daemon_threads = True
+
+    def __init__(self, output_dir: str, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 cache_bytes: int = DEFAULT_CACHE_MB * 1024 * 1024, quiet: bool = False):
+        self.cache = ShardCache(output_dir, cache_bytes)
+        self.quiet = quiet
+        super().__init__((host, port), SitemapRequestHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def published_files(publisher) -> List[str]:
+    """Files a SitemapPublisher changed on disk: written and removed ones"""
+    return publisher.written + publisher.removed
+
+
+def serve_sitemaps(generator, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                   cache_mb: float = DEFAULT_CACHE_MB, watch: bool = False, debounce: float = 0.3,
+                   poll_interval: float = 1.0, force_polling: bool = False) -> None:
+    """
+    Generate the sitemaps, then serve them until interrupted with Ctrl+C.
+    With watch, edits are applied as they happen and only the files each
+    update republished are dropped from the cache.
+    """
+    server = SitemapServer(generator.output_dir, host, port, int(cache_mb * 1024 * 1024))
+    try:
+        if watch:
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            print(f"Serving sitemaps at {server.url}/sitemap.xml")
+            try:
+                watch_and_regenerate(generator, debounce, poll_interval, force_polling,
+                                     on_update=lambda: server.cache.invalidate(published_files(generator.publisher)))
+            finally:
+                server.shutdown()
+        else:
+            generator.generate_sitemaps()
+            print(f"Serving sitemaps at {server.url}/sitemap.xml (Ctrl+C to stop)")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                print("\nStopped serving")
+    finally:
+        server.server_close()
+        print(server.cache.summary())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+External Sort for DapsiGames Sitemaps
+Sorts more records than fit in memory: records are buffered up to a byte
+budget, each full buffer is sorted and spilled to a temp file as a run,
+and reading k-way merges the runs with heapq.merge. Records are tuples of
+JSON-serializable values; a key that ends in a unique sequence number
+makes the order total, so the result is the same however the runs split.
+"""
+
+import heapq
+import json
+import os
+import shutil
+import sys
+import tempfile
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+# Runs merged at once; more are first merged down in groups of this size
+MAX_OPEN_RUNS = 64
+
+
+def estimate_size(record: Tuple) -> int:
+    """Approximate heap bytes of a record tuple and its values"""
+    return sys.getsizeof(record) + sum(sys.getsizeof(value) for value in record)
+
+
+def read_run(path: str) -> Iterator[Tuple]:
+    """Records of one spilled run, in the order they were written"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield tuple(json.loads(line))
+
+
+class SortedPartition:
+    """
+    Sized, re-iterable view of one partition's records in sorted order,
+    optionally passed through project on the way out
+    """
+
+    def __init__(self, sorter: 'ExternalSorter', partition: Hashable,
+                 project: Optional[Callable[[Tuple], Any]] = None):
+        self.sorter = sorter
+        self.partition = partition
+        self.project = project
+
+    def __len__(self) -> int:
+        return self.sorter.counts[self.partition]
+
+    def __iter__(self) -> Iterator:
+        records = self.sorter.sorted(self.partition)
+        return map(self.project, records) if self.project else records
+
+    def map(self, func: Callable[[Any], Any]) -> 'SortedPartition':
+        """The same view with func applied to every item"""
+        project = self.project
+        return SortedPartition(self.sorter, self.partition,
+                               (lambda record: func(project(record))) if project else func)
+
+
+class ExternalSorter:
+    """
+    Sorts records by key within partitions (e.g. one per sitemap category)
+    using at most about budget_bytes of memory for buffered records. While
+    everything fits, nothing touches the disk. Spilled runs live in a
+    temp directory removed by close().
+    """
+
+    def __init__(self, key: Callable[[Tuple], Any], budget_bytes: int,
+                 partition: Optional[Callable[[Tuple], Hashable]] = None,
+                 temp_dir: Optional[str] = None, max_open_runs: int = MAX_OPEN_RUNS,
+                 size_of: Callable[[Tuple], int] = estimate_size):
+        self.key = key
+        self.budget_bytes = budget_bytes
+        self.partition = partition
+        self.temp_root = temp_dir
+        self.max_open_runs = max(2, max_open_runs)
+        self.size_of = size_of
+        self.buffer: Dict[Hashable, List[Tuple]] = {}
+        self.buffer_bytes = 0
+        self.runs: Dict[Hashable, List[str]] = {}
+        self.counts: Counter = Counter()
+        self.spills = 0
+        self.spilled_bytes = 0
+        self._temp_dir: Optional[str] = None
+        self._run_number = 0
+
+    def add(self, record: Tuple) -> None:
+        partition = self.partition(record) if self.partition else None
+        self.buffer.setdefault(partition, []).append(record)
+        self.counts[partition] += 1
+        self.buffer_bytes += self.size_of(record)
+        if self.buffer_bytes > self.budget_bytes:
+            self.spill()
+
+    def _new_run_path(self) -> str:
+        if self._temp_dir is None:
+            self._temp_dir = tempfile.mkdtemp(prefix='sitemap-sort-', dir=self.temp_root)
+        self._run_number += 1
+        return os.path.join(self._temp_dir, f'run-{self._run_number}.jsonl')
+
+    def _write_run(self, records) -> str:
+        path = self._new_run_path()
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+                f.write('\n')
+        self.spilled_bytes += os.path.getsize(path)
+        return path
+
+    def spill(self) -> None:
+        """Sort the buffered records and write each partition's share out as a run"""
+        for partition, records in self.buffer.items():
+            records.sort(key=self.key)
+            self.runs.setdefault(partition, []).append(self._write_run(records))
+        self.buffer = {}
+        self.buffer_bytes = 0
+        self.spills += 1
+
+    def _compact(self, partition: Hashable) -> None:
+        """
+        Merge runs in groups until one final merge can hold them all open.
+        The oldest runs are merged first and their result takes their place
+        at the front, so records with equal keys keep their arrival order.
+        """
+        runs = self.runs[partition]
+        while len(runs) >= self.max_open_runs:
+            group, runs = runs[:self.max_open_runs], runs[self.max_open_runs:]
+            merged = self._write_run(heapq.merge(*(read_run(path) for path in group), key=self.key))
+            for path in group:
+                os.remove(path)
+            runs.insert(0, merged)
+        self.runs[partition] = runs
+
+    def partitions(self) -> List[Hashable]:
+        """Partitions in the order their first record arrived"""
+        return list(self.counts)
+
+    def sorted(self, partition: Hashable = None) -> Iterator[Tuple]:
+        """Every record of partition in key order; may be iterated repeatedly"""
+        records = self.buffer.get(partition, [])
+        # Already-sorted buffers cost a single comparison pass
+        records.sort(key=self.key)
+        if partition not in self.runs:
+            return iter(records)
+        self._compact(partition)
+        return heapq.merge(*(read_run(path) for path in self.runs[partition]), records, key=self.key)
+
+    def view(self, partition: Hashable = None,
+             project: Optional[Callable[[Tuple], Any]] = None) -> SortedPartition:
+        return SortedPartition(self, partition, project)
+
+    def close(self) -> None:
+        """Drop the buffer and delete spilled runs"""
+        self.buffer = {}
+        self.runs = {}
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -9,16 +9,40 @@ category-based sitemaps with a sitemap index file.
 
 import xml.etree.ElementTree as ET
 from datetime import datetime
-import re
 import os
-import sys
+import argparse
+from operator import itemgetter
 from urllib.parse import urlparse
-from typing import Dict, List, Tuple, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Set
+
+from sitemap_categorizer import CompiledCategorizer
+from sitemap_dedup import DEDUP_MODES, UrlDeduplicator
+from sitemap_pipeline import CategorySitemapSink, UrlEntry
+from sitemap_profiling import RunProfiler, add_profiling_arguments, profiler_from_args, run_profiled
+from sitemap_publish import SitemapPublisher
+from sitemap_records import UrlBatch
+from sitemap_robots import RobotsFilter, add_robots_arguments, robots_filter_from_args
+from sitemap_reader import iter_sitemap_urls
+from sitemap_writer import (
+    MAX_SITEMAP_BYTES, MAX_URLS_PER_SITEMAP, ShardedSitemapWriter, SitemapIndexWriter
+)
 
 class SitemapSplitter:
-    def __init__(self, input_file: str = "sitemap.xml", base_url: str = "https://dapsigames.com"):
+    def __init__(self, input_file: str = "sitemap.xml", base_url: str = "https://dapsigames.com",
+                 max_urls_per_sitemap: int = MAX_URLS_PER_SITEMAP, max_sitemap_bytes: int = MAX_SITEMAP_BYTES,
+                 compress: bool = False, profiler: Optional[RunProfiler] = None, quiet: bool = False,
+                 deduplicator: Optional[UrlDeduplicator] = None, robots_filter: Optional[RobotsFilter] = None):
         self.input_file = input_file
+        self.quiet = quiet  # no progress output when embedded
         self.base_url = base_url
+        self.max_urls_per_sitemap = max_urls_per_sitemap
+        self.max_sitemap_bytes = max_sitemap_bytes
+        self.compress = compress  # write sitemap-<category>.xml.gz
+        self.publisher = SitemapPublisher()
+        self.profiler = profiler or RunProfiler()
+        # Optional normalization-plus-dedup stage ahead of categorization
+        self.deduplicator = deduplicator
+        self.robots_filter = robots_filter  # drops URLs robots.txt blocks
         self.current_date = datetime.now().strftime("%Y-%m-%d")
         
         # Define category patterns and their corresponding sitemap files
@@ -137,6 +161,33 @@ class SitemapSplitter:
                 ]
             }
         }
+        
+        # Specific categories are checked first and anything else falls back to
+        # main, so the main patterns never change the outcome and are left out.
+        self.categorizer = CompiledCategorizer(
+            {name: data['patterns'] for name, data in self.categories.items() if name != 'main'},
+            default='main'
+        )
+
+    def log(self, *args) -> None:
+        """Progress output, unless quiet"""
+        if not self.quiet:
+            print(*args)
+
+    def iter_existing_sitemap(self) -> Iterator[Tuple[str, str, str, str]]:
+        """
+        Stream (url, lastmod, changefreq, priority) tuples out of the input
+        sitemap without loading it. Gzipped input and sitemap index files
+        (expanded recursively) are supported. Raises ET.ParseError on bad XML.
+        A missing <lastmod> stays missing rather than claiming today's date.
+        """
+        for url in iter_sitemap_urls(self.input_file, warn=self.log):
+            yield (
+                url.loc,
+                url.lastmod,
+                url.changefreq if url.changefreq is not None else "weekly",
+                url.priority if url.priority is not None else "0.8"
+            )
 
     def parse_existing_sitemap(self) -> List[Tuple[str, str, str, str]]:
         """
@@ -144,38 +195,16 @@ class SitemapSplitter:
         Returns list of tuples: (url, lastmod, changefreq, priority)
         """
         if not os.path.exists(self.input_file):
-            print(f"Warning: {self.input_file} not found. Creating example URLs based on app structure.")
+            self.log(f"Warning: {self.input_file} not found. Creating example URLs based on app structure.")
             return self.create_example_urls()
         
         try:
-            tree = ET.parse(self.input_file)
-            root = tree.getroot()
-            
-            # Handle namespace
-            namespace = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-            if root.tag.startswith('{'):
-                namespace['ns'] = root.tag.split('}')[0][1:]
-            
-            urls = []
-            for url_elem in root.findall('.//ns:url', namespace):
-                loc = url_elem.find('ns:loc', namespace)
-                lastmod = url_elem.find('ns:lastmod', namespace)
-                changefreq = url_elem.find('ns:changefreq', namespace)
-                priority = url_elem.find('ns:priority', namespace)
-                
-                if loc is not None:
-                    urls.append((
-                        loc.text,
-                        lastmod.text if lastmod is not None else self.current_date,
-                        changefreq.text if changefreq is not None else "weekly",
-                        priority.text if priority is not None else "0.8"
-                    ))
-            
-            print(f"Parsed {len(urls)} URLs from {self.input_file}")
+            urls = list(self.iter_existing_sitemap())
+            self.log(f"Parsed {len(urls)} URLs from {self.input_file}")
             return urls
             
         except ET.ParseError as e:
-            print(f"Error parsing {self.input_file}: {e}")
+            self.log(f"Error parsing {self.input_file}: {e}")
             return self.create_example_urls()
 
     def create_example_urls(self) -> List[Tuple[str, str, str, str]]:
@@ -212,7 +241,7 @@ class SitemapSplitter:
             
         ]
         
-        print(f"Created {len(example_urls)} example URLs for demonstration")
+        self.log(f"Created {len(example_urls)} example URLs for demonstration")
         return example_urls
 
     def categorize_url(self, url: str) -> str:
@@ -225,112 +254,147 @@ class SitemapSplitter:
             # Fallback to simple replacement if URL parsing fails
             path = url.replace(self.base_url, '').lower()
         
-        # Check each category (skip main, check it last)
-        for category_name, category_data in self.categories.items():
-            if category_name == 'main':
-                continue
-                
-            for pattern in category_data['patterns']:
-                if re.search(pattern, path, re.IGNORECASE):
-                    return category_name
-        
-        # If no specific category matches, check main patterns
-        for pattern in self.categories['main']['patterns']:
-            if re.search(pattern, path, re.IGNORECASE):
-                return 'main'
-        
-        # Default to main if no pattern matches
-        return 'main'
+        # Check each specific category in order, defaulting to main
+        return self.categorizer.categorize(path)
 
-    def create_sitemap_xml(self, urls: List[Tuple[str, str, str, str]], filename: str) -> None:
-        """Create a sitemap XML file with given URLs"""
-        urlset = ET.Element('urlset')
-        urlset.set('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
-        
-        for url, lastmod, changefreq, priority in urls:
-            url_elem = ET.SubElement(urlset, 'url')
-            
-            loc_elem = ET.SubElement(url_elem, 'loc')
-            loc_elem.text = url
-            
-            lastmod_elem = ET.SubElement(url_elem, 'lastmod')
-            lastmod_elem.text = lastmod
-            
-            changefreq_elem = ET.SubElement(url_elem, 'changefreq')
-            changefreq_elem.text = changefreq
-            
-            priority_elem = ET.SubElement(url_elem, 'priority')
-            priority_elem.text = priority
-        
-        # Create ElementTree and write to file
-        tree = ET.ElementTree(urlset)
-        ET.indent(tree, space="  ", level=0)
-        
-        with open(filename, 'wb') as f:
-            tree.write(f, encoding='utf-8', xml_declaration=True)
+    def create_sitemap_xml(self, urls: List[Tuple[str, str, str, str]], filename: str) -> List[str]:
+        """Create a sitemap XML file with given URLs, returns the shard filenames written"""
+        writer = ShardedSitemapWriter('', filename,
+                                      max_urls=self.max_urls_per_sitemap,
+                                      max_bytes=self.max_sitemap_bytes)
+        with writer:
+            for url, lastmod, changefreq, priority in urls:
+                writer.add_url(url, lastmod, changefreq, priority)
         
-        print(f"Created {filename} with {len(urls)} URLs")
+        if len(writer.filenames) == 1:
+            self.log(f"Created {filename} with {len(urls)} URLs")
+        else:
+            self.log(f"Created {filename} with {len(urls)} URLs split across {len(writer.filenames)} shards")
+        return writer.filenames
 
-    def create_sitemap_index(self, created_categories: Set[str], index_filename: str = 'sitemap.xml') -> None:
-        """Create the main sitemap index file for categories that actually have content"""
-        sitemapindex = ET.Element('sitemapindex')
-        sitemapindex.set('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
-        
+    def create_sitemap_index(self, created_categories: Set[str], index_filename: str = 'sitemap.xml',
+                             sitemap_files: Optional[Dict[str, List[str]]] = None,
+                             sitemap_lastmods: Optional[Dict[str, Optional[str]]] = None) -> None:
+        """
+        Create the main sitemap index file for categories that actually have content.
+        sitemap_files maps each category to the shard filenames written for it,
+        sitemap_lastmods each shard to the newest lastmod of its URLs.
+        """
+        sitemap_files = sitemap_files or {}
+        sitemap_lastmods = sitemap_lastmods or {}
         created_count = 0
-        for category_name, category_data in self.categories.items():
-            if category_name in created_categories:
-                sitemap_elem = ET.SubElement(sitemapindex, 'sitemap')
-                
-                loc_elem = ET.SubElement(sitemap_elem, 'loc')
-                loc_elem.text = f"{self.base_url}/{category_data['file']}"
-                
-                lastmod_elem = ET.SubElement(sitemap_elem, 'lastmod')
-                lastmod_elem.text = self.current_date
-                
-                created_count += 1
-        
-        # Create ElementTree and write to file
-        tree = ET.ElementTree(sitemapindex)
-        ET.indent(tree, space="  ", level=0)
-        
-        with open(index_filename, 'wb') as f:
-            tree.write(f, encoding='utf-8', xml_declaration=True)
+        temp_path = self.publisher.temp_path(index_filename)
+        with SitemapIndexWriter(temp_path) as writer:
+            for category_name, category_data in self.categories.items():
+                if category_name in created_categories:
+                    for filename in sitemap_files.get(category_name, [category_data['file']]):
+                        lastmod = sitemap_lastmods.get(filename) or self.current_date
+                        writer.add_sitemap(f"{self.base_url}/{filename}", lastmod)
+                        created_count += 1
+        self.publisher.publish(temp_path, index_filename)
+        self.profiler.count('files_written')
+        self.profiler.count('bytes_written', writer.bytes_written)
         
-        print(f"Created {index_filename} index file referencing {created_count} category sitemaps")
+        self.log(f"Created {index_filename} index file referencing {created_count} category sitemaps")
 
-    def split_sitemap(self) -> None:
-        """Main method to split the sitemap"""
-        print("Starting sitemap splitting process...")
-        print(f"Base URL: {self.base_url}")
-        print(f"Current date: {self.current_date}")
-        
-        # Parse existing sitemap
-        all_urls = self.parse_existing_sitemap()
+    def open_category_writer(self, category: str) -> ShardedSitemapWriter:
+        """Sharded writer for one category's sitemap, published atomically on close"""
+        return ShardedSitemapWriter('', self.categories[category]['file'],
+                                    max_urls=self.max_urls_per_sitemap,
+                                    max_bytes=self.max_sitemap_bytes,
+                                    compress=self.compress,
+                                    publisher=self.publisher)
+
+    def iter_url_entries(self, urls: Iterable[Tuple[str, str, str, str]]) -> Iterator[UrlEntry]:
+        """Categorize (url, lastmod, changefreq, priority) tuples lazily, one at a time"""
+        for url, lastmod, changefreq, priority in urls:
+            yield UrlEntry(self.categorize_url(url), url, lastmod, changefreq, priority)
+
+    def read_batch(self) -> UrlBatch:
+        """The input sitemap's categorized URLs as one columnar batch, for bulk operations"""
+        return UrlBatch(self.iter_url_entries(self.iter_existing_sitemap()))
+
+    def open_category_sink(self) -> CategorySitemapSink:
+        """Sink writing each category's entries to its sitemap file and shards"""
+        return CategorySitemapSink(self.open_category_writer)
+
+    def route_urls(self, urls: Iterable[Tuple[str, str, str, str]]) -> Dict[str, ShardedSitemapWriter]:
+        """
+        Categorize each URL as it arrives and append it to its category's
+        streaming writer. Writers are opened on first use; on error they are
+        all aborted so no half-written sitemap replaces an existing one.
+        """
+        if self.deduplicator is not None:
+            urls = self.deduplicator.process(urls)
+        if self.robots_filter is not None:
+            urls = self.robots_filter.filter(urls, itemgetter(0))
+        sink = self.open_category_sink()
+        sink.feed(self.iter_url_entries(urls))
+        return sink.writers
+
+    def route_input(self) -> Dict[str, ShardedSitemapWriter]:
+        """Route the input sitemap's URLs (or the example URLs if it is missing or malformed) to writers"""
+        if os.path.exists(self.input_file):
+            try:
+                writers = self.route_urls(self.iter_existing_sitemap())
+                self.profiler.count('files_read')
+                self.profiler.count('bytes_read', os.path.getsize(self.input_file))
+                self.log(f"Parsed {sum(w.count for w in writers.values())} URLs from {self.input_file}")
+                return writers
+            except ET.ParseError as e:
+                self.log(f"Error parsing {self.input_file}: {e}")
+        else:
+            self.log(f"Warning: {self.input_file} not found. Creating example URLs based on app structure.")
+        return self.route_urls(self.create_example_urls())
+
+    def split_sitemap(self) -> Dict[str, List[str]]:
+        """Main method to split the sitemap; returns the shard filenames per category"""
+        self.log("Starting sitemap splitting process...")
+        self.log(f"Base URL: {self.base_url}")
+        self.log(f"Current date: {self.current_date}")
+        self.publisher = SitemapPublisher()
+        if self.robots_filter is not None:
+            self.robots_filter.reset()
         
-        if not all_urls:
-            print("No URLs found to process!")
-            return
+        # Stream the existing sitemap straight into per-category writers
+        with self.profiler.stage('route'):
+            evaluations = self.categorizer.evaluations
+            writers = self.route_input()
+            self.profiler.count('regex_evals', self.categorizer.evaluations - evaluations)
+            self.profiler.count('urls', sum(writer.count for writer in writers.values()))
         
-        # Categorize URLs
-        categorized_urls = {category: [] for category in self.categories.keys()}
+        if self.deduplicator is not None:
+            self.log(self.deduplicator.summary())
+        if self.robots_filter is not None:
+            self.log(self.robots_filter.summary())
         
-        for url_data in all_urls:
-            url = url_data[0]
-            category = self.categorize_url(url)
-            categorized_urls[category].append(url_data)
+        if not writers:
+            self.log("No URLs found to process!")
+            return {}
         
         # Report categorization results
-        print("\nCategorization Summary:")
-        for category, urls in categorized_urls.items():
-            print(f"  {category}: {len(urls)} URLs")
+        self.log("\nCategorization Summary:")
+        for category in self.categories:
+            self.log(f"  {category}: {writers[category].count if category in writers else 0} URLs")
         
-        # Create category sitemaps and track which ones were created
+        # Finish category sitemaps and track which ones were created
         created_categories = set()
-        for category, urls in categorized_urls.items():
-            if urls:  # Only create sitemap if there are URLs
-                filename = self.categories[category]['file']
-                self.create_sitemap_xml(urls, filename)
-                created_categories.add(category)
+        sitemap_files = {}
+        sitemap_lastmods = {}
+        with self.profiler.stage('finish'):
+            for category in self.categories:
+                if category in writers:  # Only categories that received URLs
+                    writer = writers[category]
+                    sitemap_files[category] = writer.close()
+                    sitemap_lastmods.update(zip(writer.filenames, writer.lastmods))
+                    created_categories.add(category)
+                    self.profiler.count('files_written', len(writer.filenames))
+                    self.profiler.count('bytes_written', writer.bytes_written)
+                    filename = writer.filename
+                    if len(writer.filenames) == 1:
+                        self.log(f"Created {filename} with {writer.count} URLs")
+                    else:
+                        self.log(f"Created {filename} with {writer.count} URLs split across {len(writer.filenames)} shards")
         
         # Determine index filename to prevent overwriting source
         index_filename = 'sitemap.xml'
@@ -339,40 +403,66 @@ class SitemapSplitter:
             if os.path.exists('sitemap.xml'):
                 backup_name = f'sitemap_backup_{self.current_date.replace("-", "")}.xml'
                 os.rename('sitemap.xml', backup_name)
-                print(f"Backed up original sitemap to {backup_name}")
+                self.log(f"Backed up original sitemap to {backup_name}")
         
         # Create sitemap index only for categories that have content
-        self.create_sitemap_index(created_categories, index_filename)
+        with self.profiler.stage('index'):
+            self.create_sitemap_index(created_categories, index_filename, sitemap_files, sitemap_lastmods)
+        
+        # Drop shards and category files this run no longer produces
+        with self.profiler.stage('cleanup'):
+            self.publisher.remove_stale([data['file'] for data in self.categories.values()],
+                                        exclude=[self.input_file])
+        if not self.quiet:
+            self.publisher.print_summary()
         
-        print("\n✅ Sitemap splitting completed successfully!")
-        print("\nGenerated files:")
+        self.log("\n✅ Sitemap splitting completed successfully!")
+        self.log("\nGenerated files:")
         for category in created_categories:
-            print(f"  - {self.categories[category]['file']}")
-        print(f"  - {index_filename} (index file)")
+            for filename in sitemap_files[category]:
+                self.log(f"  - {filename}")
+        self.log(f"  - {index_filename} (index file)")
         
         if len(created_categories) < len(self.categories):
             empty_categories = set(self.categories.keys()) - created_categories
-            print(f"\nNote: Skipped empty categories: {', '.join(empty_categories)}")
+            self.log(f"\nNote: Skipped empty categories: {', '.join(empty_categories)}")
+        return sitemap_files
 
 def main():
     """Main function to run the sitemap splitter"""
     print("DapsiGames Sitemap Splitter")
     print("=" * 50)
     
-    # You can customize these parameters
-    input_sitemap = "sitemap.xml"  # Change this to your existing sitemap file
-    base_url = "https://dapsigames.com"  # Change this to your domain
-    
-    # Check if custom input file is provided
-    if len(sys.argv) > 1:
-        input_sitemap = sys.argv[1]
-    
-    if len(sys.argv) > 2:
-        base_url = sys.argv[2]
+    parser = argparse.ArgumentParser(description="Split an existing sitemap into category sitemaps")
+    parser.add_argument('input_sitemap', nargs='?', default="sitemap.xml",
+                        help="Existing sitemap (or index, plain or gzipped) to split (default: sitemap.xml)")
+    parser.add_argument('base_url', nargs='?', default="https://dapsigames.com",
+                        help="Site base URL (default: https://dapsigames.com)")
+    parser.add_argument('--gzip', action='store_true',
+                        help="Write sitemap-<category>.xml.gz files (the index stays plain)")
+    parser.add_argument('--dedup', choices=DEDUP_MODES,
+                        help="Canonicalize URLs and drop duplicates: exact keeps every URL in memory and the "
+                             "newest lastmod, bloom bounds memory at a small false-positive rate (default: off)")
+    parser.add_argument('--bloom-capacity', type=int, default=1_000_000,
+                        help="Expected unique URLs for --dedup bloom (default: 1000000)")
+    parser.add_argument('--bloom-error', type=float, default=0.001,
+                        help="False-positive rate for --dedup bloom (default: 0.001)")
+    parser.add_argument('--dedup-lowercase-paths', action='store_true',
+                        help="Also treat paths differing only in case as one URL (only for case-insensitive "
+                             "servers; default: paths are case-sensitive)")
+    add_robots_arguments(parser)
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
     
     # Create and run the splitter
-    splitter = SitemapSplitter(input_sitemap, base_url)
-    splitter.split_sitemap()
+    profiler = profiler_from_args(args)
+    deduplicator = None
+    if args.dedup:
+        deduplicator = UrlDeduplicator(args.dedup, capacity=args.bloom_capacity, error_rate=args.bloom_error,
+                                       lowercase_path=args.dedup_lowercase_paths)
+    splitter = SitemapSplitter(args.input_sitemap, args.base_url, compress=args.gzip, profiler=profiler,
+                               deduplicator=deduplicator, robots_filter=robots_filter_from_args(args))
+    run_profiled(splitter.split_sitemap, profiler, args)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
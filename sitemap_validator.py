@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Sitemap Validator for DapsiGames
+Checks the generated output in client/public: every sitemap file is
+streamed through expat in constant memory, shards are validated in
+parallel across a process pool, and the index is cross-checked against
+the shards on disk. Problems are counted per file with a few examples each,
+and the run exits non-zero when there are errors, optionally writing the
+whole report as JSON.
+
+Errors: unparsable XML, wrong root element, more URLs or bytes than the
+sitemap protocol allows, missing or non-http(s) <loc>, a <loc> on another
+host than base_url, the same URL twice, malformed lastmod, changefreq or
+priority, and index entries whose file is missing.
+Warnings: sitemap files the index doesn't list, empty sitemaps, and index
+lastmods older than the newest URL of their shard.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from xml.parsers import expat
+from array import array
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from sitemap_reader import open_sitemap_file, resolve_child_sitemap
+from sitemap_scanner import create_executor, resolve_jobs
+from sitemap_writer import MAX_SITEMAP_BYTES, MAX_URLS_PER_SITEMAP, SITEMAP_NS
+
+DEFAULT_OUTPUT_DIR = "client/public"
+INDEX_FILENAME = "sitemap.xml"
+MAX_LOC_LENGTH = 2048
+CHANGEFREQS = {'always', 'hourly', 'daily', 'weekly', 'monthly', 'yearly', 'never'}
+
+# Element names as expat reports them with namespace_separator='}'
+_URL_NAME = f'{SITEMAP_NS}}}url'
+_SITEMAP_NAME = f'{SITEMAP_NS}}}sitemap'
+_URLSET_NAME = f'{SITEMAP_NS}}}urlset'
+_SITEMAPINDEX_NAME = f'{SITEMAP_NS}}}sitemapindex'
+_FIELD_NAMES = {f'{SITEMAP_NS}}}{name}': name for name in ('loc', 'lastmod', 'changefreq', 'priority')}
+
+# W3C Datetime, as the sitemap protocol requires: YYYY, YYYY-MM, YYYY-MM-DD or a full timestamp
+_LASTMOD_REGEX = re.compile(
+    r'^(\d{4})(?:-(\d{2})(?:-(\d{2})'
+    r'(?:T([01]\d|2[0-3]):[0-5]\d(?::[0-5]\d(?:\.\d+)?)?(?:Z|[+-](?:[01]\d|2[0-3]):[0-5]\d))?)?)?$')
+_PRIORITY_REGEX = re.compile(r'^(?:0(?:\.\d+)?|1(?:\.0+)?|\.\d+)$')
+_SITEMAP_FILE_REGEX = re.compile(r'^sitemap(?:-[A-Za-z0-9_-]+)?\.xml(?:\.gz)?$')
+
+
+def valid_lastmod(value: str) -> bool:
+    """Whether value is a W3C datetime naming a real calendar date"""
+    match = _LASTMOD_REGEX.match(value)
+    if not match:
+        return False
+    year, month, day = match.group(1, 2, 3)
+    try:
+        date(int(year), int(month or 1), int(day or 1))
+    except ValueError:
+        return False
+    return True
+
+
+def loc_hash(loc: str) -> int:
+    """64-bit hash of a URL, stable across processes (unlike hash())"""
+    return int.from_bytes(hashlib.blake2b(loc.encode('utf-8', errors='surrogatepass'),
+                                          digest_size=8).digest(), 'little')
+
+
+class FileReport:
+    """Counts and the first few examples of every issue found in one file"""
+
+    def __init__(self, path: str, max_examples: int = 5):
+        self.path = path
+        self.max_examples = max_examples
+        self.kind: Optional[str] = None  # 'urlset' or 'sitemapindex'
+        self.entries = 0
+        self.bytes = 0
+        self.newest_lastmod: Optional[str] = None
+        self.errors: Dict[str, Dict] = {}
+        self.warnings: Dict[str, Dict] = {}
+
+    def _add(self, issues: Dict[str, Dict], code: str, example: Optional[str]) -> None:
+        issue = issues.get(code)
+        if issue is None:
+            issue = issues[code] = {'count': 0, 'examples': []}
+        issue['count'] += 1
+        if example is not None and len(issue['examples']) < self.max_examples:
+            issue['examples'].append(example)
+
+    def error(self, code: str, example: Optional[str] = None) -> None:
+        self._add(self.errors, code, example)
+
+    def warning(self, code: str, example: Optional[str] = None) -> None:
+        self._add(self.warnings, code, example)
+
+    @property
+    def error_count(self) -> int:
+        return sum(issue['count'] for issue in self.errors.values())
+
+    @property
+    def warning_count(self) -> int:
+        return sum(issue['count'] for issue in self.warnings.values())
+
+    def to_dict(self) -> Dict:
+        return {'file': self.path, 'kind': self.kind, 'entries': self.entries, 'bytes': self.bytes,
+                'newest_lastmod': self.newest_lastmod, 'errors': self.errors, 'warnings': self.warnings}
+
+
+class CountingReader:
+    """File wrapper counting the (uncompressed) bytes the parser reads"""
+
+    def __init__(self, source):
+        self.source = source
+        self.bytes = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.source.read(size)
+        self.bytes += len(data)
+        return data
+
+
+class EntryChecker:
+    """
+    Per-entry checks shared by shards and the index. Each distinct lastmod
+    is validated once, since a sitemap holds only a handful of dates.
+    """
+
+    def __init__(self, report: FileReport, base_url: str):
+        self.report = report
+        self.base_url = base_url.rstrip('/')
+        base = urlsplit(self.base_url)
+        self.base_origin = (base.scheme.lower(), base.netloc.lower())
+        self.lastmods: Dict[str, bool] = {}
+
+    def check_loc(self, loc: Optional[str]) -> bool:
+        report = self.report
+        if not loc:
+            report.error('missing-loc')
+            return False
+        if len(loc) > MAX_LOC_LENGTH:
+            report.error('invalid-loc', loc[:100] + '...')
+            return False
+        base_url = self.base_url
+        if loc.startswith(base_url) and (len(loc) == len(base_url) or loc[len(base_url)] in '/?#'):
+            return True
+        parts = urlsplit(loc)
+        if parts.scheme.lower() not in ('http', 'https') or not parts.netloc:
+            report.error('invalid-loc', loc)
+            return False
+        if (parts.scheme.lower(), parts.netloc.lower()) != self.base_origin:
+            report.error('host-mismatch', loc)
+        return True
+
+    def check_lastmod(self, lastmod: Optional[str], loc: Optional[str]) -> None:
+        if lastmod is None:
+            return
+        valid = self.lastmods.get(lastmod)
+        if valid is None:
+            valid = self.lastmods[lastmod] = valid_lastmod(lastmod)
+        if not valid:
+            self.report.error('invalid-lastmod', f"{loc}: {lastmod}")
+        elif self.report.newest_lastmod is None or lastmod > self.report.newest_lastmod:
+            self.report.newest_lastmod = lastmod
+
+
+class UrlsetParser:
+    """
+    expat callbacks checking every <url> (or index <sitemap>) as soon as its
+    end tag arrives. Only the current entry's fields are held, so memory is
+    constant; expat's C-level callbacks cost about half of what iterparse
+    spends building and clearing an Element per tag.
+    """
+
+    def __init__(self, report: FileReport, base_url: str,
+                 index_entries: Optional[List[Tuple[str, Optional[str]]]] = None):
+        self.report = report
+        self.checker = EntryChecker(report, base_url)
+        # Filled with (loc, lastmod) of each index <sitemap>, if given
+        self.index_entries = index_entries
+        self.hashes = array('Q')
+        self.seen: Set[int] = set()
+        self.depth = 0
+        self.fields: Dict[str, str] = {}
+        self.field: Optional[str] = None
+        self.text: List[str] = []
+        self.parser = expat.ParserCreate(namespace_separator='}')
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self.start
+        self.parser.EndElementHandler = self.end
+        self.parser.CharacterDataHandler = self.data
+
+    def parse(self, source) -> None:
+        self.parser.ParseFile(source)
+
+    def start(self, name: str, attributes) -> None:
+        self.depth += 1
+        if self.depth == 3:
+            self.field = _FIELD_NAMES.get(name)
+            self.text = []
+        elif self.depth == 2:
+            self.fields = {}
+        elif self.depth == 1:
+            self.report.kind = name.rsplit('}', 1)[-1]
+            if name not in (_URLSET_NAME, _SITEMAPINDEX_NAME):
+                raise WrongRootError(name)
+
+    def data(self, text: str) -> None:
+        if self.field is not None:
+            self.text.append(text)
+
+    def end(self, name: str) -> None:
+        self.depth -= 1
+        if self.depth == 2:
+            if self.field is not None:
+                self.fields[self.field] = ''.join(self.text).strip()
+                self.field = None
+        elif self.depth == 1 and (name == _URL_NAME or name == _SITEMAP_NAME):
+            self.check_entry(self.fields)
+            if name == _SITEMAP_NAME and self.index_entries is not None:
+                self.index_entries.append((self.fields.get('loc') or '', self.fields.get('lastmod')))
+
+    def check_entry(self, fields: Dict[str, str]) -> None:
+        report = self.report
+        report.entries += 1
+        loc = fields.get('loc')
+        if self.checker.check_loc(loc):
+            digest = loc_hash(loc)
+            if digest in self.seen:
+                report.error('duplicate-loc', loc)
+            else:
+                self.seen.add(digest)
+                self.hashes.append(digest)
+        self.checker.check_lastmod(fields.get('lastmod'), loc)
+        changefreq = fields.get('changefreq')
+        if changefreq is not None and changefreq not in CHANGEFREQS:
+            report.error('invalid-changefreq', f"{loc}: {changefreq}")
+        priority = fields.get('priority')
+        if priority is not None and not _PRIORITY_REGEX.match(priority):
+            report.error('invalid-priority', f"{loc}: {priority}")
+
+
+class WrongRootError(Exception):
+    """Raised from the start handler to stop parsing a file that isn't a sitemap"""
+
+
+def validate_urlset(path: str, base_url: str, max_urls: int = MAX_URLS_PER_SITEMAP,
+                    max_bytes: int = MAX_SITEMAP_BYTES, max_examples: int = 5,
+                    index_entries: Optional[List[Tuple[str, Optional[str]]]] = None) -> Tuple[FileReport, bytes]:
+    """
+    Check one sitemap (or sitemap index) file. Returns the report and the
+    64-bit hashes of its <loc>s, packed as array('Q') bytes, for checking
+    duplicates across files. Runs in a worker process. For an index, the
+    (loc, lastmod) of each <sitemap> go to index_entries in the same pass.
+    """
+    report = FileReport(path, max_examples)
+    handler = UrlsetParser(report, base_url, index_entries)
+    try:
+        with open_sitemap_file(path) as source:
+            reader = CountingReader(source)
+            handler.parse(reader)
+            report.bytes = reader.bytes
+    except WrongRootError as e:
+        report.error('wrong-root', str(e))
+        return report, b''
+    except (expat.ExpatError, OSError, EOFError) as e:
+        report.error('parse-error', str(e))
+        return report, handler.hashes.tobytes()
+
+    if report.entries > max_urls:
+        report.error('too-many-urls', f"{report.entries} entries, limit {max_urls}")
+    if report.bytes > max_bytes:
+        report.error('too-large', f"{report.bytes} bytes uncompressed, limit {max_bytes}")
+    if report.entries == 0 and not report.errors:
+        report.warning('empty-sitemap')
+    return report, handler.hashes.tobytes()
+
+
+class SitemapValidator:
+    """Validates an output directory: its index, the shards it lists, and sitemap files it doesn't"""
+
+    def __init__(self, output_dir: str = DEFAULT_OUTPUT_DIR, base_url: str = "https://dapsigames.com",
+                 index_filename: str = INDEX_FILENAME, jobs: int = 0,
+                 max_urls: int = MAX_URLS_PER_SITEMAP, max_bytes: int = MAX_SITEMAP_BYTES,
+                 max_examples: int = 5, quiet: bool = False):
+        self.output_dir = output_dir
+        self.base_url = base_url.rstrip('/')
+        self.index_path = os.path.join(output_dir, index_filename)
+        self.jobs = resolve_jobs(jobs)
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.max_examples = max_examples
+        self.quiet = quiet  # no progress output, e.g. when the JSON report goes to stdout
+
+    def log(self, message: str = "") -> None:
+        if not self.quiet:
+            print(message)
+
+    def sitemap_files_on_disk(self) -> List[str]:
+        try:
+            names = sorted(os.listdir(self.output_dir or '.'))
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.output_dir, name) for name in names
+                if _SITEMAP_FILE_REGEX.match(name) and os.path.join(self.output_dir, name) != self.index_path]
+
+    def validate_files(self, paths: List[str]) -> List[Tuple[FileReport, bytes]]:
+        """Validate files on a process pool (in this process for one job or one file), in the given order"""
+        args = (self.base_url, self.max_urls, self.max_bytes, self.max_examples)
+        if self.jobs == 1 or len(paths) <= 1:
+            return [validate_urlset(path, *args) for path in paths]
+        with create_executor('process', min(self.jobs, len(paths))) as executor:
+            futures = [executor.submit(validate_urlset, path, *args) for path in paths]
+            return [future.result() for future in futures]
+
+    def validate(self) -> Dict:
+        """Run every check; returns the report as a JSON-ready dict"""
+        start = time.perf_counter()
+        index_report = FileReport(self.index_path, self.max_examples)
+        index_report.kind = 'sitemapindex'
+        listed: Dict[str, Optional[str]] = {}  # shard path -> index lastmod
+
+        if not os.path.exists(self.index_path):
+            index_report.error('missing-index', self.index_path)
+        else:
+            index_entries: List[Tuple[str, Optional[str]]] = []
+            index_report, _ = validate_urlset(self.index_path, self.base_url, self.max_urls,
+                                              self.max_bytes, self.max_examples, index_entries)
+            if index_report.kind == 'sitemapindex' and not index_report.errors.get('parse-error'):
+                for loc, lastmod in index_entries:
+                    shard_path = resolve_child_sitemap(self.index_path, loc) if loc else None
+                    if shard_path is None:
+                        if loc:
+                            index_report.error('missing-shard', loc)
+                    elif shard_path in listed:
+                        index_report.error('duplicate-index-entry', loc)
+                    else:
+                        listed[shard_path] = lastmod
+
+        # Shards the index points at, then any other sitemap files next to it
+        shard_paths = list(listed)
+        for path in self.sitemap_files_on_disk():
+            if path not in listed:
+                shard_paths.append(path)
+                if index_report.kind == 'sitemapindex':
+                    index_report.warning('unlisted-sitemap', os.path.basename(path))
+        if index_report.kind == 'urlset':
+            # A single sitemap instead of an index: validate it like a shard
+            shard_paths.insert(0, self.index_path)
+            index_report = None
+
+        self.log(f"Validating {len(shard_paths)} sitemap files with {min(self.jobs, max(1, len(shard_paths)))} "
+                 f"workers...")
+        results = self.validate_files(shard_paths)
+
+        # The same URL in two files
+        seen: Set[int] = set()
+        duplicated: Set[int] = set()
+        for _, packed in results:
+            hashes = array('Q')
+            hashes.frombytes(packed)
+            for digest in hashes:
+                if digest in seen:
+                    duplicated.add(digest)
+                else:
+                    seen.add(digest)
+        reports = []
+        for report, packed in results:
+            if duplicated:
+                hashes = array('Q')
+                hashes.frombytes(packed)
+                repeated = sum(1 for digest in hashes if digest in duplicated)
+                if repeated:
+                    report.errors['cross-file-duplicate'] = {
+                        'count': repeated, 'examples': [f"{repeated} URLs also listed in another sitemap file"]}
+            lastmod = listed.get(report.path)
+            if index_report is not None and lastmod and report.newest_lastmod and lastmod < report.newest_lastmod:
+                index_report.warning('stale-index-lastmod', f"{os.path.basename(report.path)}: index {lastmod}, "
+                                                            f"newest URL {report.newest_lastmod}")
+            if report.kind == 'sitemapindex':
+                report.error('nested-index', report.path)
+            reports.append(report)
+
+        files = ([index_report] if index_report is not None else []) + reports
+        errors = sum(report.error_count for report in files)
+        warnings = sum(report.warning_count for report in files)
+        return {
+            'ok': errors == 0,
+            'base_url': self.base_url,
+            'output_dir': self.output_dir,
+            'files': len(files),
+            'urls': sum(report.entries for report in reports),
+            'unique_urls': len(seen),
+            'bytes': sum(report.bytes for report in files),
+            'errors': errors,
+            'warnings': warnings,
+            'seconds': round(time.perf_counter() - start, 3),
+            'reports': [report.to_dict() for report in files],
+        }
+
+    def print_summary(self, result: Dict) -> None:
+        self.log(f"Checked {result['files']} files, {result['urls']} URLs "
+                 f"({result['bytes'] / 1024 / 1024:.1f} MiB) in {result['seconds']:.2f}s")
+        for report in result['reports']:
+            for level, issues in (('Error', report['errors']), ('Warning', report['warnings'])):
+                for code, issue in sorted(issues.items()):
+                    self.log(f"{level}: {report['file']}: {code} x{issue['count']}")
+                    for example in issue['examples']:
+                        self.log(f"    {example}")
+        if result['ok']:
+            self.log(f"✅ Sitemaps valid ({result['warnings']} warnings)")
+        else:
+            self.log(f"❌ {result['errors']} errors, {result['warnings']} warnings")
+
+
+def main():
+    """Validate generated sitemaps; exit status 1 on errors (or warnings with --strict)"""
+    parser = argparse.ArgumentParser(description="Validate generated sitemaps and their index")
+    parser.add_argument('output_dir', nargs='?', default=DEFAULT_OUTPUT_DIR,
+                        help=f"Directory holding sitemap.xml and its shards (default: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument('--base-url', default="https://dapsigames.com",
+                        help="Host every <loc> must be on (default: https://dapsigames.com)")
+    parser.add_argument('--index', default=INDEX_FILENAME,
+                        help=f"Index file name inside output_dir (default: {INDEX_FILENAME})")
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help="Worker processes validating shards, 0 for one per CPU (default: 0)")
+    parser.add_argument('--max-examples', type=int, default=5,
+                        help="Examples kept per issue and file (default: 5)")
+    parser.add_argument('--report', metavar='FILE',
+                        help="Write the full report as JSON to FILE ('-' for stdout, which silences the summary)")
+    parser.add_argument('--strict', action='store_true',
+                        help="Exit non-zero on warnings too")
+    args = parser.parse_args()
+
+    validator = SitemapValidator(args.output_dir, args.base_url, args.index, args.jobs,
+                                 max_examples=args.max_examples, quiet=args.report == '-')
+    result = validator.validate()
+    validator.print_summary(result)
+    if args.report == '-':
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    elif args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        validator.log(f"Report written to {args.report}")
+    sys.exit(0 if result['ok'] and not (args.strict and result['warnings']) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Watch Mode for DapsiGames Sitemaps
+Keeps a generator running and applies page and tools.ts edits as they
+happen: inotify on Linux, polling of file mtimes and sizes anywhere else.
+Bursts of events (an editor saving, a git checkout) are debounced into one
+batch, and each batch is handed to the generator's in-memory update.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# inotify(7) constants
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+# struct inotify_event: int wd; uint32 mask, cookie, len; char name[len]
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class PollingWatcher:
+    """Diffs (mtime, size) snapshots of the watched directories' files"""
+
+    def __init__(self, paths: Iterable[str], interval: float = 1.0):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.interval = interval
+        self.snapshot = self.take_snapshot()
+
+    def take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for directory in self.paths:
+            try:
+                entries = list(os.scandir(directory))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, timeout: float) -> Set[str]:
+        """Paths created, modified or deleted since the last call, after waiting up to timeout"""
+        time.sleep(min(timeout, self.interval))
+        snapshot = self.take_snapshot()
+        changed = {path for path in snapshot.keys() | self.snapshot.keys()
+                   if snapshot.get(path) != self.snapshot.get(path)}
+        self.snapshot = snapshot
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """
+    inotify watches (through libc, no extra dependency) on the watched
+    directories. A queue overflow reports the directories themselves, which
+    the generator takes to mean "everything in here may have changed".
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories: Dict[int, str] = {}
+        try:
+            for path in paths:
+                path = os.path.abspath(path)
+                wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+                if wd < 0:
+                    errno = ctypes.get_errno()
+                    raise OSError(errno, f"Cannot watch {path}: {os.strerror(errno)}")
+                self.directories[wd] = path
+        except BaseException:
+            os.close(self.fd)
+            raise
+
+    def poll(self, timeout: float) -> Set[str]:
+        """Paths with events, waiting up to timeout for the first one"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    changed.update(self.directories.values())
+                elif wd in self.directories and name:
+                    changed.add(os.path.join(self.directories[wd], os.fsdecode(name)))
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def create_watcher(paths: List[str], poll_interval: float = 1.0, force_polling: bool = False):
+    """inotify where the platform has it, polling otherwise (or when asked)"""
+    if not force_polling and sys.platform.startswith('linux'):
+        try:
+            watcher = InotifyWatcher(paths)
+            print("Watching with inotify")
+            return watcher
+        except (OSError, AttributeError, TypeError) as e:
+            print(f"Warning: inotify unavailable ({e}), polling instead")
+    print(f"Watching by polling every {poll_interval:g}s")
+    return PollingWatcher(paths, poll_interval)
+
+
+def collect_batch(watcher, debounce: float = 0.3, poll_interval: float = 1.0) -> Set[str]:
+    """
+    Block until something changes, then keep collecting until debounce
+    seconds pass without a new event. Returns every path seen.
+    """
+    changed: Set[str] = set()
+    while not changed:
+        changed = watcher.poll(poll_interval)
+    while True:
+        more = watcher.poll(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+def watch_and_regenerate(generator, debounce: float = 0.3, poll_interval: float = 1.0,
+                         force_polling: bool = False, on_update: Optional[Callable[[], None]] = None) -> None:
+    """
+    Run a full generation, then apply every debounced batch of changes to
+    the pages directory, tools.ts and App.tsx until interrupted with Ctrl+C.
+    on_update() runs after every generation that changed the sitemaps,
+    the first full one included.
+    """
+    generator.generate_sitemaps()
+    if on_update is not None:
+        on_update()
+
+    paths = [generator.pages_dir, os.path.dirname(generator.tools_ts_path), os.path.dirname(generator.app_path)]
+    paths = [path for path in dict.fromkeys(paths) if os.path.isdir(path)]
+    watcher = create_watcher(paths, poll_interval, force_polling)
+    print(f"Watching {', '.join(paths)} for changes (Ctrl+C to stop)")
+    try:
+        while True:
+            changed = collect_batch(watcher, debounce, poll_interval)
+            start = time.perf_counter()
+            if generator.apply_changes(changed):
+                if on_update is not None:
+                    on_update()
+                print(f"✅ Sitemaps updated in {(time.perf_counter() - start) * 1000:.1f} ms")
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        watcher.close()
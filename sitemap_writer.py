@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Streaming Sitemap Writer for DapsiGames
+Writes <url> and <sitemap> records to disk one at a time as escaped bytes.
+
+The output is byte-for-byte identical to building an xml.etree.ElementTree,
+running ET.indent(tree, space="  ") and writing it with
+encoding='utf-8', xml_declaration=True - without keeping any Element objects
+in memory.
+"""
+
+import gzip
+import io
+import os
+import shutil
+from concurrent.futures import Executor, Future
+from typing import BinaryIO, List, Optional, Sequence, Union
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+XML_DECLARATION = b"<?xml version='1.0' encoding='utf-8'?>\n"
+
+# Sitemap protocol limits for a single (uncompressed) sitemap file
+MAX_URLS_PER_SITEMAP = 50_000
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+
+# zlib level for .xml.gz output; 6 is close to 9 in size at a fraction of the CPU
+GZIP_LEVEL = 6
+
+
+def escape_xml_text(text: str) -> str:
+    """Escape character data the same way ElementTree serializes element text"""
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text
+
+
+class StreamingXMLWriter:
+    """
+    Base class for flat sitemap documents: one root element holding a list of
+    entry elements, each with a fixed sequence of optional text children.
+    Subclasses set root_tag, entry_tag and fields.
+    """
+
+    root_tag = ''
+    entry_tag = ''
+    fields: Sequence[str] = ()
+
+    def __init__(self, target: Union[str, BinaryIO], buffer_size: int = 1024 * 1024,
+                 compress: bool = False):
+        self._raw_file: Optional[BinaryIO] = None
+        if isinstance(target, str):
+            self.path: Optional[str] = target
+            if compress:
+                # Compress as we go; mtime=0 keeps output bytes reproducible
+                self._raw_file = open(target, 'wb')
+                gzip_file = gzip.GzipFile(filename='', mode='wb', fileobj=self._raw_file,
+                                          compresslevel=GZIP_LEVEL, mtime=0)
+                self._file = io.BufferedWriter(gzip_file, buffer_size)
+            else:
+                self._file = open(target, 'wb', buffering=buffer_size)
+            self._owns_file = True
+        else:
+            self.path = getattr(target, 'name', None)
+            self._file = target
+            self._owns_file = False
+
+        self.count = 0
+        self.bytes_written = 0
+        self.closed = False
+
+        # bytes_written counts uncompressed bytes, which is what the
+        # protocol's 50 MB limit applies to.
+        # The root start tag is only emitted once the first entry arrives,
+        # because ElementTree renders an empty root as a self-closing tag.
+        self._open_tag = f'<{self.root_tag} xmlns="{SITEMAP_NS}">'.encode('utf-8')
+        self._empty_root = f'<{self.root_tag} xmlns="{SITEMAP_NS}" />'.encode('utf-8')
+        self._close_tag = f'\n</{self.root_tag}>'.encode('utf-8')
+        self._entry_open = f'\n  <{self.entry_tag}>'
+        self._entry_close = f'\n  </{self.entry_tag}>'
+
+        self._write(XML_DECLARATION)
+
+    def _write(self, data: bytes) -> None:
+        self._file.write(data)
+        self.bytes_written += len(data)
+
+    def render_entry(self, values: Sequence[Optional[str]]) -> bytes:
+        """Render one entry element (with its leading indentation) as UTF-8 bytes"""
+        parts = [self._entry_open]
+        for field, value in zip(self.fields, values):
+            if value is None:
+                # Optional child elements are simply left out
+                continue
+            if value:
+                parts.append(f'\n    <{field}>{escape_xml_text(value)}</{field}>')
+            else:
+                parts.append(f'\n    <{field} />')
+        parts.append(self._entry_close)
+        return ''.join(parts).encode('utf-8')
+
+    def fits(self, entry_size: int, max_entries: int, max_bytes: int) -> bool:
+        """Check whether one more entry of entry_size bytes keeps the finished file within limits"""
+        if self.count >= max_entries:
+            return False
+        projected = self.bytes_written + entry_size + len(self._close_tag)
+        if self.count == 0:
+            projected += len(self._open_tag)
+        return projected <= max_bytes
+
+    def write_entry(self, values: Sequence[Optional[str]]) -> None:
+        """Append one entry to the document"""
+        self.write_rendered(self.render_entry(values))
+
+    def write_rendered(self, data: bytes) -> None:
+        """Append an entry previously produced by render_entry"""
+        if self.closed:
+            raise ValueError(f"Cannot write to closed sitemap {self.path}")
+        if self.count == 0:
+            self._write(self._open_tag)
+        self._write(data)
+        self.count += 1
+
+    def close(self) -> None:
+        """Write the closing root tag and close the underlying file if we opened it"""
+        if self.closed:
+            return
+        self._write(self._close_tag if self.count else self._empty_root)
+        self.closed = True
+        if self._owns_file:
+            self._file.close()
+            if self._raw_file is not None:
+                self._raw_file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class SitemapWriter(StreamingXMLWriter):
+    """Streaming writer for a <urlset> sitemap"""
+
+    root_tag = 'urlset'
+    entry_tag = 'url'
+    fields = ('loc', 'lastmod', 'changefreq', 'priority')
+
+    def add_url(self, loc: str, lastmod: Optional[str] = None,
+                changefreq: Optional[str] = None, priority: Optional[str] = None) -> None:
+        """Append a <url> record"""
+        self.write_entry((loc, lastmod, changefreq, priority))
+
+
+class SitemapIndexWriter(StreamingXMLWriter):
+    """Streaming writer for a <sitemapindex> file"""
+
+    root_tag = 'sitemapindex'
+    entry_tag = 'sitemap'
+    fields = ('loc', 'lastmod')
+
+    def add_sitemap(self, loc: str, lastmod: Optional[str] = None) -> None:
+        """Append a <sitemap> record"""
+        self.write_entry((loc, lastmod))
+
+
+def gzip_file(source_path: str, target_path: str, remove_source: bool = True) -> str:
+    """Compress source_path into target_path (reproducibly, mtime=0); returns target_path"""
+    with open(source_path, 'rb') as source, open(target_path, 'wb') as raw:
+        with gzip.GzipFile(filename='', mode='wb', fileobj=raw,
+                           compresslevel=GZIP_LEVEL, mtime=0) as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+    if remove_source:
+        os.remove(source_path)
+    return target_path
+
+
+def shard_filename(filename: str, number: int) -> str:
+    """Name of shard `number` (1-based): sitemap-x.xml, sitemap-x-2.xml, sitemap-x-3.xml, ..."""
+    if number == 1:
+        return filename
+    stem, dot_xml, suffix = filename.partition('.xml')
+    return f"{stem}-{number}{dot_xml}{suffix}"
+
+
+class ShardedSitemapWriter:
+    """
+    Streaming <urlset> writer that rolls over to a new shard file whenever the
+    current one would exceed the URL-count or byte-size limit. Sizes are
+    tracked incrementally from the rendered bytes, nothing is re-serialized.
+
+    With atomic=True every shard is written to a .tmp file and only renamed
+    into place by close(); abort() throws the temp files away. Existing
+    sitemaps stay intact (and readable) until the whole write succeeds.
+
+    With compress=True shards are named sitemap-x.xml.gz, sitemap-x-2.xml.gz,
+    ... and gzip-compressed while they are streamed. If an executor is given,
+    each finished shard is instead written plain and handed to the pool for
+    compression, so many shards compress in parallel (zlib releases the GIL,
+    so a thread pool is enough).
+
+    With a publisher (see sitemap_publish), shards are written atomically
+    and handed to publisher.publish() instead of being renamed, so shards
+    whose content didn't change are left untouched.
+    """
+
+    def __init__(self, output_dir: str, filename: str,
+                 max_urls: int = MAX_URLS_PER_SITEMAP, max_bytes: int = MAX_SITEMAP_BYTES,
+                 atomic: bool = False, compress: bool = False, executor: Optional[Executor] = None,
+                 publisher=None):
+        self.output_dir = output_dir
+        self.filename = f"{filename}.gz" if compress and not filename.endswith('.gz') else filename
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.publisher = publisher
+        self.atomic = atomic or publisher is not None
+        self.compress = compress
+        self.executor = executor if compress else None
+        self.filenames: List[str] = []
+        # Newest <lastmod> in each shard (None if no entry had one), for the sitemap index
+        self.lastmods: List[Optional[str]] = []
+        self.count = 0
+        self.bytes_written = 0  # uncompressed, summed over finished shards
+        self.closed = False
+        self._writer: Optional[SitemapWriter] = None
+        self._pending: List[Future] = []
+        self._published = False
+
+    def _shard_path(self, filename: str) -> str:
+        path = os.path.join(self.output_dir, filename)
+        return f"{path}.tmp" if self.atomic else path
+
+    def _plain_path(self, filename: str) -> str:
+        """Uncompressed staging file for a shard that the pool will compress"""
+        return os.path.join(self.output_dir, f"{filename}.plain.tmp")
+
+    def _finish_shard(self) -> None:
+        if self._writer is None or self._writer.closed:
+            return
+        self._writer.close()
+        self.bytes_written += self._writer.bytes_written
+        if self.executor is not None:
+            filename = self.filenames[-1]
+            self._pending.append(self.executor.submit(
+                gzip_file, self._plain_path(filename), self._shard_path(filename)))
+
+    def _open_next_shard(self) -> SitemapWriter:
+        self._finish_shard()
+        filename = shard_filename(self.filename, len(self.filenames) + 1)
+        self.filenames.append(filename)
+        self.lastmods.append(None)
+        if self.executor is not None:
+            self._writer = SitemapWriter(self._plain_path(filename))
+        else:
+            self._writer = SitemapWriter(self._shard_path(filename), compress=self.compress)
+        return self._writer
+
+    def add_url(self, loc: str, lastmod: Optional[str] = None,
+                changefreq: Optional[str] = None, priority: Optional[str] = None) -> None:
+        """Append a <url> record, starting a new shard if the current one is full"""
+        writer = self._writer or self._open_next_shard()
+        data = writer.render_entry((loc, lastmod, changefreq, priority))
+        if not writer.fits(len(data), self.max_urls, self.max_bytes):
+            if writer.count:
+                writer = self._open_next_shard()
+            if not writer.fits(len(data), self.max_urls, self.max_bytes):
+                raise ValueError(f"A single <url> entry for {loc} exceeds the {self.max_bytes} byte sitemap limit")
+        writer.write_rendered(data)
+        self.count += 1
+        if lastmod and (self.lastmods[-1] is None or lastmod > self.lastmods[-1]):
+            self.lastmods[-1] = lastmod
+
+    def close(self, wait: bool = True) -> List[str]:
+        """
+        Finish the last shard and return the filenames of all shards written.
+        With wait=False, shards still being compressed by the pool are left
+        running and wait() must be called before the files are used.
+        """
+        if self.closed:
+            return self.filenames
+        if self._writer is None:
+            # Still emit an (empty) sitemap so callers always get a file
+            self._open_next_shard()
+        self._finish_shard()
+        self.closed = True
+        if wait:
+            self.wait()
+        return self.filenames
+
+    def wait(self) -> List[str]:
+        """Wait for background compression and move atomic shards into place"""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+        if self.atomic and not self._published:
+            for filename in self.filenames:
+                final_path = os.path.join(self.output_dir, filename)
+                if self.publisher is not None:
+                    self.publisher.publish(self._shard_path(filename), final_path)
+                else:
+                    os.replace(self._shard_path(filename), final_path)
+            self._published = True
+        return self.filenames
+
+    def abort(self) -> None:
+        """Discard everything written so far (only undoable with atomic=True)"""
+        if self._published:
+            return
+        if self._writer is not None:
+            self._writer.close()
+        for future in self._pending:
+            future.cancel()
+            try:
+                future.result()
+            except Exception:
+                pass
+        for filename in self.filenames:
+            stale = [self._plain_path(filename)] if self.executor is not None else []
+            if self.atomic:
+                stale.append(self._shard_path(filename))
+            for path in stale:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
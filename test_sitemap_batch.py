@@ -0,0 +1,104 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from comprehensive_sitemap_generator import ComprehensiveSitemapGenerator
+from sitemap_batch import SiteConfig, generate_batch, load_site_configs, rebase_url, render_site
+from sitemap_page_index import PageIndex
+from sitemap_pipeline import UrlEntry
+from sitemap_reader import iter_sitemap_urls
+from sitemap_records import ToolRecord
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+SCAN_BASE = "https://dapsigames.com"
+SETTINGS = {'max_urls_per_sitemap': 50000, 'max_sitemap_bytes': 50 * 1024 * 1024, 'compress': False,
+            'compress_jobs': 1}
+
+
+@pytest.mark.parametrize('url, rebased', [
+    ("https://dapsigames.com", "https://staging.dapsigames.com/de"),
+    ("https://dapsigames.com/games/chess", "https://staging.dapsigames.com/de/games/chess"),
+    ("https://dapsigames.com?page=2", "https://dapsigames.com?page=2"),
+    ("https://dapsigames.com.evil.io/games", "https://dapsigames.com.evil.io/games"),
+    ("https://cdn.example.com/games/chess", "https://cdn.example.com/games/chess"),
+])
+def test_rebase_url(url, rebased):
+    assert rebase_url(url, SCAN_BASE, "https://staging.dapsigames.com/de") == rebased
+
+
+def test_load_site_configs_fills_defaults_and_rejects_bad_entries(tmp_path):
+    path = tmp_path / 'sites.json'
+    path.write_text(json.dumps({'sites': [
+        {'base_url': "https://staging.dapsigames.com/"},
+        {'name': 'de', 'base_url': "https://dapsigames.com/de", 'output_dir': 'out/de', 'robots': 'de.txt'},
+    ]}), encoding='utf-8')
+    assert load_site_configs(str(path)) == [
+        SiteConfig('staging.dapsigames.com', "https://staging.dapsigames.com",
+                   os.path.join('sitemaps', 'staging.dapsigames.com')),
+        SiteConfig('de', "https://dapsigames.com/de", 'out/de', 'de.txt'),
+    ]
+
+    path.write_text(json.dumps([{'name': 'relative', 'base_url': '/de'}]), encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_site_configs(str(path))
+    path.write_text(json.dumps([{'base_url': "https://a.example", 'output_dir': 'out'},
+                                {'base_url': "https://b.example", 'output_dir': 'out/'}]), encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_site_configs(str(path))
+
+
+def locs(output_dir):
+    return sorted(url.loc for url in iter_sitemap_urls(os.path.join(output_dir, 'sitemap.xml')))
+
+
+def test_render_site_rebases_every_url_and_applies_its_own_robots(tmp_path):
+    tools = [ToolRecord('chess', 'Chess', 'logic', '/games/chess', f"{SCAN_BASE}/games/chess", lastmod='2025-09-18'),
+             ToolRecord('sudoku', 'Sudoku', 'logic', '/games/sudoku', f"{SCAN_BASE}/games/sudoku",
+                        lastmod='2025-09-17')]
+    main_entries = [UrlEntry('main', f"{SCAN_BASE}/", '2025-09-18', 'daily', '1.0'),
+                    UrlEntry('main', f"{SCAN_BASE}/about-us", '2025-09-01', 'monthly', '0.5')]
+    robots = tmp_path / 'robots.txt'
+    robots.write_text("User-agent: *\nDisallow: /de/games/sudoku\nDisallow: /about-us\n", encoding='utf-8')
+    site = SiteConfig('de', "https://dapsigames.com/de", str(tmp_path / 'de'), str(robots))
+
+    name, sitemap_files, _, summary = render_site(site, SCAN_BASE, tools, main_entries, PageIndex([]),
+                                                  '2025-09-18', SETTINGS)
+    assert name == 'de' and summary
+    assert sorted(sitemap_files) == ['logic', 'main']
+    # /about-us is not a path of this site, /de/about-us is
+    assert locs(site.output_dir) == ["https://dapsigames.com/de/", "https://dapsigames.com/de/about-us",
+                                     "https://dapsigames.com/de/games/chess"]
+    # The scan's records are left alone for the other sites
+    assert tools[1].url == f"{SCAN_BASE}/games/sudoku"
+
+
+@pytest.fixture
+def site_tree(tmp_path, monkeypatch):
+    for name in ('pages', 'data'):
+        shutil.copytree(os.path.join(REPO, 'client', 'src', name), tmp_path / 'client' / 'src' / name)
+    shutil.copy(os.path.join(REPO, 'client', 'src', 'App.tsx'), tmp_path / 'client' / 'src' / 'App.tsx')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.mark.parametrize('site_jobs', [1, 2])
+def test_batch_matches_one_run_per_site(site_tree, site_jobs):
+    sites = [SiteConfig('live', SCAN_BASE, 'batch/live'),
+             SiteConfig('staging', "https://staging.dapsigames.com", 'batch/staging'),
+             SiteConfig('de', "https://dapsigames.com/de", 'batch/de')]
+    scan = ComprehensiveSitemapGenerator(base_url=SCAN_BASE, cache_file=None, lastmod_source='now', quiet=True)
+    site_files = generate_batch(scan, sites, site_jobs)
+    assert sorted(site_files) == ['de', 'live', 'staging']
+
+    for site in sites:
+        single = os.path.join('single', site.name)
+        ComprehensiveSitemapGenerator(base_url=site.base_url, output_dir=single, cache_file=None,
+                                      lastmod_source='now', quiet=True).generate_sitemaps()
+        names = sorted(os.listdir(single))
+        assert sorted(os.listdir(site.output_dir)) == names
+        for filename in names:
+            with open(os.path.join(site.output_dir, filename), 'rb') as batch, \
+                    open(os.path.join(single, filename), 'rb') as expected:
+                assert batch.read() == expected.read(), f"{site.name}/{filename}"
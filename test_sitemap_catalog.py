@@ -0,0 +1,60 @@
+from sitemap_catalog import CatalogTool, parse_object_literals, parse_tools_catalog, unescape_js_string
+
+TOOLS_TS = r'''
+import { Calculator } from "lucide-react";
+
+// { id: "commented-out", href: "/nowhere" }
+/* A block comment { with braces } and 'quotes' */
+export const tools: Tool[] = [
+  {
+    id: "math-quiz",
+    name: "Math Quiz",
+    description: "Braces { in } a description, and a 'quote'",
+    category: "math",
+    href: "/games/math-quiz",
+    icon: Calculator,
+    isPopular: true,
+  },
+  {
+    id: 'word-scramble',
+    name: 'Word \'Scramble\'',
+    category: 'language',
+    href: '/games/word-scramble',
+    stats: { plays: 1200, rating: 4.5 },
+  },
+  {
+    "id": "unicode",
+    "name": "Café \u{1F600}",
+    category: `puzzle`,
+    href: `/games/unicode`,
+    isPopular: false,
+  },
+  { id: "no-name", href: "/tools/no-name", category: getCategory() },
+  { id: "math-quiz", name: "Duplicate", category: "math", href: "/games/other" },
+  { id: "no-href", name: "No Href", category: "math" },
+];
+'''
+
+
+def test_parse_tools_catalog_reads_entries_in_file_order():
+    assert parse_tools_catalog(TOOLS_TS) == [
+        CatalogTool('math-quiz', 'Math Quiz', 'math', '/games/math-quiz', True),
+        CatalogTool('word-scramble', "Word 'Scramble'", 'language', '/games/word-scramble', False),
+        CatalogTool('unicode', 'Café \U0001F600', 'puzzle', '/games/unicode', False),
+        CatalogTool('no-name', 'No Name', None, '/tools/no-name', False),
+    ]
+
+
+def test_nested_objects_come_before_their_parent():
+    objects = parse_object_literals(TOOLS_TS)
+    stats = objects.index({'plays': 1200.0, 'rating': 4.5})
+    assert objects[stats + 1]['id'] == 'word-scramble'
+
+
+def test_unbalanced_braces_are_tolerated():
+    assert parse_tools_catalog('} { id: "a", href: "/a" } }') == [CatalogTool('a', 'A', None, '/a')]
+    assert parse_tools_catalog('{ id: "a", href: "/a"') == []
+
+
+def test_unescape_js_string():
+    assert unescape_js_string(r'tab\there \x41 B \u{43} \\ \"') == 'tab\there A B C \\ "'
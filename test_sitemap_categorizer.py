@@ -0,0 +1,52 @@
+import re
+
+import pytest
+
+from sitemap_categorizer import CompiledCategorizer, build_prefix_trie_regex, literal_prefix
+
+QUANTIFIED_PATTERNS = [
+    r'ab+c', r'ab*d', r'ab?e', r'ab{2,3}f', r'abc', r'x+y', r'loan.*calculator', r'lean.*body',
+    r'colou?r', r'go+gle', r'zz{1,}top',
+]
+
+TEXTS = [
+    'abc', 'abbc', 'ac', 'ad', 'abbbd', 'ae', 'abe', 'abbe', 'abf', 'abbf', 'abbbf', 'abbbbf',
+    'xy', 'xxxy', 'y', 'loan-calculator', 'lean-body', 'color', 'colour', 'gogle', 'google', 'ggle',
+    'zztop', 'ztop', 'zzztop', 'nothing',
+]
+
+
+@pytest.mark.parametrize('pattern, prefix', [
+    ('abc', 'abc'), ('ab+c', 'a'), ('ab*c', 'a'), ('ab?c', 'a'), ('ab{2}c', 'a'),
+    ('loan.*calculator', 'loan'), ('a|b', ''), ('+', ''),
+])
+def test_literal_prefix_stops_before_quantified_character(pattern, prefix):
+    assert literal_prefix(pattern) == prefix
+
+
+@pytest.mark.parametrize('pattern', QUANTIFIED_PATTERNS)
+def test_single_pattern_trie_compiles_and_matches_like_the_pattern(pattern):
+    regex = re.compile(build_prefix_trie_regex([pattern]))
+    for text in TEXTS:
+        assert bool(regex.search(text)) == bool(re.search(pattern, text)), (pattern, text)
+
+
+def test_trie_regex_matches_naive_alternation():
+    trie = re.compile(build_prefix_trie_regex(QUANTIFIED_PATTERNS))
+    naive = re.compile('|'.join(f'(?:{pattern})' for pattern in QUANTIFIED_PATTERNS))
+    for text in TEXTS:
+        assert bool(trie.search(text)) == bool(naive.search(text)), text
+
+
+def test_categorizer_matches_first_matching_category():
+    category_patterns = {
+        'plus': [r'ab+c', r'x+y'],
+        'star': [r'ab*d', r'go+gle'],
+        'optional': [r'ab?e', r'colou?r'],
+        'counted': [r'ab{2,3}f', r'zz{1,}top'],
+    }
+    categorizer = CompiledCategorizer(category_patterns)
+    for text in TEXTS:
+        expected = next((category for category, patterns in category_patterns.items()
+                         if any(re.search(pattern, text, re.IGNORECASE) for pattern in patterns)), 'main')
+        assert categorizer.categorize(text) == expected, text
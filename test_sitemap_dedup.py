@@ -0,0 +1,74 @@
+import pytest
+
+from sitemap_dedup import BloomFilter, UrlDeduplicator, normalize_url
+
+
+@pytest.mark.parametrize('url, canonical', [
+    ("HTTPS://DapsiGames.com:443/games/", "https://dapsigames.com/games"),
+    ("http://dapsigames.com:8080/games", "http://dapsigames.com:8080/games"),
+    ("https://dapsigames.com//games///chess#rules", "https://dapsigames.com/games/chess"),
+    ("https://dapsigames.com/?utm_source=x&b=2&a=1&gclid=z", "https://dapsigames.com/?a=1&b=2"),
+    ("https://dapsigames.com/games?ref=home&utm_medium=x", "https://dapsigames.com/games?ref=home"),
+    ("https://dapsigames.com/search?q=math%20quiz&gclid=z", "https://dapsigames.com/search?q=math%20quiz"),
+    ("https://dapsigames.com/search?q=a%2Bb&page=2", "https://dapsigames.com/search?page=2&q=a%2Bb"),
+    ("https://dapsigames.com/?utm%5Fsource=x&a=1", "https://dapsigames.com/?a=1"),
+    ("https://dapsigames.com", "https://dapsigames.com/"),
+    ("  https://dapsigames.com/about  ", "https://dapsigames.com/about"),
+    ("not a url", "not a url"),
+])
+def test_normalize_url(url, canonical):
+    assert normalize_url(url) == canonical
+
+
+def test_path_case_is_kept_unless_asked_to_fold():
+    assert normalize_url("https://dapsigames.com/Games/Foo") == "https://dapsigames.com/Games/Foo"
+    assert normalize_url("https://dapsigames.com/Games/Foo", lowercase_path=True) == "https://dapsigames.com/games/foo"
+
+
+ENTRIES = [
+    ("https://dapsigames.com/games/chess/", "2025-09-01", "weekly", "0.8"),
+    ("https://dapsigames.com/games/chess?utm_source=mail", "2025-09-10", "daily", "0.5"),
+    ("https://dapsigames.com/Games/Chess", "2025-09-05", "weekly", "0.8"),
+    ("https://dapsigames.com/games/sudoku", None, "weekly", "0.8"),
+    ("https://DAPSIGAMES.com/games/chess", None, "weekly", "0.8"),
+]
+
+
+def test_exact_mode_keeps_first_seen_order_and_newest_lastmod():
+    dedup = UrlDeduplicator('exact')
+    result = list(dedup.process(ENTRIES))
+    assert result == [
+        ("https://dapsigames.com/games/chess", "2025-09-10", "weekly", "0.8"),
+        ("https://dapsigames.com/Games/Chess", "2025-09-05", "weekly", "0.8"),
+        ("https://dapsigames.com/games/sudoku", None, "weekly", "0.8"),
+    ]
+    assert (dedup.seen, dedup.emitted, dedup.duplicates, dedup.newer_lastmods) == (5, 3, 2, 1)
+
+
+def test_bloom_mode_streams_the_first_spelling():
+    dedup = UrlDeduplicator('bloom', capacity=1000)
+    result = list(dedup.process(ENTRIES))
+    assert result == [
+        ("https://dapsigames.com/games/chess", "2025-09-01", "weekly", "0.8"),
+        ("https://dapsigames.com/Games/Chess", "2025-09-05", "weekly", "0.8"),
+        ("https://dapsigames.com/games/sudoku", None, "weekly", "0.8"),
+    ]
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(10_000, error_rate=0.01)
+    for i in range(10_000):
+        bloom.add(f"https://dapsigames.com/a/{i}")
+    assert all(bloom.add(f"https://dapsigames.com/a/{i}") for i in range(10_000))
+    # add() also inserts, so restore the bits after each probe of an unseen URL
+    bits = bytes(bloom.bits)
+    false_positives = 0
+    for i in range(2_000):
+        false_positives += bloom.add(f"https://dapsigames.com/b/{i}")
+        bloom.bits[:] = bits
+    assert false_positives < 60  # about 1% expected
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        UrlDeduplicator('fuzzy')
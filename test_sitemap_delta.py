@@ -0,0 +1,62 @@
+from sitemap_delta import DeltaTracker, SitemapDelta, collapse, merge_join
+from sitemap_writer import SitemapIndexWriter, SitemapWriter
+
+
+def test_collapse_keeps_the_newest_lastmod_of_a_repeated_loc():
+    records = [('a', '2025-01-01'), ('a', '2025-03-01'), ('a', '2025-02-01'), ('b', ''), ('c', '2025-01-01')]
+    assert list(collapse(records)) == [('a', '2025-03-01'), ('b', ''), ('c', '2025-01-01')]
+
+
+def test_merge_join_classifies_added_removed_and_changed():
+    old = [('a', '2025-01-01'), ('b', '2025-01-01'), ('c', ''), ('d', '2025-01-01')]
+    new = [('b', '2025-01-01'), ('c', '2025-02-01'), ('d', '2025-03-01'), ('e', '')]
+    delta = merge_join(old, new, SitemapDelta())
+    assert delta.removed == [('a', '2025-01-01')]
+    assert delta.added == [('e', None)]
+    assert delta.changed == [('c', None, '2025-02-01'), ('d', '2025-01-01', '2025-03-01')]
+    assert delta.urls() == ['e', 'c', 'd', 'a']
+
+
+def test_merge_join_of_identical_streams_is_empty():
+    records = [('a', '2025-01-01'), ('b', '')]
+    assert merge_join(records, records, SitemapDelta()).empty
+
+
+def publish(directory, urls_by_file):
+    with SitemapIndexWriter(str(directory / 'sitemap.xml')) as index:
+        for name, urls in urls_by_file.items():
+            with SitemapWriter(str(directory / name)) as writer:
+                for loc, lastmod in urls:
+                    writer.add_url(loc, lastmod)
+            index.add_sitemap(f"https://dapsigames.com/{name}")
+
+
+def test_tracker_compares_published_sitemaps_across_a_run(tmp_path):
+    base = "https://dapsigames.com"
+    before = {f"{base}/games/{i}": "2025-09-01" for i in range(200)}
+    after = dict(before)
+    del after[f"{base}/games/3"]
+    after[f"{base}/games/7"] = "2025-09-20"
+    after[f"{base}/games/new"] = "2025-09-20"
+    publish(tmp_path, {'sitemap-a.xml': list(before.items())[:100], 'sitemap-b.xml': list(before.items())[100:]})
+
+    # A tiny budget forces both sides to spill
+    with DeltaTracker(str(tmp_path / 'sitemap.xml'), budget_bytes=2000, temp_dir=str(tmp_path)) as tracker:
+        tracker.snapshot()
+        assert tracker.old.spills
+        publish(tmp_path, {'sitemap-a.xml': sorted(after.items())})
+        delta = tracker.finish()
+
+    assert delta.added == [(f"{base}/games/new", "2025-09-20")]
+    assert delta.removed == [(f"{base}/games/3", "2025-09-01")]
+    assert delta.changed == [(f"{base}/games/7", "2025-09-01", "2025-09-20")]
+    assert (delta.old_count, delta.new_count) == (200, 200)
+
+
+def test_tracker_treats_a_missing_index_as_empty(tmp_path):
+    tracker = DeltaTracker(str(tmp_path / 'sitemap.xml'))
+    tracker.snapshot()
+    publish(tmp_path, {'sitemap-a.xml': [("https://dapsigames.com/", None)]})
+    delta = tracker.finish()
+    assert delta.added == [("https://dapsigames.com/", None)]
+    assert not delta.removed and not delta.changed
@@ -0,0 +1,82 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from sitemap_lastmod import LastmodProvider, format_lastmod, git_commit_dates
+from sitemap_manifest import PageManifest
+
+needs_git = pytest.mark.skipif(shutil.which('git') is None, reason="git is not installed")
+
+
+def git(repo, *args, date=None):
+    env = dict(os.environ, GIT_AUTHOR_NAME='t', GIT_AUTHOR_EMAIL='t@example.com',
+               GIT_COMMITTER_NAME='t', GIT_COMMITTER_EMAIL='t@example.com')
+    if date:
+        env.update(GIT_AUTHOR_DATE=f'{date}T12:00:00Z', GIT_COMMITTER_DATE=f'{date}T12:00:00Z')
+    subprocess.run(['git', '-C', str(repo), *args], check=True, capture_output=True, env=env)
+
+
+def commit(repo, files, date):
+    for name, content in files.items():
+        path = repo / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+    git(repo, 'add', '-A')
+    git(repo, 'commit', '-q', '-m', date, date=date)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    git(repo, 'init', '-q')
+    commit(repo, {'pages/Home.tsx': 'home', 'pages/games/Chess.tsx': 'chess', 'README.md': 'readme'}, '2025-01-10')
+    commit(repo, {'pages/games/Chess.tsx': 'chess v2', 'pages/Über.tsx': 'uber'}, '2025-03-05')
+    return repo
+
+
+@needs_git
+def test_git_commit_dates_keeps_each_files_newest_commit(repo):
+    assert git_commit_dates(str(repo / 'pages')) == {
+        'Home.tsx': '2025-01-10',
+        'games/Chess.tsx': '2025-03-05',
+        'Über.tsx': '2025-03-05',
+    }
+
+
+@needs_git
+def test_git_source_falls_back_to_mtime_for_untracked_pages(repo):
+    pages = repo / 'pages'
+    (pages / 'New.tsx').write_text('new', encoding='utf-8')
+    os.utime(pages / 'New.tsx', (1700000000, 1700000000))
+    provider = LastmodProvider('git', str(pages))
+    assert provider.page_lastmod(str(pages / 'games' / 'Chess.tsx')) == '2025-03-05'
+    assert provider.page_lastmod(str(pages / 'New.tsx')) == format_lastmod(1700000000)
+    assert provider.page_lastmod(str(repo / 'README.md')) == '2025-01-10'
+    assert provider.page_lastmod(str(pages / 'Missing.tsx')) is None
+
+
+@needs_git
+def test_git_dates_are_cached_in_the_manifest_per_head(repo, monkeypatch):
+    pages = str(repo / 'pages')
+    manifest = PageManifest(str(repo.parent / 'manifest.json'), 'settings')
+    LastmodProvider('git', pages, manifest).git_dates()
+
+    def no_git_log(directory):
+        raise AssertionError("git log ran although HEAD is unchanged")
+
+    monkeypatch.setattr('sitemap_lastmod.git_commit_dates', no_git_log)
+    assert LastmodProvider('git', pages, manifest).git_dates()['Home.tsx'] == '2025-01-10'
+
+
+def test_mtime_and_now_sources(tmp_path):
+    page = tmp_path / 'Page.tsx'
+    page.write_text('page', encoding='utf-8')
+    os.utime(page, (1700000000, 1700000000))
+    assert LastmodProvider('mtime', str(tmp_path)).page_lastmod(str(page)) == '2023-11-14'
+    now = LastmodProvider('now', str(tmp_path))
+    assert now.page_lastmod(str(page)) == now.current_date
+    with pytest.raises(ValueError):
+        LastmodProvider('ctime', str(tmp_path))
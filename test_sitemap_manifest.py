@@ -0,0 +1,56 @@
+import json
+import os
+
+from sitemap_manifest import PageManifest, discard_outputs
+
+
+def published(tmp_path, content=b'<urlset />'):
+    (tmp_path / 'sitemap-a.xml').write_bytes(content)
+
+
+def test_unchanged_output_needs_the_files_it_was_published_with(tmp_path):
+    manifest = PageManifest(str(tmp_path / 'manifest.json'), 'settings')
+    published(tmp_path)
+    manifest.update_output('sitemap-a.xml', 'digest', ['sitemap-a.xml'], ['2025-09-18'])
+    # Not stamped yet: the files may still be in flight
+    assert manifest.output_unchanged('sitemap-a.xml', 'digest', str(tmp_path)) is None
+    manifest.stamp_outputs(str(tmp_path))
+    assert manifest.output_unchanged('sitemap-a.xml', 'digest', str(tmp_path)) == ['sitemap-a.xml']
+    assert manifest.output_unchanged('sitemap-a.xml', 'other', str(tmp_path)) is None
+
+    published(tmp_path, b'<urlset>rewritten by another run</urlset>')
+    assert manifest.output_unchanged('sitemap-a.xml', 'digest', str(tmp_path)) is None
+    os.remove(tmp_path / 'sitemap-a.xml')
+    assert manifest.output_unchanged('sitemap-a.xml', 'digest', str(tmp_path)) is None
+
+
+def test_stamps_survive_a_save_and_discard_outputs_forgets_them(tmp_path):
+    path = str(tmp_path / 'manifest.json')
+    manifest = PageManifest(path, 'settings')
+    published(tmp_path)
+    manifest.update_output('sitemap-a.xml', 'digest', ['sitemap-a.xml'])
+    manifest.stamp_outputs(str(tmp_path))
+    manifest.save()
+    assert PageManifest(path, 'settings').output_unchanged('sitemap-a.xml', 'digest', str(tmp_path)) == ['sitemap-a.xml']
+
+    discard_outputs(path)
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['outputs'] == {}
+    assert PageManifest(path, 'settings').output_unchanged('sitemap-a.xml', 'digest', str(tmp_path)) is None
+
+
+def test_stamping_nothing_leaves_a_saved_manifest_clean(tmp_path):
+    path = tmp_path / 'manifest.json'
+    manifest = PageManifest(str(path), 'settings')
+    published(tmp_path)
+    manifest.update_output('sitemap-a.xml', 'digest', ['sitemap-a.xml'])
+    manifest.stamp_outputs(str(tmp_path))
+    manifest.save()
+    saved = path.stat().st_mtime_ns
+
+    manifest = PageManifest(str(path), 'settings')
+    manifest.stamp_outputs(str(tmp_path))
+    assert not manifest.dirty
+    os.utime(path, ns=(saved - 10**9, saved - 10**9))
+    manifest.save()
+    assert path.stat().st_mtime_ns == saved - 10**9
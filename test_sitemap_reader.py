@@ -0,0 +1,28 @@
+from sitemap_reader import iter_sitemap_urls
+from sitemap_writer import SitemapIndexWriter, SitemapWriter
+
+
+def write_index(tmp_path):
+    with SitemapWriter(str(tmp_path / 'sitemap-main.xml')) as writer:
+        writer.add_url("https://dapsigames.com/", "2025-09-18", "daily", "1.0")
+    with SitemapIndexWriter(str(tmp_path / 'sitemap.xml')) as writer:
+        writer.add_sitemap("https://dapsigames.com/sitemap-main.xml")
+        writer.add_sitemap("https://dapsigames.com/sitemap-missing.xml")
+        writer.add_sitemap("https://dapsigames.com/sitemap.xml")
+    return str(tmp_path / 'sitemap.xml')
+
+
+def test_skipped_index_entries_are_reported_through_warn(tmp_path):
+    warnings = []
+    urls = list(iter_sitemap_urls(write_index(tmp_path), warn=warnings.append))
+    assert [url.loc for url in urls] == ["https://dapsigames.com/"]
+    assert len(warnings) == 2
+    assert 'sitemap-missing.xml' in warnings[0]
+    assert 'index cycle' in warnings[1]
+
+
+def test_warnings_default_to_stderr(tmp_path, capsys):
+    list(iter_sitemap_urls(write_index(tmp_path)))
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert 'sitemap-missing.xml' in captured.err
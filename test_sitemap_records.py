@@ -0,0 +1,28 @@
+from sitemap_pipeline import UrlEntry
+from sitemap_records import UrlBatch
+
+
+def entries(count, distinct):
+    return [UrlEntry(f"category-{i % distinct}", f"https://dapsigames.com/{i}", f"2025-09-{i % 28 + 1:02d}",
+                     'weekly', '0.8') for i in range(count)]
+
+
+def test_batch_round_trips_entries():
+    data = entries(500, 7)
+    batch = UrlBatch(data)
+    assert len(batch) == 500
+    assert list(batch) == data
+    assert batch.entry(123) == data[123]
+    assert batch.column('lastmod') == [entry.lastmod for entry in data]
+    assert batch.counts()['category-3'] == sum(entry.category == 'category-3' for entry in data)
+    assert list(batch.select('category', 'category-6')) == [entry for entry in data if entry.category == 'category-6']
+    assert batch.newest() == '2025-09-28'
+
+
+def test_batch_widens_code_columns_past_65536_values():
+    data = entries(70_000, 70_000)
+    batch = UrlBatch(data)
+    assert batch.codes['changefreq'].typecode == 'H'
+    assert batch.codes['category'].typecode == 'I'
+    assert batch.entry(69_999) == data[69_999]
+    assert list(batch)[65_536:65_540] == data[65_536:65_540]
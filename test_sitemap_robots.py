@@ -0,0 +1,91 @@
+import pytest
+
+from sitemap_robots import RobotsFilter, RobotsMatcher, RobotsRule, parse_robots, select_rules, url_path
+
+ROBOTS_TXT = """
+# comment
+User-agent: *
+Disallow: /admin
+Disallow: /games/*/edit$
+Allow: /admin/public
+Disallow: /private/
+Allow: /private/
+Disallow:
+
+User-agent: Googlebot
+User-agent: Bingbot
+Disallow: /search
+
+Sitemap: https://dapsigames.com/sitemap.xml
+"""
+
+
+def test_parse_robots_groups_agents_and_skips_empty_disallow():
+    groups = parse_robots(ROBOTS_TXT)
+    assert set(groups) == {'*', 'googlebot', 'bingbot'}
+    assert groups['googlebot'] == groups['bingbot'] == [RobotsRule(False, '/search')]
+    assert len(groups['*']) == 5
+
+
+def test_select_rules_falls_back_to_the_star_group():
+    groups = parse_robots(ROBOTS_TXT)
+    assert select_rules(groups, 'GoogleBot') == [RobotsRule(False, '/search')]
+    assert select_rules(groups, 'DuckDuckBot') == groups['*']
+    assert select_rules({}, 'anything') == []
+
+
+@pytest.mark.parametrize('path, allowed', [
+    ('/', True),
+    ('/admin', False),
+    ('/admin/settings', False),
+    ('/administrator', False),
+    ('/admin/public', True),           # the longer Allow wins
+    ('/admin/public/page', True),
+    ('/games/chess/edit', False),      # * and $ anchor
+    ('/games/chess/edit/more', True),  # $ anchors the end
+    ('/games/chess', True),
+    ('/private/file', True),           # Allow wins a tie in length
+])
+def test_longest_match_decides(path, allowed):
+    matcher = RobotsMatcher(select_rules(parse_robots(ROBOTS_TXT)))
+    assert matcher.allowed(path) is allowed
+
+
+def test_matcher_agrees_with_checking_every_rule():
+    import re
+    rules = select_rules(parse_robots(ROBOTS_TXT))
+    matcher = RobotsMatcher(rules)
+
+    def naive(path):
+        best = None
+        for rule in rules:
+            pattern = re.escape(rule.pattern.rstrip('$')).replace(r'\*', '.*') + ('$' if rule.pattern.endswith('$') else '')
+            if re.match(pattern, path):
+                if best is None or len(rule.pattern) > len(best.pattern) or \
+                        (len(rule.pattern) == len(best.pattern) and rule.allow):
+                    best = rule
+        return best is None or best.allow
+
+    for path in ('/', '/admin', '/admin/public/x', '/games/x/edit', '/games/x/edit/', '/private/', '/search'):
+        assert matcher.allowed(path) == naive(path), path
+
+
+def test_url_path_keeps_the_query():
+    assert url_path("https://dapsigames.com") == '/'
+    assert url_path("https://dapsigames.com/games?level=2") == '/games?level=2'
+
+
+def test_filter_drops_disallowed_urls_and_counts_them():
+    robots_filter = RobotsFilter.from_text(ROBOTS_TXT)
+    urls = ["https://dapsigames.com/", "https://dapsigames.com/admin/x", "https://dapsigames.com/admin/public"]
+    assert list(robots_filter.filter(urls)) == [urls[0], urls[2]]
+    assert robots_filter.checked == 3
+    assert robots_filter.excluded == {RobotsRule(False, '/admin'): 1}
+    robots_filter.reset()
+    assert robots_filter.checked == 0 and not robots_filter.excluded
+
+
+def test_filter_with_url_of_and_no_rules():
+    robots_filter = RobotsFilter.from_text("User-agent: *\nDisallow:\n")
+    items = [("https://dapsigames.com/anything", 1)]
+    assert list(robots_filter.filter(items, lambda item: item[0])) == items
@@ -0,0 +1,48 @@
+from sitemap_catalog import CatalogTool
+from sitemap_routes import Route, RouteTable, parse_routes
+
+APP_TSX = """
+import Home from "@/pages/home";
+const AllGames = lazy(() => import("@/pages/all-games"));
+/* <Route path="/commented-out" component={Home} /> */
+export default function Router() {
+  return (
+    <Switch>
+      <Route path="/" component={Home} />
+      <Route path="/games" component={AllGames} />
+      <Route path="/games/:toolId" component={GamePage} />
+      <Route path={"/levels/:game/:level?"} component={LevelPage} />
+      <Route component={NotFound} />
+    </Switch>
+  );
+}
+"""
+
+
+def test_parse_routes_reads_paths_in_order():
+    routes = parse_routes(APP_TSX)
+    assert [route.path for route in routes] == ['/', '/games', '/games/:toolId', '/levels/:game/:level?']
+    assert [route.component for route in routes] == ['Home', 'AllGames', 'GamePage', 'LevelPage']
+    assert [route.is_static for route in routes] == [True, True, False, False]
+
+
+def test_match_prefers_the_first_declared_route():
+    table = RouteTable([Route('/games/featured'), Route('/games/:toolId'), Route('/games/:other')])
+    assert table.match('/games/featured') == (Route('/games/featured'), {})
+    assert table.match('/games/chess') == (Route('/games/:toolId'), {'toolId': 'chess'})
+    assert table.match('/games/chess/extra') is None
+
+
+def test_optional_trailing_parameters_match_shorter_hrefs():
+    table = RouteTable(parse_routes(APP_TSX))
+    assert table.match('/levels/chess/3')[1] == {'game': 'chess', 'level': '3'}
+    assert table.match('/levels/chess')[1] == {'game': 'chess'}
+    assert table.match('/levels') is None
+
+
+def test_join_pairs_catalog_entries_with_their_routes():
+    table = RouteTable(parse_routes(APP_TSX))
+    catalog = {tool_id: CatalogTool(tool_id, tool_id.title(), None, href) for tool_id, href in
+               (('chess', '/games/chess'), ('games', '/games'), ('lost', '/nowhere/at/all'))}
+    joined = [(route.path if route else None, entry.id) for route, entry in table.join(catalog)]
+    assert joined == [('/games/:toolId', 'chess'), (None, 'lost')]
@@ -0,0 +1,62 @@
+from sitemap_manifest import hash_bytes
+from sitemap_scanner import scan_page_file, scan_page_files, scan_page_window
+
+TITLE_PATTERNS = (
+    r'title="([^"]+)"',
+    r'<title>([^<]+)</title>',
+    r'title:\s*[\'"]([^\'"]+)[\'"]',
+    r'name:\s*[\'"]([^\'"]+)[\'"]',
+)
+# No closing delimiter: a window edge can cut the title short and still match
+OPEN_PATTERNS = (r'heading:\s*(\w+)',)
+
+
+def page(tmp_path, content, name='Page.tsx'):
+    path = tmp_path / name
+    path.write_text(content, encoding='utf-8')
+    return str(path)
+
+
+def test_window_scan_stops_at_the_first_title(tmp_path):
+    content = '<Layout title="Math Quiz">' + 'x' * 5000
+    scan = scan_page_window(page(tmp_path, content), TITLE_PATTERNS, 1024)
+    assert scan.title == 'Math Quiz'
+    assert scan.content_hash is None
+    assert scan.bytes_read == len('<Layout title="Math Quiz"')
+
+
+def test_match_touching_the_window_edge_falls_back_to_a_full_read(tmp_path):
+    content = 'const heading: Multiplication' + ' ' * 100
+    path = page(tmp_path, content)
+    edge = content.index('Multi') + 5
+    assert scan_page_window(path, OPEN_PATTERNS, edge) is None
+    scan = scan_page_file(path, OPEN_PATTERNS, edge)
+    assert scan.title == 'Multiplication'
+    assert scan.content_hash == hash_bytes(content.encode('utf-8'))
+
+
+def test_match_ending_at_the_end_of_file_is_complete(tmp_path):
+    content = 'const heading: Multiplication'
+    scan = scan_page_window(page(tmp_path, content), OPEN_PATTERNS, len(content))
+    assert scan.title == 'Multiplication'
+
+
+def test_title_past_the_window_falls_back_to_a_full_read(tmp_path):
+    content = 'x' * 2000 + '<title>Late Title</title>'
+    path = page(tmp_path, content)
+    assert scan_page_window(path, TITLE_PATTERNS, 1024) is None
+    assert scan_page_file(path, TITLE_PATTERNS, 1024).title == 'Late Title'
+
+
+def test_empty_and_missing_pages(tmp_path):
+    assert scan_page_window(page(tmp_path, ''), TITLE_PATTERNS, 1024).title is None
+    scan = scan_page_file(str(tmp_path / 'Missing.tsx'), TITLE_PATTERNS, 1024)
+    assert scan.title is None and scan.error
+
+
+def test_window_scans_agree_with_full_reads(tmp_path):
+    paths = [page(tmp_path, f"{'// padding' * i}\nexport default {{ name: 'Tool {i}' }}", f'Tool{i}.tsx')
+             for i in range(40)]
+    full, _ = scan_page_files(paths, TITLE_PATTERNS)
+    windowed, _ = scan_page_files(paths, TITLE_PATTERNS, jobs=4, title_window=128)
+    assert [scan.title for scan in windowed] == [scan.title for scan in full]
@@ -0,0 +1,123 @@
+import gzip
+import http.client
+import threading
+
+import pytest
+
+from sitemap_server import ShardCache, SitemapServer, accepts_gzip
+
+
+@pytest.mark.parametrize('header, accepted', [
+    (None, False),
+    ('', False),
+    ('gzip', True),
+    ('x-gzip', True),
+    ('deflate, br', False),
+    ('gzip;q=0', False),
+    ('*', True),
+    ('*;q=0', False),
+    ('*;q=0, gzip', True),
+    ('gzip, *;q=0', True),
+    ('gzip;q=0, *', False),
+    ('*, gzip;q=0', False),
+    ('br, *;q=0.5', True),
+    ('GZIP; Q=0.5', True),
+])
+def test_accepts_gzip(header, accepted):
+    assert accepts_gzip(header) is accepted
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    (tmp_path / 'sitemap.xml').write_bytes(b'<sitemapindex />')
+    (tmp_path / 'sitemap-math.xml').write_bytes(b'<urlset>math</urlset>')
+    (tmp_path / 'sitemap-logic.xml.gz').write_bytes(gzip.compress(b'<urlset>logic</urlset>'))
+    (tmp_path / 'notes.xml').write_bytes(b'<private />')
+    return tmp_path
+
+
+def test_cache_serves_published_files_and_loads_each_once(output_dir):
+    cache = ShardCache(str(output_dir))
+    shard = cache.get('sitemap-math.xml')
+    assert shard.body == b'<urlset>math</urlset>'
+    assert gzip.decompress(shard.gzip_body) == shard.body
+    assert cache.get('sitemap-math.xml') is shard
+    assert (cache.hits, cache.loads) == (1, 1)
+
+    gz = cache.get('sitemap-logic.xml.gz')
+    assert gz.body == (output_dir / 'sitemap-logic.xml.gz').read_bytes() and gz.gzip_body is None
+    assert cache.get('sitemap-logic.xml') is None
+    assert cache.get('sitemap-math.xml.gz') is None
+
+
+def test_invalidate_drops_names_and_reuses_unchanged_content(output_dir):
+    cache = ShardCache(str(output_dir))
+    first = cache.get('sitemap-math.xml')
+    cache.invalidate([str(output_dir / 'sitemap-math.xml')])
+    assert cache.get('sitemap-math.xml') is first
+    assert cache.loads == 2
+
+    (output_dir / 'sitemap-math.xml').write_bytes(b'<urlset>math v2</urlset>')
+    assert cache.get('sitemap-math.xml') is first
+    cache.invalidate(['sitemap-math.xml'])
+    assert cache.get('sitemap-math.xml').body == b'<urlset>math v2</urlset>'
+
+
+def test_eviction_keeps_the_cache_within_its_budget(output_dir):
+    cache = ShardCache(str(output_dir), max_bytes=1)
+    cache.get('sitemap.xml')
+    cache.get('sitemap-math.xml')
+    assert len(cache.shards) == 1 and cache.evictions == 1
+    assert cache.get('sitemap-math.xml').body == b'<urlset>math</urlset>'
+
+
+@pytest.fixture
+def server(output_dir):
+    server = SitemapServer(str(output_dir), port=0, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def fetch(server, path, method='GET', **headers):
+    connection = http.client.HTTPConnection(*server.server_address[:2], timeout=5)
+    try:
+        connection.request(method, path, headers=headers)
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+
+def test_server_negotiates_gzip_and_answers_304_per_encoding(server):
+    status, headers, body = fetch(server, '/sitemap-math.xml')
+    assert status == 200 and body == b'<urlset>math</urlset>'
+    assert 'Content-Encoding' not in headers and headers['Vary'] == 'Accept-Encoding'
+    plain_etag = headers['ETag']
+
+    status, headers, body = fetch(server, '/sitemap-math.xml', **{'Accept-Encoding': '*;q=0, gzip'})
+    assert status == 200 and headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(body) == b'<urlset>math</urlset>'
+    gzip_etag = headers['ETag']
+    assert gzip_etag != plain_etag
+
+    status, headers, body = fetch(server, '/sitemap-math.xml', **{'If-None-Match': plain_etag})
+    assert status == 304 and body == b'' and headers['ETag'] == plain_etag
+    status, _, _ = fetch(server, '/sitemap-math.xml', **{'If-None-Match': f'W/{gzip_etag}', 'Accept-Encoding': 'gzip'})
+    assert status == 304
+    status, _, body = fetch(server, '/sitemap-math.xml', **{'If-None-Match': gzip_etag})
+    assert status == 200 and body == b'<urlset>math</urlset>'
+
+
+def test_server_serves_gz_files_as_is_and_only_published_sitemaps(server, output_dir):
+    status, headers, body = fetch(server, '/sitemap-logic.xml.gz', **{'Accept-Encoding': 'gzip'})
+    assert status == 200 and headers['Content-Type'] == 'application/gzip'
+    assert 'Content-Encoding' not in headers
+    assert body == (output_dir / 'sitemap-logic.xml.gz').read_bytes()
+
+    status, headers, body = fetch(server, '/sitemap.xml', method='HEAD')
+    assert status == 200 and body == b'' and headers['Content-Length'] == str(len(b'<sitemapindex />'))
+    for path in ('/sitemap-logic.xml', '/notes.xml', '/sitemap-../notes.xml', '/robots.txt'):
+        assert fetch(server, path)[0] == 404
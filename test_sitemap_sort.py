@@ -0,0 +1,52 @@
+import os
+import random
+from operator import itemgetter
+
+import pytest
+
+from sitemap_sort import ExternalSorter
+
+
+def records(count, seed=7):
+    rng = random.Random(seed)
+    categories = ('math', 'science', 'language')
+    # Few distinct names, so stability on equal keys matters
+    return [(rng.choice(categories), f"name-{rng.randrange(count // 4 + 1)}", i) for i in range(count)]
+
+
+@pytest.mark.parametrize('budget_bytes, max_open_runs', [(10 ** 9, 64), (2000, 64), (2000, 3)])
+def test_sorted_matches_builtin_sorted(tmp_path, budget_bytes, max_open_runs):
+    data = records(500)
+    key = itemgetter(1)
+    with ExternalSorter(key=key, budget_bytes=budget_bytes, temp_dir=str(tmp_path),
+                        max_open_runs=max_open_runs) as sorter:
+        for record in data:
+            sorter.add(record)
+        if budget_bytes < 10 ** 9:
+            assert sorter.spills > 1
+        assert list(sorter.sorted()) == sorted(data, key=key)
+        # Re-iterable
+        assert list(sorter.sorted()) == sorted(data, key=key)
+
+
+def test_partitions_sort_independently_in_arrival_order(tmp_path):
+    data = records(300)
+    with ExternalSorter(key=itemgetter(1), budget_bytes=1500, partition=itemgetter(0),
+                        temp_dir=str(tmp_path)) as sorter:
+        for record in data:
+            sorter.add(record)
+        assert sorter.partitions() == list(dict.fromkeys(record[0] for record in data))
+        for partition in sorter.partitions():
+            expected = sorted((record for record in data if record[0] == partition), key=itemgetter(1))
+            view = sorter.view(partition, itemgetter(2))
+            assert len(view) == len(expected)
+            assert list(view) == [record[2] for record in expected]
+
+
+def test_close_removes_spilled_runs(tmp_path):
+    sorter = ExternalSorter(key=itemgetter(0), budget_bytes=100, temp_dir=str(tmp_path))
+    for i in range(50):
+        sorter.add((f"url-{i}",))
+    assert sorter.spills and os.listdir(tmp_path)
+    sorter.close()
+    assert not os.listdir(tmp_path)
@@ -0,0 +1,51 @@
+import xml.etree.ElementTree as ET
+
+from sitemap_reader import iter_sitemap_urls
+from sitemap_splitter import SitemapSplitter
+from sitemap_writer import SITEMAP_NS, SitemapWriter
+
+BASE_URL = "https://dapsigames.com"
+
+
+def write_input(path, urls):
+    with SitemapWriter(str(path)) as writer:
+        for url in urls:
+            writer.add_url(*url)
+
+
+def index_locs(path):
+    return [elem.text for elem in ET.parse(path).getroot().iter(f'{{{SITEMAP_NS}}}loc')]
+
+
+def test_split_routes_every_url_to_one_category_and_indexes_the_shards(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    games = [(f"{BASE_URL}/games/math-quiz-{i}", "2025-09-18", "weekly", "0.8") for i in range(7)]
+    pages = [(f"{BASE_URL}/", "2025-09-18", "daily", "1.0"), (f"{BASE_URL}/about", "2025-09-01", "monthly", "0.5")]
+    write_input(tmp_path / 'input.xml', pages + games)
+
+    splitter = SitemapSplitter('input.xml', BASE_URL, max_urls_per_sitemap=3, quiet=True)
+    sitemap_files = splitter.split_sitemap()
+
+    written = {tuple(url) for files in sitemap_files.values() for name in files
+               for url in iter_sitemap_urls(str(tmp_path / name))}
+    assert written == set(pages + games)
+    for files in sitemap_files.values():
+        for name in files:
+            assert len(list(iter_sitemap_urls(str(tmp_path / name)))) <= 3
+    listed = index_locs(tmp_path / 'sitemap.xml')
+    assert sorted(listed) == sorted(f"{BASE_URL}/{name}" for files in sitemap_files.values() for name in files)
+
+
+def test_split_removes_shards_a_smaller_run_no_longer_writes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    urls = [(f"{BASE_URL}/games/math-quiz-{i}", "2025-09-18", "weekly", "0.8") for i in range(6)]
+    write_input(tmp_path / 'input.xml', urls)
+    first = SitemapSplitter('input.xml', BASE_URL, max_urls_per_sitemap=2, quiet=True).split_sitemap()
+
+    write_input(tmp_path / 'input.xml', urls[:2])
+    second = SitemapSplitter('input.xml', BASE_URL, max_urls_per_sitemap=2, quiet=True).split_sitemap()
+
+    stale = {name for files in first.values() for name in files} - {name for files in second.values() for name in files}
+    assert stale
+    assert not any((tmp_path / name).exists() for name in stale)
+    assert (tmp_path / 'input.xml').exists()
@@ -0,0 +1,139 @@
+import gzip
+
+import pytest
+
+from sitemap_validator import SitemapValidator, valid_lastmod, validate_urlset
+from sitemap_writer import SITEMAP_NS, SitemapIndexWriter, SitemapWriter
+
+BASE_URL = "https://dapsigames.com"
+
+
+def write_urlset(path, urls, compress=False):
+    with SitemapWriter(str(path), compress=compress) as writer:
+        for url in urls:
+            writer.add_url(*url)
+
+
+def write_index(path, entries):
+    with SitemapIndexWriter(str(path)) as writer:
+        for entry in entries:
+            writer.add_sitemap(*entry)
+
+
+def games(start, stop, lastmod="2025-09-18"):
+    return [(f"{BASE_URL}/games/game-{i}", lastmod, "weekly", "0.8") for i in range(start, stop)]
+
+
+def issues(report):
+    return {code: issue['count'] for code, issue in report.errors.items()}
+
+
+@pytest.mark.parametrize('value, valid', [
+    ('2025', True), ('2025-09', True), ('2025-09-18', True), ('2025-09-18T10:30Z', True),
+    ('2025-09-18T10:30:15.5+02:00', True), ('2025-02-30', False), ('2025-9-18', False),
+    ('2025-09-18T25:00Z', False), ('2025-09-18T10:30', False), ('yesterday', False),
+])
+def test_valid_lastmod(value, valid):
+    assert valid_lastmod(value) is valid
+
+
+def test_validate_urlset_counts_every_entry_error(tmp_path):
+    urls = [
+        (f"{BASE_URL}/", "2025-09-18", "daily", "1.0"),
+        (f"{BASE_URL}/", "2025-09-18", "daily", "1.0"),
+        ("https://example.com/games", None, None, None),
+        ("ftp://dapsigames.com/file", None, None, None),
+        (f"{BASE_URL}/a", "2025-02-30", "sometimes", "1.5"),
+        (f"{BASE_URL}/b", "2025-09-20", None, ".5"),
+    ]
+    path = tmp_path / 'sitemap-main.xml'
+    write_urlset(path, urls)
+    report, packed = validate_urlset(str(path), BASE_URL)
+    assert report.kind == 'urlset' and report.entries == 6
+    assert report.bytes == path.stat().st_size
+    assert issues(report) == {'duplicate-loc': 1, 'host-mismatch': 1, 'invalid-loc': 1, 'invalid-lastmod': 1,
+                              'invalid-changefreq': 1, 'invalid-priority': 1}
+    assert report.newest_lastmod == '2025-09-20'
+    # One hash per distinct valid loc
+    assert len(packed) == 8 * 4
+
+
+def test_validate_urlset_limits_and_gzip(tmp_path):
+    write_urlset(tmp_path / 'plain.xml', games(0, 5))
+    write_urlset(tmp_path / 'packed.xml.gz', games(0, 5), compress=True)
+    plain, plain_hashes = validate_urlset(str(tmp_path / 'plain.xml'), BASE_URL, max_urls=4, max_bytes=100)
+    packed, packed_hashes = validate_urlset(str(tmp_path / 'packed.xml.gz'), BASE_URL, max_urls=4, max_bytes=100)
+    assert issues(plain) == issues(packed) == {'too-many-urls': 1, 'too-large': 1}
+    assert plain.bytes == packed.bytes
+    assert plain_hashes == packed_hashes
+
+
+def test_validate_urlset_rejects_non_sitemaps(tmp_path):
+    (tmp_path / 'feed.xml').write_text('<rss><channel /></rss>', encoding='utf-8')
+    (tmp_path / 'broken.xml').write_text(f'<urlset xmlns="{SITEMAP_NS}"><url><loc>', encoding='utf-8')
+    (tmp_path / 'empty.xml').write_text(f'<urlset xmlns="{SITEMAP_NS}"></urlset>', encoding='utf-8')
+    (tmp_path / 'bad.xml.gz').write_bytes(gzip.compress(b'<urlset')[:-4])
+    assert set(validate_urlset(str(tmp_path / 'feed.xml'), BASE_URL)[0].errors) == {'wrong-root'}
+    assert set(validate_urlset(str(tmp_path / 'broken.xml'), BASE_URL)[0].errors) == {'parse-error'}
+    assert set(validate_urlset(str(tmp_path / 'bad.xml.gz'), BASE_URL)[0].errors) == {'parse-error'}
+    empty, _ = validate_urlset(str(tmp_path / 'empty.xml'), BASE_URL)
+    assert not empty.errors and set(empty.warnings) == {'empty-sitemap'}
+
+
+def test_validate_urlset_collects_index_entries(tmp_path):
+    write_index(tmp_path / 'sitemap.xml', [(f"{BASE_URL}/sitemap-a.xml", "2025-09-18"),
+                                           (f"{BASE_URL}/sitemap-b.xml", None)])
+    entries = []
+    report, _ = validate_urlset(str(tmp_path / 'sitemap.xml'), BASE_URL, index_entries=entries)
+    assert report.kind == 'sitemapindex' and not report.errors
+    assert entries == [(f"{BASE_URL}/sitemap-a.xml", "2025-09-18"), (f"{BASE_URL}/sitemap-b.xml", None)]
+
+
+def publish(tmp_path):
+    write_urlset(tmp_path / 'sitemap-main.xml', [(f"{BASE_URL}/", "2025-09-18", "daily", "1.0")])
+    write_urlset(tmp_path / 'sitemap-games.xml', games(0, 10))
+    write_urlset(tmp_path / 'sitemap-games-2.xml.gz', games(10, 15), compress=True)
+    write_index(tmp_path / 'sitemap.xml', [(f"{BASE_URL}/sitemap-main.xml", "2025-09-18"),
+                                           (f"{BASE_URL}/sitemap-games.xml", "2025-09-18"),
+                                           (f"{BASE_URL}/sitemap-games-2.xml.gz", "2025-09-18")])
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_validator_accepts_a_valid_output_dir(tmp_path, jobs):
+    publish(tmp_path)
+    result = SitemapValidator(str(tmp_path), BASE_URL, jobs=jobs, quiet=True).validate()
+    assert result['ok'] and result['errors'] == 0 and result['warnings'] == 0
+    assert (result['files'], result['urls'], result['unique_urls']) == (4, 16, 16)
+    assert [report['file'] for report in result['reports']] == [
+        str(tmp_path / name) for name in ('sitemap.xml', 'sitemap-main.xml', 'sitemap-games.xml',
+                                          'sitemap-games-2.xml.gz')]
+
+
+def test_validator_cross_checks_the_index_and_its_shards(tmp_path):
+    publish(tmp_path)
+    # Overlaps sitemap-games.xml, isn't listed, and another listed shard is gone
+    write_urlset(tmp_path / 'sitemap-extra.xml', games(8, 12))
+    write_urlset(tmp_path / 'sitemap-main.xml', [(f"{BASE_URL}/", "2025-10-01", "daily", "1.0")])
+    write_index(tmp_path / 'sitemap.xml', [(f"{BASE_URL}/sitemap-main.xml", "2025-09-18"),
+                                           (f"{BASE_URL}/sitemap-games.xml", "2025-09-18"),
+                                           (f"{BASE_URL}/sitemap-gone.xml", "2025-09-18")])
+    result = SitemapValidator(str(tmp_path), BASE_URL, jobs=1, quiet=True).validate()
+    reports = {report['file']: report for report in result['reports']}
+
+    index = reports[str(tmp_path / 'sitemap.xml')]
+    assert set(index['errors']) == {'missing-shard'}
+    assert set(index['warnings']) == {'unlisted-sitemap', 'stale-index-lastmod'}
+    assert sorted(index['warnings']['unlisted-sitemap']['examples']) == ['sitemap-extra.xml', 'sitemap-games-2.xml.gz']
+    assert reports[str(tmp_path / 'sitemap-extra.xml')]['errors']['cross-file-duplicate']['count'] == 4
+    assert reports[str(tmp_path / 'sitemap-games.xml')]['errors']['cross-file-duplicate']['count'] == 2
+    assert reports[str(tmp_path / 'sitemap-games-2.xml.gz')]['errors']['cross-file-duplicate']['count'] == 2
+    assert not result['ok']
+
+
+def test_validator_without_an_index(tmp_path):
+    result = SitemapValidator(str(tmp_path), BASE_URL, jobs=1, quiet=True).validate()
+    assert set(result['reports'][0]['errors']) == {'missing-index'}
+
+    write_urlset(tmp_path / 'sitemap.xml', games(0, 3))
+    result = SitemapValidator(str(tmp_path), BASE_URL, jobs=1, quiet=True).validate()
+    assert result['ok'] and result['urls'] == 3
@@ -0,0 +1,80 @@
+import os
+import shutil
+
+import pytest
+
+from comprehensive_sitemap_generator import ComprehensiveSitemapGenerator
+from sitemap_watch import collect_batch
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+
+
+class ScriptedWatcher:
+    """Hands out one prepared batch of paths per poll, then nothing"""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.timeouts = []
+
+    def poll(self, timeout):
+        self.timeouts.append(timeout)
+        return set(self.batches.pop(0)) if self.batches else set()
+
+
+def test_collect_batch_waits_for_a_change_then_debounces():
+    watcher = ScriptedWatcher([[], [], ['a.tsx'], ['b.tsx'], ['a.tsx', 'c.tsx']])
+    assert collect_batch(watcher, debounce=0.3, poll_interval=1.0) == {'a.tsx', 'b.tsx', 'c.tsx'}
+    # Idle polls wait poll_interval; once something changed, each poll waits debounce
+    assert watcher.timeouts == [1.0, 1.0, 1.0, 0.3, 0.3, 0.3]
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    for name in ('pages', 'data'):
+        shutil.copytree(os.path.join(REPO, 'client', 'src', name), tmp_path / 'client' / 'src' / name)
+    shutil.copy(os.path.join(REPO, 'client', 'src', 'App.tsx'), tmp_path / 'client' / 'src' / 'App.tsx')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def generator(output_dir, source):
+    return ComprehensiveSitemapGenerator(output_dir=output_dir, cache_file=None, lastmod_source='now',
+                                         source=source, quiet=True)
+
+
+def sitemaps(directory):
+    return {name: (directory / name).read_bytes() for name in sorted(os.listdir(directory))
+            if name.startswith('sitemap')}
+
+
+@pytest.mark.parametrize('source', ['pages', 'routes'])
+def test_apply_changes_matches_a_full_rebuild(site, source):
+    watched = generator('incremental', source)
+    watched.generate_sitemaps()
+    before = sitemaps(site / 'incremental')
+    pages = site / 'client' / 'src' / 'pages'
+    tools_ts = site / 'client' / 'src' / 'data' / 'tools.ts'
+
+    (pages / 'loan-calculator.tsx').write_text('<Layout title="Loan Calculator Pro">\n', encoding='utf-8')
+    os.remove(pages / 'leaderboard.tsx')
+    math = pages / 'math-games.tsx'
+    math.write_text(math.read_text(encoding='utf-8').replace('<title>', '<title>Fun ', 1), encoding='utf-8')
+    tools_ts.write_text(tools_ts.read_text(encoding='utf-8').replace('isPopular: true', 'isPopular: false', 1),
+                        encoding='utf-8')
+    assert watched.apply_changes([str(pages / 'loan-calculator.tsx'), str(pages / 'leaderboard.tsx'),
+                                  str(math), str(tools_ts)])
+
+    after = sitemaps(site / 'incremental')
+    assert after != before
+    generator('full', source).generate_sitemaps()
+    assert after == sitemaps(site / 'full')
+
+
+def test_apply_changes_ignores_files_that_feed_no_sitemap(site):
+    watched = generator('out', 'pages')
+    watched.generate_sitemaps()
+    before = sitemaps(site / 'out')
+    (site / 'client' / 'src' / 'pages' / 'notes.txt').write_text('not a page', encoding='utf-8')
+    assert not watched.apply_changes([str(site / 'client' / 'src' / 'pages' / 'notes.txt'),
+                                      str(site / 'README.md')])
+    assert sitemaps(site / 'out') == before
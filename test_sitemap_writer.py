@@ -0,0 +1,102 @@
+import gzip
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from sitemap_reader import iter_sitemap_urls
+from sitemap_writer import SITEMAP_NS, ShardedSitemapWriter, SitemapIndexWriter, SitemapWriter, shard_filename
+
+URLS = [
+    ("https://dapsigames.com/", "2025-09-18", "daily", "1.0"),
+    ("https://dapsigames.com/games/a?x=1&y=<2>", "2025-09-17", "weekly", "0.8"),
+    ("https://dapsigames.com/spiele/größe", None, "monthly", None),
+    ("https://dapsigames.com/quote\"s'", "", "weekly", "0.5"),
+]
+
+
+def etree_bytes(path, root_tag, entry_tag, fields, entries):
+    """The original ElementTree + ET.indent rendering"""
+    root = ET.Element(root_tag)
+    root.set('xmlns', SITEMAP_NS)
+    for values in entries:
+        entry = ET.SubElement(root, entry_tag)
+        for field, value in zip(fields, values):
+            if value is not None:
+                ET.SubElement(entry, field).text = value
+    tree = ET.ElementTree(root)
+    ET.indent(tree, space="  ", level=0)
+    tree.write(path, encoding='utf-8', xml_declaration=True)
+    return path.read_bytes()
+
+
+@pytest.mark.parametrize('entries', [URLS, URLS[:1], []])
+def test_sitemap_writer_is_byte_identical_to_elementtree(tmp_path, entries):
+    with SitemapWriter(str(tmp_path / 'stream.xml')) as writer:
+        for entry in entries:
+            writer.add_url(*entry)
+    expected = etree_bytes(tmp_path / 'etree.xml', 'urlset', 'url', SitemapWriter.fields, entries)
+    assert (tmp_path / 'stream.xml').read_bytes() == expected
+
+
+def test_index_writer_is_byte_identical_to_elementtree(tmp_path):
+    entries = [("https://dapsigames.com/sitemap-main.xml", "2025-09-18"),
+               ("https://dapsigames.com/sitemap-math.xml", None)]
+    with SitemapIndexWriter(str(tmp_path / 'stream.xml')) as writer:
+        for entry in entries:
+            writer.add_sitemap(*entry)
+    expected = etree_bytes(tmp_path / 'etree.xml', 'sitemapindex', 'sitemap', SitemapIndexWriter.fields, entries)
+    assert (tmp_path / 'stream.xml').read_bytes() == expected
+
+
+def test_compressed_writer_matches_plain_output(tmp_path):
+    for compress, name in ((False, 'plain.xml'), (True, 'packed.xml.gz')):
+        with SitemapWriter(str(tmp_path / name), compress=compress) as writer:
+            for entry in URLS:
+                writer.add_url(*entry)
+    assert gzip.decompress((tmp_path / 'packed.xml.gz').read_bytes()) == (tmp_path / 'plain.xml').read_bytes()
+
+
+def test_shard_filename():
+    assert shard_filename('sitemap-math.xml', 1) == 'sitemap-math.xml'
+    assert shard_filename('sitemap-math.xml', 3) == 'sitemap-math-3.xml'
+    assert shard_filename('sitemap-math.xml.gz', 2) == 'sitemap-math-2.xml.gz'
+
+
+def synthetic(count):
+    return [(f"https://dapsigames.com/games/game-{i}", f"2025-09-{i % 28 + 1:02d}", "weekly", "0.8")
+            for i in range(count)]
+
+
+def read_shards(tmp_path, filenames):
+    return [tuple(url) for name in filenames for url in iter_sitemap_urls(str(tmp_path / name))]
+
+
+def test_sharded_writer_rolls_over_at_url_limit(tmp_path):
+    urls = synthetic(25)
+    with ShardedSitemapWriter(str(tmp_path), 'sitemap-games.xml', max_urls=10) as writer:
+        for url in urls:
+            writer.add_url(*url)
+    assert writer.filenames == ['sitemap-games.xml', 'sitemap-games-2.xml', 'sitemap-games-3.xml']
+    assert [len(list(iter_sitemap_urls(str(tmp_path / name)))) for name in writer.filenames] == [10, 10, 5]
+    assert read_shards(tmp_path, writer.filenames) == urls
+    assert writer.lastmods == [max(url[1] for url in urls[i:i + 10]) for i in (0, 10, 20)]
+
+
+def test_sharded_writer_rolls_over_at_byte_limit(tmp_path):
+    urls = synthetic(40)
+    max_bytes = 1500
+    with ShardedSitemapWriter(str(tmp_path), 'sitemap-games.xml', max_bytes=max_bytes) as writer:
+        for url in urls:
+            writer.add_url(*url)
+    assert len(writer.filenames) > 1
+    for name in writer.filenames:
+        assert (tmp_path / name).stat().st_size <= max_bytes
+    assert read_shards(tmp_path, writer.filenames) == urls
+
+
+def test_sharded_writer_rejects_an_entry_larger_than_the_limit(tmp_path):
+    writer = ShardedSitemapWriter(str(tmp_path), 'sitemap-games.xml', max_bytes=200, atomic=True)
+    with pytest.raises(ValueError):
+        with writer:
+            writer.add_url("https://dapsigames.com/" + "x" * 300)
+    assert not list(tmp_path.iterdir())